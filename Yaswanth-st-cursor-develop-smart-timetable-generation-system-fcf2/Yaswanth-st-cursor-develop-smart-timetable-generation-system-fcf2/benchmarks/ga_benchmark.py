@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Genetic Algorithm Benchmark Suite
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+
+Runs GeneticAlgorithmScheduler on fixed synthetic institutions and reports
+throughput (generations/sec, fitness evaluations/sec) and quality
+(time to zero conflicts, final fitness, conflicts) plus peak traced memory.
+
+    python benchmarks/ga_benchmark.py --output baseline.json
+    python benchmarks/ga_benchmark.py --compare baseline.json --output current.json
+
+Problems are handed to the scheduler directly by default; --loader sqlite
+inserts each institution into an in-memory SQLite database and loads it
+through the ORM instead. No HTTP stack is involved either way.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable.genetic_algorithm import GeneticAlgorithmScheduler
+from timetable.synthetic_data import SyntheticInstitution
+
+# Fixed instances: results are only comparable while these stay unchanged.
+# Seeding and repair are on so that the quality metrics have room to move.
+SCHEDULER_SETTINGS = {'local_search': True, 'seeding_ratio': 0.2}
+INSTANCES = {
+    'small': {'institution': {'class_sections': 10, 'seed': 1},
+              'scheduler': {'population_size': 50, 'generations': 100, **SCHEDULER_SETTINGS}},
+    'medium': {'institution': {'class_sections': 100, 'seed': 2},
+               'scheduler': {'population_size': 50, 'generations': 40, **SCHEDULER_SETTINGS}},
+    'large': {'institution': {'class_sections': 1000, 'seed': 3},
+              'scheduler': {'population_size': 30, 'generations': 10, **SCHEDULER_SETTINGS}},
+}
+DEFAULT_INSTANCES = ('small', 'medium')
+SCHEDULER_SEED = 12345
+
+# Metric -> True when higher is better
+METRICS = {
+    'generations_per_second': True,
+    'evaluations_per_second': True,
+    'time_to_zero_conflicts': False,
+    'final_fitness': True,
+    'conflicts': False,
+    'peak_memory_mb': False,
+}
+
+
+def configure_sqlite():
+    """Minimal Django setup on an in-memory SQLite database"""
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    if not settings.configured:
+        settings.configure(
+            DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+            INSTALLED_APPS=['django.contrib.contenttypes', 'timetable'],
+            DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+        )
+        django.setup()
+    call_command('migrate', run_syncdb=True, verbosity=0)
+
+
+def load_instance(name: str, loader: str) -> Dict:
+    """Problem of a benchmark instance, directly or read back through the ORM"""
+    institution = SyntheticInstitution(**INSTANCES[name]['institution'])
+    if loader != 'sqlite':
+        return institution.problem()
+    institution.save(clear=True)
+    scheduler = GeneticAlgorithmScheduler()
+    scheduler.load_data()
+    return scheduler.problem_data()
+
+
+def run_instance(name: str, problem: Dict, overrides: Dict, trace_memory: bool) -> Dict:
+    """One benchmark run; returns its metrics"""
+    scheduler = GeneticAlgorithmScheduler(seed=SCHEDULER_SEED, **{**INSTANCES[name]['scheduler'], **overrides})
+    if trace_memory:
+        tracemalloc.start()
+    started = perf_counter()
+    _, stats = scheduler.generate_timetable(problem=problem)
+    elapsed = perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    generations = stats['total_generations']
+    zero_conflicts = next((entry.get('elapsed_seconds') for entry in stats['generation_stats']
+                           if entry['conflicts'] == 0), None)
+    return {
+        'classes': len(scheduler.class_data),
+        'genes_per_individual': sum(
+            sum(subject['hours_per_week'] for subject in class_info['subjects'])
+            + sum(2 * lab['sessions_per_week'] for lab in class_info['labs'])
+            for class_info in scheduler.class_data.values()
+        ),
+        'seconds': elapsed,
+        'generations': generations,
+        'evaluations': stats['evaluations'],
+        'generations_per_second': generations / elapsed if elapsed else None,
+        'evaluations_per_second': stats['evaluations'] / elapsed if elapsed else None,
+        'time_to_zero_conflicts': zero_conflicts,
+        'final_fitness': stats['best_fitness'],
+        'conflicts': stats['conflicts_count'],
+        'stop_reason': stats['stop_reason'],
+        'peak_memory_mb': peak / 2 ** 20 if peak is not None else None,
+    }
+
+
+def run_benchmarks(names: List[str], loader: str, overrides: Dict, repeat: int, memory: bool) -> Dict:
+    """Best-of-``repeat`` timing per instance, plus one traced run for peak memory"""
+    results = {}
+    for name in names:
+        problem = load_instance(name, loader)
+        runs = [run_instance(name, problem, overrides, trace_memory=False) for _ in range(repeat)]
+        # Seeded runs do identical work, so the fastest run is the least disturbed one
+        result = min(runs, key=lambda run: run['seconds'])
+        result['repeat'] = repeat
+        if memory:
+            # Tracing slows allocation-heavy code, so it gets a run of its own
+            result['peak_memory_mb'] = run_instance(name, problem, overrides, trace_memory=True)['peak_memory_mb']
+        results[name] = result
+        print(f"{name:>8}: {result['generations_per_second']:8.2f} gen/s "
+              f"{result['evaluations_per_second']:10.1f} eval/s  "
+              f"fitness {result['final_fitness']:6.2f}  conflicts {result['conflicts']:4d}  "
+              f"zero-conflict {_format(result['time_to_zero_conflicts'], 's')}  "
+              f"peak {_format(result['peak_memory_mb'], 'MB')}")
+    return results
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Metrics that are worse than the baseline by more than ``tolerance`` (relative)"""
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            value, expected = result.get(metric), reference.get(metric)
+            if expected is None:
+                continue
+            if value is None:
+                # Zero conflicts no longer reached; other metrics were just not measured
+                if metric == 'time_to_zero_conflicts':
+                    regressions.append(f"{name}.{metric}: {expected:.4g} -> not reached")
+                continue
+            if higher_is_better:
+                worse = value < expected - tolerance * abs(expected)
+            else:
+                worse = value > expected + tolerance * abs(expected)
+            if worse:
+                regressions.append(f"{name}.{metric}: {expected:.4g} -> {value:.4g}")
+    return regressions
+
+
+def _format(value: Optional[float], unit: str) -> str:
+    return f"{value:.2f}{unit}" if value is not None else '-'
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the genetic algorithm scheduler.')
+    parser.add_argument('--instances', default=','.join(DEFAULT_INSTANCES),
+                        help=f"Comma-separated instances out of {', '.join(INSTANCES)}")
+    parser.add_argument('--loader', choices=('problem', 'sqlite'), default='problem')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed runs per instance (best is kept)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the traced peak-memory run')
+    parser.add_argument('--generations', type=int, help='Override the generations of every instance')
+    parser.add_argument('--workers', type=int, help='Fitness evaluation processes')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Baseline JSON to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Allowed relative slowdown/worsening before a metric is flagged')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    names = [name.strip() for name in args.instances.split(',') if name.strip()]
+    unknown = [name for name in names if name not in INSTANCES]
+    if unknown:
+        raise SystemExit(f"Unknown instances: {', '.join(unknown)}")
+
+    overrides = {}
+    if args.generations:
+        overrides['generations'] = args.generations
+    if args.workers:
+        overrides['workers'] = args.workers
+    if args.loader == 'sqlite':
+        configure_sqlite()
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'loader': args.loader,
+        'overrides': overrides,
+        'results': run_benchmarks(names, args.loader, overrides, args.repeat, not args.no_memory),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
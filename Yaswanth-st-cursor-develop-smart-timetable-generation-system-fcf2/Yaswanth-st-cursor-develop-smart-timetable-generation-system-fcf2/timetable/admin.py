@@ -11,6 +11,7 @@ from .models import (
     Staff, Subject, ClassSection, Room, Timetable, 
     Elective, Substitution, TimetableGeneration
 )
+from .generation_jobs import cancel_generation, enqueue_generation, scheduler_settings
 
 # Custom Admin Site Configuration
 admin.site.site_header = "Smart Timetable Management System"
@@ -264,7 +265,7 @@ class SubstitutionAdmin(admin.ModelAdmin):
 
 @admin.register(TimetableGeneration)
 class TimetableGenerationAdmin(admin.ModelAdmin):
-    list_display = ['generation_id', 'academic_year', 'semester', 'department', 'status', 'fitness_score', 'conflicts_resolved', 'duration', 'generated_by']
+    list_display = ['generation_id', 'academic_year', 'semester', 'department', 'status', 'priority', 'progress', 'fitness_score', 'conflicts_resolved', 'duration', 'generated_by']
     list_filter = ['status', 'academic_year', 'semester', 'department', 'created_at']
     search_fields = ['academic_year', 'generated_by']
     readonly_fields = ['created_at', 'started_at', 'completed_at']
@@ -275,7 +276,8 @@ class TimetableGenerationAdmin(admin.ModelAdmin):
             'fields': ('academic_year', 'semester', 'department', 'generated_by')
         }),
         ('Status & Results', {
-            'fields': ('status', 'fitness_score', 'conflicts_resolved', 'total_slots_filled')
+            'fields': ('status', 'priority', 'cancel_requested', 'progress', 'current_generation',
+                       'fitness_score', 'conflicts_resolved', 'total_slots_filled')
         }),
         ('Configuration', {
             'fields': ('generation_parameters',),
@@ -299,21 +301,38 @@ class TimetableGenerationAdmin(admin.ModelAdmin):
     duration.short_description = 'Duration'
     
     def get_readonly_fields(self, request, obj=None):
-        if obj and obj.status in ['completed', 'failed']:
+        if obj and obj.status in ['completed', 'failed', 'cancelled']:
             return self.readonly_fields + ['status', 'fitness_score', 'conflicts_resolved', 'total_slots_filled']
         return self.readonly_fields
 
 # Custom admin actions
 def regenerate_timetable(modeladmin, request, queryset):
     """Custom action to regenerate timetables"""
+    queued = 0
     for generation in queryset:
-        if generation.status != 'in_progress':
-            # Trigger regeneration logic here
-            generation.status = 'pending'
-            generation.save()
-    modeladmin.message_user(request, f'Marked {queryset.count()} generations for regeneration.')
+        # Same settings with a fresh seed, so that the run can turn out differently
+        settings = scheduler_settings(generation)
+        settings.pop('seed', None)
+        _, created = enqueue_generation(
+            academic_year=generation.academic_year,
+            semester=generation.semester,
+            department=generation.department,
+            generated_by=request.user.username,
+            settings=settings,
+            priority=generation.priority,
+        )
+        queued += created
+    modeladmin.message_user(request, f'Queued {queued} generations for regeneration '
+                                     f'({queryset.count() - queued} were already queued).')
 
-regenerate_timetable.short_description = 'Mark for regeneration'
+regenerate_timetable.short_description = 'Queue regeneration'
 
-# Add the action to TimetableGenerationAdmin
-TimetableGenerationAdmin.actions = ['regenerate_timetable'] + list(TimetableGenerationAdmin.actions or [])
\ No newline at end of file
+def cancel_generations(modeladmin, request, queryset):
+    """Custom action to cancel queued or running generations"""
+    cancelled = sum(cancel_generation(generation.generation_id) for generation in queryset)
+    modeladmin.message_user(request, f'Cancelled {cancelled} generations.')
+
+cancel_generations.short_description = 'Cancel generation'
+
+# Add the actions to TimetableGenerationAdmin
+TimetableGenerationAdmin.actions = [regenerate_timetable, cancel_generations] + list(TimetableGenerationAdmin.actions or [])
\ No newline at end of file
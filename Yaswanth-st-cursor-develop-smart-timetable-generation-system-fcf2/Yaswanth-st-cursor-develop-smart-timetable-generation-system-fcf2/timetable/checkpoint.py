@@ -0,0 +1,150 @@
+"""
+Checkpoint and Resume of Genetic Algorithm Runs
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import json
+import os
+import numpy as np
+from typing import Dict, List, Tuple
+import logging
+
+from .chromosome import ArrayChromosome, GENE_COLUMNS, GENE_DTYPE
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 3
+# Generation statistics live in an append-only sidecar next to the archive,
+# one JSON line per generation, so a checkpoint writes only the new ones
+STATS_SUFFIX = '.stats.jsonl'
+
+
+def _encoding_ids(encoding) -> Dict[str, List[str]]:
+    return {
+        'days': list(encoding.days),
+        'classes': list(encoding.classes.values),
+        'subjects': list(encoding.subjects.values),
+        'staff': list(encoding.staff.values),
+        'rooms': list(encoding.rooms.values),
+    }
+
+
+def _stack_genes(chromosomes: List[ArrayChromosome]):
+    lengths = np.array([len(chromosome) for chromosome in chromosomes], dtype=np.int64)
+    if chromosomes:
+        genes = np.concatenate([chromosome.genes for chromosome in chromosomes])
+    else:
+        genes = np.empty((0, GENE_COLUMNS), dtype=GENE_DTYPE)
+    return genes, lengths
+
+
+def _unstack_genes(genes: np.ndarray, lengths: np.ndarray, num_classes: int) -> List[ArrayChromosome]:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return [ArrayChromosome.from_rows(genes[offsets[i]:offsets[i + 1]], num_classes)
+            for i in range(len(lengths))]
+
+
+def _append_stats(path: str, scheduler) -> Tuple[int, int]:
+    """
+    Append the generation statistics not yet in the sidecar; returns the
+    entries and bytes it now holds. Lines past the last checkpoint's length
+    (from a crash before its archive was replaced) are overwritten.
+    """
+    stats_path = path + STATS_SUFFIX
+    entries, size = scheduler.checkpointed_stats
+    if entries and (not os.path.exists(stats_path) or os.path.getsize(stats_path) < size):
+        entries, size = 0, 0
+    with open(stats_path, 'r+b' if entries else 'wb') as handle:
+        handle.truncate(size)
+        handle.seek(size)
+        handle.write(''.join(json.dumps(entry) + '\n' for entry in scheduler.generation_stats[entries:]).encode())
+        handle.flush()
+        os.fsync(handle.fileno())
+        return len(scheduler.generation_stats), handle.tell()
+
+
+def _read_stats(path: str, entries: int, size: int) -> List[Dict]:
+    with open(path + STATS_SUFFIX, 'rb') as handle:
+        lines = handle.read(size).decode().splitlines()
+    if len(lines) != entries:
+        raise ValueError("Checkpoint statistics are incomplete")
+    return [json.loads(line) for line in lines]
+
+
+def save_checkpoint(path: str, scheduler, population: List[ArrayChromosome], generation: int):
+    """
+    Write the run state after ``generation`` to ``path`` (an .npz archive)
+    and its generation statistics to ``path`` + STATS_SUFFIX. The archive is
+    written next to the target and moved into place with an atomic replace,
+    so a crash never leaves a truncated checkpoint behind.
+    """
+    stats_entries, stats_bytes = _append_stats(path, scheduler)
+    population_genes, population_lengths = _stack_genes(population)
+    best = scheduler.best_so_far()[0]
+    best_genes, best_lengths = _stack_genes([best] if best is not None else [])
+
+    metadata = {
+        'version': CHECKPOINT_VERSION,
+        'generation': generation,
+        'random_state': scheduler.rng.bit_generator.state,
+        'encoding': _encoding_ids(scheduler.encoding),
+        'stats_entries': stats_entries,
+        'stats_bytes': stats_bytes,
+        'evaluations_used': scheduler.evaluations_used,
+        'restarts': scheduler.restarts,
+        'last_improvement': scheduler.last_improvement,
+    }
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as handle:
+        np.savez(
+            handle,
+            population_genes=population_genes,
+            population_lengths=population_lengths,
+            best_genes=best_genes,
+            best_lengths=best_lengths,
+            best_fitness_history=np.asarray(scheduler.best_fitness_history, dtype=np.float64),
+            metadata=np.array(json.dumps(metadata)),
+        )
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+    scheduler.checkpointed_stats = (stats_entries, stats_bytes)
+    logger.debug(f"Checkpoint written to {path} after generation {generation}")
+
+
+def load_checkpoint(path: str, scheduler) -> Dict:
+    """
+    Read a checkpoint written by save_checkpoint for the scheduler's loaded
+    problem. Returns the population, best chromosome and generation counter
+    and restores the statistics and random state on the scheduler.
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        data = {key: archive[key] for key in archive.files}
+    metadata = json.loads(str(data['metadata']))
+
+    if metadata.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {metadata.get('version')}")
+    # Genes hold interned codes, so the problem must intern identically
+    if metadata['encoding'] != _encoding_ids(scheduler.encoding):
+        raise ValueError("Checkpoint was written for different timetable data")
+
+    num_classes = scheduler.encoding.num_classes
+    population = _unstack_genes(data['population_genes'], data['population_lengths'], num_classes)
+    best = _unstack_genes(data['best_genes'], data['best_lengths'], num_classes)
+
+    scheduler.generation_stats = _read_stats(path, metadata['stats_entries'], metadata['stats_bytes'])
+    scheduler.checkpointed_stats = (metadata['stats_entries'], metadata['stats_bytes'])
+    scheduler.best_fitness_history = data['best_fitness_history'].tolist()
+    scheduler.evaluations_used = metadata['evaluations_used']
+    scheduler.restarts = metadata['restarts']
+
+    scheduler.rng.bit_generator.state = metadata['random_state']
+
+    return {
+        'generation': metadata['generation'],
+        'population': population,
+        'best': best[0] if best else None,
+        'last_improvement': metadata['last_improvement'],
+    }
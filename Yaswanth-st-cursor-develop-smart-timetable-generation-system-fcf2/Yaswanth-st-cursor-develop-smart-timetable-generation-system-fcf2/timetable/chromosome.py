@@ -0,0 +1,210 @@
+"""
+Array-backed Chromosome Encoding for the Genetic Algorithm
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import hashlib
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Column layout of the gene matrix (one row per scheduled slot)
+COL_CLASS = 0
+COL_DAY = 1
+COL_SLOT = 2
+COL_SUBJECT = 3
+COL_STAFF = 4
+COL_ROOM = 5
+COL_KIND = 6
+GENE_COLUMNS = 7
+
+# Values stored in the kind column
+KIND_CORE = 0
+KIND_LAB = 1
+KIND_ELECTIVE = 2
+
+GENE_DTYPE = np.int32
+
+
+class Interner:
+    """Maps string identifiers to dense integer codes and back"""
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in values:
+            self.intern(value)
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.codes
+
+    def __len__(self):
+        return len(self.values)
+
+
+class ProblemEncoding:
+    """Integer interning tables shared by every chromosome of a run"""
+    def __init__(self, days: Sequence[str], class_ids: Iterable[str],
+                 subject_codes: Iterable[str], staff_ids: Iterable[str],
+                 room_ids: Iterable[str]):
+        self.days = list(days)
+        self.day_index = {day: index for index, day in enumerate(self.days)}
+        self.classes = Interner(class_ids)
+        self.subjects = Interner(subject_codes)
+        self.staff = Interner(staff_ids)
+        self.rooms = Interner(room_ids)
+
+    @property
+    def num_classes(self) -> int:
+        return len(self.classes)
+
+
+class ArrayChromosome:
+    """
+    Timetable solution stored as one integer gene block per class.
+
+    Blocks are shared structurally: copies and crossover children reference
+    their parents' blocks, and a chromosome copies a block only the first
+    time it writes to it (copy-on-write).
+    """
+    def __init__(self, blocks: List[np.ndarray], class_offsets: np.ndarray = None,
+                 block_hashes: List[Optional[int]] = None):
+        self.blocks = blocks
+        # Per-block content hashes (None = not computed yet), combined into the fingerprint
+        self.block_hashes = block_hashes if block_hashes is not None else [None] * len(blocks)
+        self._fingerprint = None
+        if class_offsets is None:
+            class_offsets = np.zeros(len(blocks) + 1, dtype=np.int64)
+            np.cumsum([len(block) for block in blocks], out=class_offsets[1:])
+        # Block lengths never change, so offsets are shared by every copy
+        self.class_offsets = class_offsets
+        self._genes = None
+        self._owned_blocks = set()
+        self.fitness_score = 0.0
+        self.conflict_count = 0
+        self.penalties = {}
+        # True once fitness_score describes the current genes
+        self.fitness_valid = False
+        # Optional incremental occupancy counters (see fitness_evaluator.FitnessState)
+        self.fitness_state = None
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]], num_classes: int) -> 'ArrayChromosome':
+        """Build a chromosome from gene tuples, grouping them by class"""
+        genes = np.array(rows, dtype=GENE_DTYPE).reshape(-1, GENE_COLUMNS)
+        order = np.argsort(genes[:, COL_CLASS], kind='stable')
+        genes = genes[order]
+
+        counts = np.bincount(genes[:, COL_CLASS], minlength=num_classes)
+        offsets = np.zeros(num_classes + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        blocks = [genes[offsets[c]:offsets[c + 1]] for c in range(num_classes)]
+        chromosome = cls(blocks, offsets)
+        chromosome._genes = genes
+        return chromosome
+
+    @classmethod
+    def from_blocks(cls, blocks: Sequence[np.ndarray],
+                    block_hashes: Sequence[Optional[int]] = None) -> 'ArrayChromosome':
+        """Build a chromosome that shares the given per-class blocks (and their hashes)"""
+        return cls(list(blocks), block_hashes=list(block_hashes) if block_hashes is not None else None)
+
+    @property
+    def genes(self) -> np.ndarray:
+        """All genes as one matrix in class order (built on demand, read-only)"""
+        if self._genes is None:
+            if self.blocks:
+                self._genes = np.concatenate(self.blocks)
+            else:
+                self._genes = np.empty((0, GENE_COLUMNS), dtype=GENE_DTYPE)
+        return self._genes
+
+    @property
+    def num_classes(self) -> int:
+        return len(self.blocks)
+
+    def class_block(self, class_code: int) -> np.ndarray:
+        """Rows belonging to one class (shared, do not modify)"""
+        return self.blocks[class_code]
+
+    def locate(self, index: int) -> Tuple[int, int]:
+        """Map a gene index to its (class code, row within the class block)"""
+        class_code = int(np.searchsorted(self.class_offsets, index, side='right')) - 1
+        return class_code, index - int(self.class_offsets[class_code])
+
+    def gene(self, index: int) -> np.ndarray:
+        """One gene row (shared, do not modify)"""
+        class_code, row = self.locate(index)
+        return self.blocks[class_code][row]
+
+    def update_gene(self, index: int, day: int, slot: int, staff: int, room: int):
+        """Reassign one gene, copying only its class block if it is shared"""
+        class_code, row = self.locate(index)
+        if class_code not in self._owned_blocks:
+            self.blocks[class_code] = self.blocks[class_code].copy()
+            self._owned_blocks.add(class_code)
+        block = self.blocks[class_code]
+        block[row, COL_DAY] = day
+        block[row, COL_SLOT] = slot
+        block[row, COL_STAFF] = staff
+        block[row, COL_ROOM] = room
+        self._genes = None
+        self.block_hashes[class_code] = None
+        self._fingerprint = None
+
+    def fingerprint(self) -> int:
+        """
+        64-bit content hash of the chromosome. Block hashes are cached and
+        shared with copies and children, so only blocks written since the
+        last call are rehashed.
+        """
+        if self._fingerprint is None:
+            fingerprint = 0
+            for class_code, block_hash in enumerate(self.block_hashes):
+                if block_hash is None:
+                    # Salted with the block's index: equal blocks (empty ones, say)
+                    # would otherwise cancel out in pairs when XOR-combined
+                    digest = hashlib.blake2b(self.blocks[class_code].tobytes(), digest_size=8,
+                                             salt=class_code.to_bytes(8, 'little')).digest()
+                    block_hash = int.from_bytes(digest, 'little')
+                    self.block_hashes[class_code] = block_hash
+                fingerprint ^= block_hash
+            self._fingerprint = fingerprint
+        return self._fingerprint
+
+    def copy(self) -> 'ArrayChromosome':
+        """Cheap copy sharing every gene block with this chromosome"""
+        clone = ArrayChromosome(list(self.blocks), self.class_offsets, list(self.block_hashes))
+        # Blocks are now shared, so neither side may write to them in place
+        self._owned_blocks.clear()
+        clone._genes = self._genes
+        clone._fingerprint = self._fingerprint
+        clone.fitness_score = self.fitness_score
+        clone.conflict_count = self.conflict_count
+        clone.penalties = dict(self.penalties)
+        clone.fitness_valid = self.fitness_valid
+        # Identical genes share the state; it is copied before any gene moves
+        clone.fitness_state = self.fitness_state
+        return clone
+
+    def __getstate__(self):
+        # Occupancy counters and the concatenation cache are rebuilt on
+        # demand, so they are not shipped to other processes
+        state = self.__dict__.copy()
+        state['_genes'] = None
+        state['_owned_blocks'] = set()
+        state['fitness_state'] = None
+        return state
+
+    def __len__(self):
+        return int(self.class_offsets[-1])
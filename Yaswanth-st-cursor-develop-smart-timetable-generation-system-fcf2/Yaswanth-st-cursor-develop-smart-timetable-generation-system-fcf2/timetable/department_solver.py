@@ -0,0 +1,215 @@
+"""
+Department-Decomposed Solving with a Shared-Resource Merge Pass
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List
+import logging
+
+import numpy as np
+
+from .chromosome import ArrayChromosome
+from .local_search import ConflictRepair
+from .phase_timing import merge_phases
+
+logger = logging.getLogger(__name__)
+
+# Local-search passes spent resolving cross-department collisions after the merge
+MERGE_REPAIR_PASSES = 10
+# Seconds between checks of the parent run's cancellation while departments are solved
+CANCEL_POLL_INTERVAL = 0.5
+
+# Set in department processes: the parent run was cancelled
+_cancelled = None
+
+
+def _watch_cancellation(cancelled):
+    """Process pool initializer; the event can only reach the workers when they start"""
+    global _cancelled
+    _cancelled = cancelled
+
+
+def department_problem(problem: Dict, department: str) -> Dict:
+    """Subproblem holding one department's classes; staff, rooms and electives stay shared"""
+    subproblem = dict(problem)
+    subproblem['class_data'] = {
+        class_id: class_info for class_id, class_info in problem['class_data'].items()
+        if class_info['department'] == department
+    }
+    return subproblem
+
+
+def _solve_department(department: str, problem: Dict, settings: Dict, seed: np.random.SeedSequence) -> Dict:
+    """Worker entry point: solve one department and return its genes as identifiers"""
+    from .genetic_algorithm import GeneticAlgorithmScheduler
+
+    scheduler = GeneticAlgorithmScheduler(**settings, seed=seed,
+                                          cancel_check=_cancelled.is_set if _cancelled is not None else None)
+    best, stats = scheduler.generate_timetable(problem=problem)
+    if best is None:
+        return {'department': department, 'stop_reason': stats['stop_reason']}
+
+    # Interned codes differ between subproblems, so genes travel as ids
+    enc = scheduler.encoding
+    rows = [
+        (enc.classes[class_code], enc.days[day], slot, enc.subjects[subject],
+         enc.staff[staff], enc.rooms[room], kind)
+        for class_code, day, slot, subject, staff, room, kind in best.genes.tolist()
+    ]
+    return {
+        'department': department,
+        'rows': rows,
+        'best_fitness': stats['best_fitness'],
+        'conflicts_count': stats['conflicts_count'],
+        'stop_reason': stats['stop_reason'],
+        'generation_stats': stats['generation_stats'],
+    }
+
+
+class DepartmentDecomposedSolver:
+    """
+    Solves each department's classes as an independent GA run in its own
+    process, then merges the departmental timetables into one chromosome.
+
+    Departments only interact through shared rooms and staff who teach in
+    several departments. The merge books every department's genes into one
+    set of occupancy counters; genes that collide on a reserved staff member
+    or room are then moved by conflict repair to slots (or rooms/staff)
+    whose reservations are still free.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.department_results: Dict[str, Dict] = {}
+
+    def run(self) -> ArrayChromosome:
+        scheduler = self.scheduler
+        problem = scheduler.problem_data()
+        departments = sorted({class_info['department'] for class_info in problem['class_data'].values()})
+        if not departments:
+            raise ValueError("No classes to schedule")
+
+        # Child streams in sorted department order, so a seed replays every department
+        seeds = dict(zip(departments, scheduler.spawn_seeds(len(departments))))
+        workers = min(len(departments), scheduler.department_workers or os.cpu_count() or 1)
+        waves = math.ceil(len(departments) / workers)
+        logger.info(f"Solving {len(departments)} departments with {workers} processes")
+
+        # Budgets apply to every department run; stagnation too. Departments
+        # beyond the first wave wait for a free process, so each wave gets
+        # its share of the time left
+        max_seconds = scheduler.max_seconds
+        if max_seconds is not None:
+            max_seconds = max(0.0, max_seconds - scheduler.elapsed_seconds()) / waves
+        settings = scheduler.worker_settings()
+        settings.update({
+            'max_seconds': max_seconds,
+            'max_evaluations': scheduler.max_evaluations,
+            'stagnation_generations': scheduler.stagnation_generations,
+            'stagnation_action': scheduler.stagnation_action,
+        })
+
+        cancelled = multiprocessing.Event()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_watch_cancellation,
+                                 initargs=(cancelled,)) as executor:
+            futures = {
+                executor.submit(_solve_department, department,
+                                department_problem(problem, department), settings, seeds[department]): department
+                for department in departments
+            }
+            finished = {}
+            pending = set(futures)
+            # Departments report progress as they finish; the merge keeps sorted order
+            while pending:
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                if scheduler.cancel_requested():
+                    # Running departments stop after their current generation, waiting ones never start
+                    logger.info(f"Cancelled with {len(finished)} of {len(departments)} departments solved")
+                    cancelled.set()
+                    executor.shutdown(cancel_futures=True)
+                    scheduler.stop_reason = 'cancelled'
+                    return None
+                for future in done:
+                    result = future.result()
+                    finished[futures[future]] = result
+                    scheduler.report_progress({
+                        'department': result['department'],
+                        'best_fitness': result['best_fitness'],
+                        'conflicts': result['conflicts_count'],
+                        'elapsed_seconds': scheduler.elapsed_seconds(),
+                    }, fraction=len(finished) / len(departments))
+            results = [finished[department] for department in departments]
+
+        merged = self._merge(results)
+        self._record_statistics(results, merged)
+        scheduler.track_best(max(0, len(scheduler.generation_stats) - 1), merged)
+        return merged
+
+    def _merge(self, results: List[Dict]) -> ArrayChromosome:
+        """Combine departmental timetables and resolve collisions on shared resources"""
+        scheduler = self.scheduler
+        rows = []
+        for result in results:
+            rows.extend(scheduler._encode_row(*row) for row in result['rows'])
+        merged = ArrayChromosome.from_rows(rows, scheduler.encoding.num_classes)
+        scheduler.fitness_evaluator.evaluate([merged])
+
+        before = merged.conflict_count
+        repair = scheduler._conflict_repair or ConflictRepair(scheduler)
+        moves = repair.repair(merged, max_passes=MERGE_REPAIR_PASSES)
+        logger.info(f"Merged {len(results)} departments: {before} conflicts before repair, "
+                    f"{merged.conflict_count} after {moves} moves")
+        return merged
+
+    def _record_statistics(self, results: List[Dict], merged: ArrayChromosome):
+        """
+        Per-department results, plus combined per-generation statistics on the
+        scheduler. Before the merge there is no whole timetable to score, so
+        generations carry the departments' mean best fitness and summed
+        conflicts; the last generation carries the merged chromosome's.
+        """
+        scheduler = self.scheduler
+        for result in results:
+            self.department_results[result['department']] = {
+                'best_fitness': result['best_fitness'],
+                'conflicts_count': result['conflicts_count'],
+                'stop_reason': result['stop_reason'],
+                'total_generations': len(result['generation_stats']),
+            }
+
+        # Departments that stopped early keep contributing their last generation
+        histories = [result['generation_stats'] for result in results if result['generation_stats']]
+        length = max((len(history) for history in histories), default=0)
+        for generation in range(length):
+            entries = [history[min(generation, len(history) - 1)] for history in histories]
+            running = [history[generation] for history in histories if generation < len(history)]
+            stats = {
+                'generation': generation,
+                'best_fitness': sum(entry['best_fitness'] for entry in entries) / len(entries),
+                'average_fitness': sum(entry['average_fitness'] for entry in entries) / len(entries),
+                'conflicts': sum(entry['conflicts'] for entry in entries),
+                # Departments run side by side; the slowest sets the pace
+                'elapsed_seconds': max(entry.get('elapsed_seconds', 0.0) for entry in entries),
+            }
+            # Evaluation counters are summed over the departments still running
+            for key in scheduler.take_evaluation_counts():
+                stats[key] = sum(entry.get(key, 0) for entry in running)
+            scheduler.evaluations_used += stats['evaluations']
+            if scheduler.profile_phases:
+                # Finished departments spend no more time
+                stats['phase_seconds'] = merge_phases(running)
+            scheduler.generation_stats.append(stats)
+            scheduler.best_fitness_history.append(stats['best_fitness'])
+        if scheduler.generation_stats:
+            scheduler.generation_stats[-1].update(best_fitness=merged.fitness_score,
+                                                  conflicts=merged.conflict_count)
+            scheduler.best_fitness_history[-1] = merged.fitness_score
+
+        # The run ended when its slowest department did, for that department's reason
+        last = max(results, key=lambda result: result['generation_stats'][-1].get('elapsed_seconds', 0.0)
+                   if result['generation_stats'] else 0.0)
+        scheduler.stop_reason = last['stop_reason']
@@ -0,0 +1,235 @@
+"""
+Randomized DSatur Construction of Near-Feasible Initial Timetables
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import heapq
+from collections import namedtuple
+from typing import Dict, List, Tuple
+
+from .chromosome import KIND_CORE, KIND_LAB, KIND_ELECTIVE
+
+# One schedulable unit: ``length`` consecutive slots of a subject for a class
+Lesson = namedtuple('Lesson', 'class_code subject kind length staff_options room_options')
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+def _run_starts(mask: int, length: int) -> int:
+    """Bits where ``length`` consecutive set bits of mask begin"""
+    starts = mask
+    for shift in range(1, length):
+        starts &= mask >> shift
+    return starts
+
+
+class DSaturSeeder:
+    """
+    Builds timetables by graph colouring the lessons of the problem.
+
+    Lessons are vertices; two lessons conflict when they share a class or a
+    staff member, and lab sessions additionally compete for the scarce lab
+    rooms. Colours are (day, start slot) times. Lessons are placed in order of
+    saturation, i.e. fewest feasible times left, with ties broken by degree
+    and then at random; each lesson takes a random feasible time. Staff are
+    drawn per build from the eligible staff, least loaded first, so repeated
+    builds give different near-feasible individuals.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        enc = scheduler.encoding
+        self.num_days = len(enc.days)
+        self.lessons: List[Lesson] = []
+        # Free-slot mask of each class on each day before anything is placed
+        self.class_masks: Dict[int, List[int]] = {}
+        self.full_mask = 0
+
+        eligible = scheduler._eligible_staff
+        lab_rooms = tuple(enc.rooms.codes[room_id] for room_id in scheduler._lab_rooms)
+
+        def codes(interner, ids):
+            return tuple(interner.codes[value] for value in ids)
+
+        for class_id, class_info in scheduler.class_data.items():
+            class_code = enc.classes.codes[class_id]
+            day_mask = (1 << class_info['slots_per_day']) - 1
+            self.full_mask |= day_mask
+            self.class_masks[class_code] = [
+                day_mask if day < class_info['working_days'] else 0 for day in range(self.num_days)
+            ]
+
+            # Lessons mirror what random construction schedules for the class
+            for subject_info in class_info['subjects']:
+                subject_code = subject_info['subject_code']
+                kind = KIND_LAB if scheduler.subject_data[subject_code]['is_lab'] else KIND_CORE
+                self._add_lessons(
+                    subject_info['hours_per_week'], class_code, enc.subjects.codes[subject_code], kind, 1,
+                    codes(enc.staff, eligible[False].get(subject_code, ())),
+                    codes(enc.rooms, scheduler._suitable_rooms(subject_code, class_info)),
+                )
+            for lab_info in class_info['labs']:
+                lab_code = lab_info['lab_code']
+                self._add_lessons(
+                    lab_info['sessions_per_week'], class_code, enc.subjects.codes[lab_code], KIND_LAB, 2,
+                    codes(enc.staff, eligible[True].get(lab_code, ())), lab_rooms,
+                )
+            for elective_id in class_info['electives']:
+                if elective_id in scheduler.elective_data:
+                    elective_info = scheduler.elective_data[elective_id]
+                    self._add_lessons(
+                        elective_info['hours_per_week'], class_code, enc.subjects.codes[elective_id],
+                        KIND_ELECTIVE, 1, (enc.staff.codes[elective_info['staff']],),
+                        codes(enc.rooms, scheduler._suitable_rooms(elective_id, class_info)),
+                    )
+
+        self.lab_lessons = [i for i, lesson in enumerate(self.lessons) if lesson.kind == KIND_LAB]
+        # Lab sessions also conflict through the lab rooms they compete for
+        lab_hours = sum(self.lessons[i].length for i in self.lab_lessons)
+        self.lab_scarcity = lab_hours / len(lab_rooms) if lab_rooms else 0.0
+        # Lab lessons grouped by their room options (mostly one shared tuple of
+        # lab rooms), and the groups each room belongs to
+        self.lab_room_groups: Dict[Tuple[int, ...], List[int]] = {}
+        for i in self.lab_lessons:
+            self.lab_room_groups.setdefault(self.lessons[i].room_options, []).append(i)
+        self.rooms = {room for room_options in {lesson.room_options for lesson in self.lessons}
+                      for room in room_options}
+        self.room_groups: Dict[int, List[Tuple[int, ...]]] = {}
+        for room_options in self.lab_room_groups:
+            for room in room_options:
+                self.room_groups.setdefault(room, []).append(room_options)
+
+    def _add_lessons(self, count: int, class_code: int, subject: int, kind: int, length: int,
+                     staff_options: Tuple[int, ...], room_options: Tuple[int, ...]):
+        # Lessons without eligible staff or rooms are skipped, as in random construction
+        if not staff_options or not room_options:
+            return
+        for _ in range(count):
+            self.lessons.append(Lesson(class_code, subject, kind, length, staff_options, room_options))
+
+    def build_rows(self) -> List[Tuple[int, ...]]:
+        """Construct one timetable as encoded gene rows"""
+        lessons = self.lessons
+        rng = self.scheduler.rng
+        staff = self._assign_staff()
+
+        class_free = {code: list(masks) for code, masks in self.class_masks.items()}
+        staff_free = {code: [self.full_mask] * self.num_days for code in set(staff)}
+        room_free = {room: [self.full_mask] * self.num_days for room in self.rooms}
+
+        by_class, by_staff = {}, {}
+        for i, lesson in enumerate(lessons):
+            by_class.setdefault(lesson.class_code, []).append(i)
+            by_staff.setdefault(staff[i], []).append(i)
+
+        def free_rooms_mask(room_options: Tuple[int, ...], day: int) -> int:
+            """Slots of a day where at least one of the rooms is free"""
+            rooms = 0
+            for room in room_options:
+                rooms |= room_free[room][day]
+            return rooms
+
+        def feasible_starts(i: int) -> List[int]:
+            """Per-day masks of start slots where lesson i collides with nothing"""
+            lesson = lessons[i]
+            starts = []
+            for day in range(self.num_days):
+                mask = class_free[lesson.class_code][day] & staff_free[staff[i]][day]
+                if mask and lesson.kind == KIND_LAB:
+                    mask &= free_rooms_mask(lesson.room_options, day)
+                starts.append(_run_starts(mask, lesson.length))
+            return starts
+
+        def degree(i: int) -> float:
+            lesson = lessons[i]
+            value = len(by_class[lesson.class_code]) + len(by_staff[staff[i]]) - 2
+            if lesson.kind == KIND_LAB:
+                value += self.lab_scarcity
+            return value
+
+        degrees = [degree(i) for i in range(len(lessons))]
+        version = [0] * len(lessons)
+        placed = [False] * len(lessons)
+
+        def push(i: int):
+            version[i] += 1
+            available = sum(_popcount(mask) for mask in feasible_starts(i))
+            heapq.heappush(heap, (available, -degrees[i], rng.random(), i, version[i]))
+
+        heap = []
+        for i in range(len(lessons)):
+            push(i)
+
+        rows = []
+        while heap:
+            _, _, _, i, entry_version = heapq.heappop(heap)
+            if placed[i] or entry_version != version[i]:
+                continue  # Stale entry: saturation changed since it was pushed
+            placed[i] = True
+            lesson = lessons[i]
+
+            day, start = self._choose_time(lesson, feasible_starts(i), class_free)
+            bits = ((1 << lesson.length) - 1) << (start - 1)
+            free_rooms = [room for room in lesson.room_options if room_free[room][day] & bits == bits]
+            room_choices = free_rooms or lesson.room_options
+            room = room_choices[rng.integers(len(room_choices))]
+
+            # Lab lessons only see rooms through the slots where any of their
+            # rooms is free; taking this room only matters where it was the last
+            room_groups = self.room_groups.get(room, ())
+            free_before = [free_rooms_mask(room_options, day) for room_options in room_groups]
+
+            class_free[lesson.class_code][day] &= ~bits
+            staff_free[staff[i]][day] &= ~bits
+            room_free[room][day] &= ~bits
+            for offset in range(lesson.length):
+                rows.append((lesson.class_code, day, start + offset, lesson.subject,
+                             staff[i], room, lesson.kind))
+
+            # Saturation only changes for lessons sharing a resource with this one
+            neighbours = set(by_class[lesson.class_code]) | set(by_staff[staff[i]])
+            for room_options, before in zip(room_groups, free_before):
+                if free_rooms_mask(room_options, day) != before:
+                    neighbours.update(self.lab_room_groups[room_options])
+            for j in neighbours:
+                if not placed[j]:
+                    push(j)
+
+        return rows
+
+    def _assign_staff(self) -> List[int]:
+        """Pick a staff member per lesson, spreading hours over the eligible staff"""
+        rng = self.scheduler.rng
+        load = {}
+        staff = [0] * len(self.lessons)
+        for i in rng.permutation(len(self.lessons)).tolist():
+            lesson = self.lessons[i]
+            options = list(lesson.staff_options)
+            rng.shuffle(options)
+            chosen = min(options, key=lambda code: load.get(code, 0))
+            load[chosen] = load.get(chosen, 0) + lesson.length
+            staff[i] = chosen
+        return staff
+
+    def _choose_time(self, lesson: Lesson, starts: List[int],
+                     class_free: Dict[int, List[int]]) -> Tuple[int, int]:
+        """Random feasible (day, start slot); falls back to class-free or any time"""
+        for candidates in (
+            starts,
+            [_run_starts(mask, lesson.length) for mask in class_free[lesson.class_code]],
+            [_run_starts(mask, lesson.length) for mask in self.class_masks[lesson.class_code]],
+        ):
+            total = sum(_popcount(mask) for mask in candidates)
+            if total:
+                rank = int(self.scheduler.rng.integers(total))
+                for day, mask in enumerate(candidates):
+                    count = _popcount(mask)
+                    if rank < count:
+                        for _ in range(rank):
+                            mask &= mask - 1
+                        return day, (mask & -mask).bit_length()
+                    rank -= count
+        # The class week is shorter than the lesson; keep the gene anyway
+        return 0, 1
@@ -0,0 +1,44 @@
+"""
+Bounded LRU Cache for Chromosome Fitness Scores
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Fitness, conflicts, workload violations, distribution violations, changed lessons
+FitnessResult = Tuple[float, int, int, int, int]
+
+
+class FitnessCache:
+    """
+    Least-recently-used map from chromosome fingerprint to the counts-only
+    evaluation result (FitnessResult, as stored by store_fitness).
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint: int) -> Optional[FitnessResult]:
+        result = self._entries.get(fingerprint)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(fingerprint)
+        self.hits += 1
+        return result
+
+    def put(self, fingerprint: int, result: FitnessResult):
+        self._entries[fingerprint] = result
+        self._entries.move_to_end(fingerprint)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,379 @@
+"""
+Vectorised Population Fitness Evaluation for the Genetic Algorithm
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import numpy as np
+from typing import Sequence
+
+from .chromosome import (
+    ArrayChromosome, GENE_COLUMNS,
+    COL_CLASS, COL_DAY, COL_SLOT, COL_SUBJECT, COL_STAFF, COL_ROOM, COL_KIND,
+    KIND_LAB,
+)
+
+# Penalty weights shared by every fitness implementation
+CONFLICT_WEIGHT = 10
+WORKLOAD_WEIGHT = 5
+PREFERENCE_WEIGHT = 2
+DISTRIBUTION_WEIGHT = 3
+
+# Key spaces up to this size are histogrammed with a dense bincount,
+# larger ones fall back to sorting the occupied keys
+DENSE_KEY_LIMIT = 1 << 22
+
+
+def score(conflicts, workload, distribution, changes=0, change_weight=0.0):
+    """Combine violation counts into a fitness score (works on scalars and arrays)"""
+    penalty = (conflicts * CONFLICT_WEIGHT + workload * WORKLOAD_WEIGHT
+               + distribution * DISTRIBUTION_WEIGHT + changes * change_weight)
+    return np.maximum(0.0, 100.0 - penalty)
+
+
+def store_fitness(chromosome: ArrayChromosome, fitness: float, conflict_count: int,
+                  workload: int, distribution: int, changes: int = 0):
+    """Record counts-only evaluation results on a chromosome"""
+    chromosome.fitness_score = fitness
+    chromosome.fitness_valid = True
+    chromosome.conflict_count = conflict_count
+    chromosome.penalties = {
+        'workload': workload,
+        'preferences': 0,
+        'distribution': distribution,
+        'changes': changes,
+    }
+
+
+def store_results(population: Sequence[ArrayChromosome], results: np.ndarray):
+    """Store rows produced by PopulationFitnessEvaluator.score_genes on their chromosomes"""
+    for chromosome, (fitness, conflicts, workload, distribution, changes) in zip(population, results.tolist()):
+        store_fitness(chromosome, fitness, int(conflicts), int(workload), int(distribution), int(changes))
+
+
+class PopulationFitnessEvaluator:
+    """
+    Scores a whole population in one call.
+
+    Every gene of every chromosome is flattened into one matrix and each
+    constraint becomes an occupancy histogram over integer keys such as
+    (chromosome, staff, day, slot). Double-bookings and workload overflows
+    are then the counts above the allowed limit, summed per chromosome.
+    """
+
+    def __init__(self, num_staff: int, num_rooms: int, num_classes: int,
+                 num_days: int, num_slots: int,
+                 staff_max_daily: np.ndarray, staff_max_weekly: np.ndarray,
+                 room_is_lab: np.ndarray):
+        self.num_staff = num_staff
+        self.num_rooms = num_rooms
+        self.num_classes = num_classes
+        self.num_days = num_days
+        self.num_slots = num_slots
+        self.staff_max_daily = np.asarray(staff_max_daily, dtype=np.int64)
+        self.staff_max_weekly = np.asarray(staff_max_weekly, dtype=np.int64)
+        self.room_is_lab = np.asarray(room_is_lab, dtype=bool)
+        # Minimal-change objective: lesson published at each (class, day, slot)
+        self.reference_lessons = None
+        self.change_weight = 0.0
+
+    def set_reference(self, reference_genes: np.ndarray, change_weight: float):
+        """Penalise every gene that differs from the reference timetable at its class slot"""
+        genes = np.asarray(reference_genes, dtype=np.int64).reshape(-1, GENE_COLUMNS)
+        reference = np.full(self.num_classes * self.num_days * self.num_slots, -1, dtype=np.int64)
+        reference[self._cell_keys(genes)] = self._lesson_codes(genes)
+        self.reference_lessons = reference
+        self.change_weight = change_weight
+
+    def _cell_keys(self, genes: np.ndarray) -> np.ndarray:
+        return (genes[:, COL_CLASS] * self.num_days + genes[:, COL_DAY]) * self.num_slots + genes[:, COL_SLOT]
+
+    def _lesson_codes(self, genes: np.ndarray) -> np.ndarray:
+        return (genes[:, COL_SUBJECT] * self.num_staff + genes[:, COL_STAFF]) * self.num_rooms + genes[:, COL_ROOM]
+
+    def changed_lessons(self, genes: np.ndarray) -> np.ndarray:
+        """Mask of genes whose subject, staff or room differ from the reference at their slot"""
+        genes = np.asarray(genes, dtype=np.int64).reshape(-1, GENE_COLUMNS)
+        if self.reference_lessons is None:
+            return np.zeros(len(genes), dtype=bool)
+        return self.reference_lessons[self._cell_keys(genes)] != self._lesson_codes(genes)
+
+    def evaluate(self, population: Sequence[ArrayChromosome]) -> np.ndarray:
+        """Calculate and store fitness for every chromosome, returning the scores"""
+        results = self.score_genes([chromosome.genes for chromosome in population])
+        store_results(population, results)
+        return results[:, 0]
+
+    def score_genes(self, gene_matrices: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Score raw gene matrices. Returns one row per matrix holding (fitness,
+        conflict count, workload violations, distribution violations, changed lessons).
+        """
+        size = len(gene_matrices)
+        if size == 0:
+            return np.zeros((0, 5))
+
+        lengths = np.fromiter((len(g) for g in gene_matrices), dtype=np.int64, count=size)
+        genes = np.concatenate(gene_matrices).astype(np.int64, copy=False)
+        owner = np.repeat(np.arange(size, dtype=np.int64), lengths)
+
+        day = genes[:, COL_DAY]
+        slot = genes[:, COL_SLOT]
+        staff = genes[:, COL_STAFF]
+        time_key = day * self.num_slots + slot
+        time_space = self.num_days * self.num_slots
+
+        # Hard constraints: more than one booking per resource and time slot
+        conflicts = self._double_bookings(owner, staff, self.num_staff, time_key, time_space, size)
+        conflicts += self._double_bookings(owner, genes[:, COL_ROOM], self.num_rooms, time_key, time_space, size)
+        conflicts += self._double_bookings(owner, genes[:, COL_CLASS], self.num_classes, time_key, time_space, size)
+
+        misplaced_labs = (genes[:, COL_KIND] == KIND_LAB) & ~self.room_is_lab[genes[:, COL_ROOM]]
+        conflicts += np.bincount(owner[misplaced_labs], minlength=size)
+
+        # Soft constraints
+        workload = self._workload_violations(owner, staff, day, size)
+        sorted_owner, sorted_genes, adjacent = self._adjacent_repeats(owner, genes)
+        distribution = np.bincount(sorted_owner[:-1][adjacent], minlength=size)
+        changes = np.bincount(owner[self.changed_lessons(genes)], minlength=size)
+
+        fitness = score(conflicts, workload, distribution, changes, self.change_weight)
+        return np.column_stack((fitness, conflicts, workload, distribution, changes))
+
+    def build_state(self, chromosome: ArrayChromosome) -> 'FitnessState':
+        """Build occupancy counters for a single chromosome"""
+        genes = chromosome.genes.astype(np.int64, copy=False)
+        day = genes[:, COL_DAY]
+        staff = genes[:, COL_STAFF]
+        time_key = day * self.num_slots + genes[:, COL_SLOT]
+        grid = (self.num_days, self.num_slots)
+
+        def occupancy(resource, num_resources):
+            keys = resource * self.num_days * self.num_slots + time_key
+            counts = np.bincount(keys, minlength=num_resources * self.num_days * self.num_slots)
+            return counts.astype(np.int16).reshape((num_resources,) + grid)
+
+        staff_weekly = np.bincount(staff, minlength=self.num_staff).astype(np.int16)
+        staff_daily = np.bincount(staff * self.num_days + day,
+                                  minlength=self.num_staff * self.num_days)
+        staff_daily = staff_daily.astype(np.int16).reshape(self.num_staff, self.num_days)
+
+        owner = np.zeros(len(genes), dtype=np.int64)
+        _, sorted_genes, adjacent = self._adjacent_repeats(owner, genes)
+        first = sorted_genes[:-1][adjacent]
+        class_day_distribution = np.bincount(
+            first[:, COL_CLASS] * self.num_days + first[:, COL_DAY],
+            minlength=self.num_classes * self.num_days,
+        ).reshape(self.num_classes, self.num_days)
+
+        misplaced_labs = (genes[:, COL_KIND] == KIND_LAB) & ~self.room_is_lab[genes[:, COL_ROOM]]
+
+        return FitnessState(
+            evaluator=self,
+            staff_occupancy=occupancy(staff, self.num_staff),
+            room_occupancy=occupancy(genes[:, COL_ROOM], self.num_rooms),
+            class_occupancy=occupancy(genes[:, COL_CLASS], self.num_classes),
+            staff_daily=staff_daily,
+            staff_weekly=staff_weekly,
+            class_day_distribution=class_day_distribution,
+            lab_violations=int(misplaced_labs.sum()),
+            changes=int(self.changed_lessons(genes).sum()),
+        )
+
+    def _double_bookings(self, owner: np.ndarray, resource: np.ndarray, num_resources: int,
+                         time_key: np.ndarray, time_space: int, size: int) -> np.ndarray:
+        keys = (owner * num_resources + resource) * time_space + time_key
+        return self._excess_by_owner(keys, size * num_resources * time_space,
+                                     num_resources * time_space, 1, size)
+
+    def _workload_violations(self, owner: np.ndarray, staff: np.ndarray,
+                             day: np.ndarray, size: int) -> np.ndarray:
+        weekly_keys = owner * self.num_staff + staff
+        weekly = self._excess_by_owner(weekly_keys, size * self.num_staff, self.num_staff,
+                                       self.staff_max_weekly, size, limit_stride=1)
+
+        daily_keys = weekly_keys * self.num_days + day
+        daily = self._excess_by_owner(daily_keys, size * self.num_staff * self.num_days,
+                                      self.num_staff * self.num_days,
+                                      self.staff_max_daily, size, limit_stride=self.num_days)
+        return weekly + daily
+
+    def _adjacent_repeats(self, owner: np.ndarray, genes: np.ndarray):
+        """
+        Sort genes by (chromosome, class, day, slot) and flag back-to-back
+        sessions of the same subject; the flag marks the earlier gene.
+        """
+        # lexsort is stable, so equal slots keep chromosome order like list.sort
+        order = np.lexsort((genes[:, COL_SLOT], genes[:, COL_DAY], genes[:, COL_CLASS], owner))
+        sorted_owner = owner[order]
+        sorted_genes = genes[order]
+
+        current, following = slice(None, -1), slice(1, None)
+        adjacent = (
+            (sorted_owner[current] == sorted_owner[following])
+            & (sorted_genes[current, COL_CLASS] == sorted_genes[following, COL_CLASS])
+            & (sorted_genes[current, COL_DAY] == sorted_genes[following, COL_DAY])
+            & (sorted_genes[current, COL_SUBJECT] == sorted_genes[following, COL_SUBJECT])
+            & (sorted_genes[following, COL_SLOT] == sorted_genes[current, COL_SLOT] + 1)
+        )
+        return sorted_owner, sorted_genes, adjacent
+
+    @staticmethod
+    def _excess_by_owner(keys: np.ndarray, key_space: int, owner_stride: int, limit,
+                         size: int, limit_stride: int = None) -> np.ndarray:
+        """
+        Histogram ``keys`` and sum the occupancy above ``limit`` per chromosome.
+
+        ``limit`` is either a scalar or an array indexed by
+        ``(key % owner_stride) // limit_stride`` (the resource of the key).
+        """
+        if key_space <= DENSE_KEY_LIMIT:
+            counts = np.bincount(keys, minlength=key_space)
+            occupied = np.flatnonzero(counts)
+            counts = counts[occupied]
+        else:
+            occupied, counts = np.unique(keys, return_counts=True)
+
+        if limit_stride is not None:
+            limit = limit[(occupied % owner_stride) // limit_stride]
+
+        excess = counts - limit
+        over = excess > 0
+        return np.bincount(occupied[over] // owner_stride, weights=excess[over],
+                           minlength=size).astype(np.int64)
+
+
+class FitnessState:
+    """
+    Occupancy counters of one chromosome: bookings per staff/room/class and
+    (day, slot), plus staff workload tallies. Moving a gene updates the
+    counters and every violation total in constant time, so conflict repair
+    can try many moves on one timetable without re-scoring it.
+
+    States may be shared between identical chromosomes; call ``copy`` before
+    moving genes of a chromosome whose state could be shared.
+    """
+
+    def __init__(self, evaluator: PopulationFitnessEvaluator,
+                 staff_occupancy: np.ndarray, room_occupancy: np.ndarray,
+                 class_occupancy: np.ndarray, staff_daily: np.ndarray,
+                 staff_weekly: np.ndarray, class_day_distribution: np.ndarray,
+                 lab_violations: int, changes: int = 0, totals: dict = None):
+        self.evaluator = evaluator
+        self.staff_occupancy = staff_occupancy
+        self.room_occupancy = room_occupancy
+        self.class_occupancy = class_occupancy
+        self.staff_daily = staff_daily
+        self.staff_weekly = staff_weekly
+        self.class_day_distribution = class_day_distribution
+
+        if totals is None:
+            totals = {
+                'staff_conflicts': self._excess(staff_occupancy, 1),
+                'room_conflicts': self._excess(room_occupancy, 1),
+                'class_conflicts': self._excess(class_occupancy, 1),
+                'lab_violations': lab_violations,
+                'workload': (self._excess(staff_weekly, evaluator.staff_max_weekly)
+                             + self._excess(staff_daily, evaluator.staff_max_daily[:, None])),
+                'distribution': int(class_day_distribution.sum()),
+                'changes': changes,
+            }
+        self.totals = totals
+
+    @staticmethod
+    def _excess(counts: np.ndarray, limit) -> int:
+        return int(np.maximum(counts.astype(np.int64) - limit, 0).sum())
+
+    def copy(self) -> 'FitnessState':
+        return FitnessState(
+            evaluator=self.evaluator,
+            staff_occupancy=self.staff_occupancy.copy(),
+            room_occupancy=self.room_occupancy.copy(),
+            class_occupancy=self.class_occupancy.copy(),
+            staff_daily=self.staff_daily.copy(),
+            staff_weekly=self.staff_weekly.copy(),
+            class_day_distribution=self.class_day_distribution.copy(),
+            lab_violations=self.totals['lab_violations'],
+            totals=dict(self.totals),
+        )
+
+    @property
+    def conflict_count(self) -> int:
+        totals = self.totals
+        return (totals['staff_conflicts'] + totals['room_conflicts']
+                + totals['class_conflicts'] + totals['lab_violations'])
+
+    @property
+    def fitness(self) -> float:
+        totals = self.totals
+        return float(score(self.conflict_count, totals['workload'], totals['distribution'],
+                           totals['changes'], self.evaluator.change_weight))
+
+    def move_gene(self, chromosome: ArrayChromosome, index: int,
+                  day: int, slot: int, staff: int, room: int):
+        """Reassign one gene of ``chromosome`` and update the counters incrementally"""
+        class_code, old_day, old_slot, subject, old_staff, old_room, kind = chromosome.gene(index).tolist()
+        is_lab = kind == KIND_LAB
+
+        self._book(class_code, old_day, old_slot, subject, old_staff, old_room, is_lab, -1)
+        chromosome.update_gene(index, day, slot, staff, room)
+        self._book(class_code, day, slot, subject, staff, room, is_lab, 1)
+
+        if (day, slot) != (old_day, old_slot):
+            self._refresh_distribution(chromosome, class_code, old_day)
+            if day != old_day:
+                self._refresh_distribution(chromosome, class_code, day)
+
+    def _book(self, class_code: int, day: int, slot: int, subject: int, staff: int, room: int,
+              is_lab: bool, delta: int):
+        """Add (delta=1) or remove (delta=-1) one booking"""
+        totals = self.totals
+        evaluator = self.evaluator
+
+        # A booking is a double-booking whenever its cell holds another one
+        for key, occupancy, resource in (('staff_conflicts', self.staff_occupancy, staff),
+                                         ('room_conflicts', self.room_occupancy, room),
+                                         ('class_conflicts', self.class_occupancy, class_code)):
+            before = int(occupancy[resource, day, slot])
+            occupancy[resource, day, slot] = before + delta
+            if max(before, before + delta) > 1:
+                totals[key] += delta
+
+        if is_lab and not evaluator.room_is_lab[room]:
+            totals['lab_violations'] += delta
+
+        if evaluator.reference_lessons is not None:
+            cell = (class_code * evaluator.num_days + day) * evaluator.num_slots + slot
+            lesson = (subject * evaluator.num_staff + staff) * evaluator.num_rooms + room
+            if evaluator.reference_lessons[cell] != lesson:
+                totals['changes'] += delta
+
+        weekly = int(self.staff_weekly[staff])
+        self.staff_weekly[staff] = weekly + delta
+        if max(weekly, weekly + delta) > evaluator.staff_max_weekly[staff]:
+            totals['workload'] += delta
+
+        daily = int(self.staff_daily[staff, day])
+        self.staff_daily[staff, day] = daily + delta
+        if max(daily, daily + delta) > evaluator.staff_max_daily[staff]:
+            totals['workload'] += delta
+
+    def _refresh_distribution(self, chromosome: ArrayChromosome, class_code: int, day: int):
+        """Recount back-to-back repeats for one class day (bounded by slots per day)"""
+        sessions = [(slot, subject)
+                    for _, gene_day, slot, subject, _, _, _ in chromosome.class_block(class_code).tolist()
+                    if gene_day == day]
+        sessions.sort(key=lambda x: x[0])
+
+        repeats = 0
+        for i in range(len(sessions) - 1):
+            if sessions[i][1] == sessions[i + 1][1] and sessions[i + 1][0] == sessions[i][0] + 1:
+                repeats += 1
+
+        self.totals['distribution'] += repeats - int(self.class_day_distribution[class_code, day])
+        self.class_day_distribution[class_code, day] = repeats
+
+    def apply_to(self, chromosome: ArrayChromosome):
+        """Store the state's fitness on the chromosome it describes"""
+        chromosome.fitness_state = self
+        store_fitness(chromosome, self.fitness, self.conflict_count,
+                      self.totals['workload'], self.totals['distribution'], self.totals['changes'])
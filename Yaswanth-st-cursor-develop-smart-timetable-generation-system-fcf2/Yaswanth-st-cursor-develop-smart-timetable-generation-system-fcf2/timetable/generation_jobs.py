@@ -0,0 +1,343 @@
+"""
+Background Timetable Generation Jobs
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import inspect
+from datetime import timedelta
+from time import monotonic
+from typing import Dict, Optional, Tuple
+import logging
+
+from django.conf import settings as django_settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .genetic_algorithm import GeneticAlgorithmScheduler
+from .persistence import publish_timetable
+from .progress_channel import ProgressChannel
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress writes of a running job
+PROGRESS_INTERVAL = 1.0
+# Seconds between live progress events; faster generations are coalesced
+PUBLISH_INTERVAL = 0.2
+# Seconds between checks of a running job's cancellation flag
+CANCEL_CHECK_INTERVAL = 1.0
+# Pending generations looked at per claim; the rest wait behind them
+CLAIM_CANDIDATES = 20
+# Seconds a running generation may go without a heartbeat from its worker
+# before it is failed as abandoned (worker killed, out of memory, redeployed)
+LEASE_SECONDS = 60
+
+_SCHEDULER_ARGUMENTS = set(inspect.signature(GeneticAlgorithmScheduler.__init__).parameters) - {'self'}
+
+
+def solver_slots() -> int:
+    """Generations allowed to run at the same time, over all workers"""
+    return max(1, getattr(django_settings, 'TIMETABLE_GENERATION_SLOTS', 1))
+
+
+def enqueue_generation(academic_year: str, semester: int, department: Optional[str],
+                       generated_by: str, settings: Dict, priority: int = 0) -> Tuple[object, bool]:
+    """
+    Record a pending generation for the worker to pick up; returns it and
+    whether it was created. ``settings`` are GeneticAlgorithmScheduler
+    arguments; the seed is fixed here so that the stored parameters replay
+    the run even if it fails. A generation already waiting for the same
+    academic year and department absorbs the request instead (taking the
+    higher priority).
+    """
+    from .models import TimetableGeneration
+
+    department = department or None
+    # The run must cover exactly the rows it publishes. Decomposition stays
+    # opt-in: it rules out islands and checkpoints and reports progress only
+    # per department, and a single department has nothing to split.
+    settings = {**settings, 'department': department}
+    if department is not None:
+        settings['decompose_by_department'] = False
+    scheduler = GeneticAlgorithmScheduler(**settings, academic_year=academic_year)
+    waiting_generations = TimetableGeneration.objects.filter(
+        academic_year=academic_year, department=department, status='pending')
+
+    while True:
+        waiting = waiting_generations.order_by('generation_id').first()
+        if waiting is not None:
+            if TimetableGeneration.objects.filter(generation_id=waiting.generation_id, status='pending',
+                                                  priority__lt=priority).update(priority=priority):
+                waiting.priority = priority
+            logger.info(f"Generation {waiting.generation_id} already queued for {academic_year} "
+                        f"({department or 'all departments'})")
+            return waiting, False
+        try:
+            with transaction.atomic():
+                generation = TimetableGeneration.objects.create(
+                    academic_year=academic_year,
+                    semester=semester,
+                    department=department,
+                    status='pending',
+                    priority=priority,
+                    generated_by=generated_by,
+                    generation_parameters=scheduler.run_parameters(),
+                )
+            break
+        except IntegrityError:
+            # Another request queued the same academic year and department
+            # first (unique_pending_generation); join that generation instead
+            continue
+
+    logger.info(f"Queued generation {generation.generation_id} for {academic_year} "
+                f"({department or 'all departments'}, priority {priority})")
+    return generation, True
+
+
+def cancel_generation(generation_id: int) -> bool:
+    """
+    Cancel a generation: a pending one at once, a running one after its
+    current GA generation. Returns False if it had already finished.
+    """
+    from .models import TimetableGeneration
+
+    generations = TimetableGeneration.objects.filter(generation_id=generation_id)
+    if generations.filter(status='pending').update(status='cancelled', cancel_requested=True,
+                                                   completed_at=timezone.now()):
+        logger.info(f"Generation {generation_id} cancelled before it started")
+        return True
+    if generations.filter(status='in_progress').update(cancel_requested=True):
+        logger.info(f"Cancellation of running generation {generation_id} requested")
+        return True
+    return False
+
+
+def scheduler_settings(generation) -> Dict:
+    """GeneticAlgorithmScheduler arguments recorded with a generation"""
+    return {name: value for name, value in generation.generation_parameters.items()
+            if name in _SCHEDULER_ARGUMENTS}
+
+
+def scheduler_for(generation, **overrides) -> GeneticAlgorithmScheduler:
+    """Scheduler configured from a generation's recorded run parameters"""
+    return GeneticAlgorithmScheduler(**scheduler_settings(generation),
+                                     academic_year=generation.academic_year, **overrides)
+
+
+class ProgressRecorder:
+    """
+    Progress callback of a running generation. Every generation is
+    published to the live progress channel (at most every
+    PUBLISH_INTERVAL); the database copy read by the status endpoint is
+    refreshed at most every PROGRESS_INTERVAL.
+    """
+
+    def __init__(self, generation_id: int, channel: ProgressChannel, interval: float = PROGRESS_INTERVAL):
+        self.generation_id = generation_id
+        self.channel = channel
+        self.interval = interval
+        self._last_write = None
+        self._last_publish = None
+        # Evaluations and elapsed time at the last publish, for the evaluation rate
+        self._evaluations = 0
+        self._published_evaluations = 0
+        self._published_elapsed = 0.0
+
+    def __call__(self, fraction: float, entry: Dict):
+        now = monotonic()
+        self._evaluations += entry.get('evaluations', 0)
+        if self._last_publish is None or now - self._last_publish >= PUBLISH_INTERVAL:
+            self._last_publish = now
+            self._publish(fraction, entry)
+
+        if self._last_write is not None and now - self._last_write < self.interval:
+            return
+        self._last_write = now
+
+        from .models import TimetableGeneration
+        fields = {'progress': round(100 * fraction, 1)}
+        if entry.get('best_fitness') is not None:
+            fields['fitness_score'] = entry['best_fitness']
+        if 'generation' in entry:
+            fields['current_generation'] = entry['generation'] + 1
+        TimetableGeneration.objects.filter(generation_id=self.generation_id).update(**fields)
+
+    def _publish(self, fraction: float, entry: Dict):
+        elapsed = entry.get('elapsed_seconds', 0.0)
+        span = elapsed - self._published_elapsed
+        rate = (self._evaluations - self._published_evaluations) / span if span > 0 else None
+        self._published_evaluations, self._published_elapsed = self._evaluations, elapsed
+
+        self.channel.publish('progress', {
+            'progress': round(100 * fraction, 1),
+            'generation': entry['generation'] + 1 if 'generation' in entry else None,
+            'department': entry.get('department'),
+            'best_fitness': entry.get('best_fitness'),
+            'average_fitness': entry.get('average_fitness'),
+            'conflicts': entry.get('conflicts'),
+            'evaluations_per_second': round(rate, 1) if rate is not None else None,
+            'elapsed_seconds': round(elapsed, 3),
+        })
+
+
+class CancellationCheck:
+    """cancel_check for a running generation, reading its flag at most every CANCEL_CHECK_INTERVAL"""
+
+    def __init__(self, generation_id: int, interval: float = CANCEL_CHECK_INTERVAL):
+        self.generation_id = generation_id
+        self.interval = interval
+        self._last_check = None
+        self._cancelled = False
+
+    def __call__(self) -> bool:
+        now = monotonic()
+        if self._cancelled or (self._last_check is not None and now - self._last_check < self.interval):
+            return self._cancelled
+        self._last_check = now
+
+        from .models import TimetableGeneration
+        self._cancelled = TimetableGeneration.objects.filter(
+            generation_id=self.generation_id, cancel_requested=True).exists()
+        return self._cancelled
+
+
+def _finish(generation, channel: ProgressChannel, update_fields=None) -> str:
+    """Store a generation's final state and announce it to live progress readers"""
+    generation.completed_at = timezone.now()
+    generation.save(update_fields=update_fields)
+    if update_fields is not None:
+        # Unfinished runs keep the progress last recorded by ProgressRecorder
+        generation.refresh_from_db(fields=['progress', 'current_generation', 'fitness_score'])
+    channel.publish('status', {
+        'status': generation.status,
+        'progress': generation.progress,
+        'fitness_score': generation.fitness_score,
+        'conflicts_resolved': generation.conflicts_resolved,
+        'total_slots_filled': generation.total_slots_filled,
+        'error_message': generation.error_message,
+        'academic_year': generation.academic_year,
+        'started_at': generation.started_at,
+        'completed_at': generation.completed_at,
+    })
+    return generation.status
+
+
+def run_generation(generation_id: int) -> str:
+    """Run one claimed generation to completion and publish it; returns the final status"""
+    from .models import TimetableGeneration
+
+    generation = TimetableGeneration.objects.get(generation_id=generation_id)
+    channel = ProgressChannel(generation_id)
+    channel.open()
+    try:
+        scheduler = scheduler_for(generation, progress_callback=ProgressRecorder(generation_id, channel),
+                                  cancel_check=CancellationCheck(generation_id))
+        best_chromosome, stats = scheduler.generate_timetable()
+        if stats['stop_reason'] == 'cancelled':
+            generation.refresh_from_db(fields=['status'])
+            if generation.status != 'in_progress':
+                # Failed meanwhile as abandoned, see fail_abandoned_generations
+                return generation.status
+            generation.status = 'cancelled'
+            logger.info(f"Generation {generation_id} cancelled after {stats['total_generations']} generations")
+            return _finish(generation, channel, update_fields=['status', 'completed_at'])
+        if not best_chromosome:
+            raise ValueError('Failed to generate valid timetable')
+        persistence = publish_timetable(scheduler, best_chromosome, generation.academic_year,
+                                        department=generation.department)
+    except Exception as e:
+        logger.exception(f"Generation {generation_id} failed: {e}")
+        generation.status = 'failed'
+        generation.error_message = str(e)
+        # The last recorded progress and fitness are left as they were
+        return _finish(generation, channel, update_fields=['status', 'error_message', 'completed_at'])
+
+    generation.status = 'completed'
+    generation.progress = 100.0
+    generation.current_generation = stats['total_generations']
+    generation.fitness_score = stats['best_fitness']
+    generation.conflicts_resolved = len(stats['conflicts'])
+    generation.total_slots_filled = len(best_chromosome)
+    # Per-generation history, kept with the generation (phase times are summarised below)
+    generation.generation_parameters['generation_stats'] = [
+        {name: value for name, value in entry.items() if name != 'phase_seconds'}
+        for entry in stats['generation_stats']
+    ]
+    if 'phase_timing' in stats:
+        generation.generation_parameters['phase_timing'] = stats['phase_timing']
+    generation.generation_parameters['persistence'] = persistence
+    logger.info(f"Generation {generation_id} completed with fitness {stats['best_fitness']:.2f}")
+    return _finish(generation, channel)
+
+
+def _overlaps(scope: Tuple[str, Optional[str]], other: Tuple[str, Optional[str]]) -> bool:
+    """Whether two (academic year, department) generations publish to the same rows"""
+    return scope[0] == other[0] and (scope[1] is None or other[1] is None or scope[1] == other[1])
+
+
+def claim_next_generation() -> Optional[int]:
+    """
+    Mark the next pending generation in progress and return its id. The
+    highest priority goes first, then the oldest. None when every solver
+    slot is busy or nothing can start: a generation waits while another
+    one publishing to the same academic year and department is running.
+    """
+    from .models import TimetableGeneration
+
+    fail_abandoned_generations()
+    # Workers claiming at the same instant may both see the last free slot;
+    # one worker (with --concurrency up to the slots) avoids that entirely
+    running = list(TimetableGeneration.objects.filter(status='in_progress')
+                   .values_list('academic_year', 'department'))
+    if len(running) >= solver_slots():
+        return None
+
+    pending = TimetableGeneration.objects.filter(status='pending').order_by(
+        '-priority', 'created_at', 'generation_id')
+    for generation_id, academic_year, department in pending.values_list(
+            'generation_id', 'academic_year', 'department')[:CLAIM_CANDIDATES]:
+        if any(_overlaps((academic_year, department), scope) for scope in running):
+            continue
+        # Conditional update: a generation claimed (or cancelled) meanwhile is skipped
+        now = timezone.now()
+        claimed = TimetableGeneration.objects.filter(generation_id=generation_id, status='pending').update(
+            status='in_progress', started_at=now, heartbeat_at=now)
+        if claimed:
+            return generation_id
+    return None
+
+
+def renew_leases(generation_ids):
+    """Heartbeat of the generations a worker is running, due at least every LEASE_SECONDS"""
+    from .models import TimetableGeneration
+
+    generation_ids = list(generation_ids)
+    if generation_ids:
+        TimetableGeneration.objects.filter(generation_id__in=generation_ids, status='in_progress').update(
+            heartbeat_at=timezone.now())
+
+
+def fail_abandoned_generations() -> int:
+    """
+    Fail running generations whose worker stopped renewing their lease, so
+    that they give back their solver slot and their academic year and
+    department. A solver process that outlived its worker sees the
+    cancellation flag and stops without publishing. Returns the number failed.
+    """
+    from .models import TimetableGeneration
+
+    now = timezone.now()
+    expired = now - timedelta(seconds=LEASE_SECONDS)
+    abandoned = TimetableGeneration.objects.filter(status='in_progress').filter(
+        Q(heartbeat_at__lt=expired) | Q(heartbeat_at__isnull=True, started_at__lt=expired))
+    failed = abandoned.update(status='failed', cancel_requested=True, completed_at=now,
+                              error_message='Abandoned by its generation worker')
+    if failed:
+        logger.warning(f"Failed {failed} generation(s) abandoned by their worker")
+    return failed
+
+
+def initialize_worker():
+    """Process pool initializer: Django must be set up in processes that were not forked"""
+    import django
+    django.setup()
@@ -3,13 +3,32 @@ Genetic Algorithm for Smart Timetable Generation
 Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
 """
 
-import random
+import bisect
+import secrets
 import numpy as np
 from datetime import datetime, time, timedelta
-from typing import List, Dict, Tuple, Optional
-import copy
+from time import monotonic
+from typing import Callable, List, Dict, Tuple, Optional
 import logging
 
+from .chromosome import (
+    ArrayChromosome, ProblemEncoding,
+    COL_CLASS, COL_DAY, COL_SLOT, COL_SUBJECT, COL_STAFF, COL_ROOM, COL_KIND,
+    KIND_CORE, KIND_LAB, KIND_ELECTIVE,
+)
+from .fitness_evaluator import (
+    PopulationFitnessEvaluator, store_fitness,
+    CONFLICT_WEIGHT, WORKLOAD_WEIGHT, PREFERENCE_WEIGHT, DISTRIBUTION_WEIGHT,
+)
+from .checkpoint import load_checkpoint, save_checkpoint
+from .dsatur_seeding import DSaturSeeder
+from .fitness_cache import FitnessCache
+from .local_search import ConflictRepair
+from .parallel_evaluation import ParallelFitnessEvaluator
+from .phase_timing import NULL_PHASE_TIMER, PhaseTimer, summarize_phases
+from .slot_allocator import SlotAllocator
+from .warm_start import load_reference_rows, reconcile_reference
+
 logger = logging.getLogger(__name__)
 
 class TimetableGene:
@@ -61,7 +80,33 @@ class GeneticAlgorithmScheduler:
                  mutation_rate: float = 0.15,
                  crossover_rate: float = 0.8,
                  elite_ratio: float = 0.1,
-                 tournament_size: int = 5):
+                 tournament_size: int = 5,
+                 workers: int = 1,
+                 islands: int = 1,
+                 migration_interval: int = 10,
+                 migration_size: int = 2,
+                 migration_topology: str = 'ring',
+                 fitness_cache_size: int = 10000,
+                 local_search: bool = False,
+                 local_search_passes: int = 3,
+                 seeding_ratio: float = 0.0,
+                 max_seconds: Optional[float] = None,
+                 max_evaluations: Optional[int] = None,
+                 stagnation_generations: Optional[int] = None,
+                 stagnation_action: str = 'stop',
+                 checkpoint_path: Optional[str] = None,
+                 checkpoint_interval: int = 10,
+                 department: Optional[str] = None,
+                 decompose_by_department: bool = False,
+                 department_workers: Optional[int] = None,
+                 warm_start: bool = False,
+                 academic_year: Optional[str] = None,
+                 warm_start_ratio: float = 0.5,
+                 minimal_change_weight: float = 1.0,
+                 seed=None,
+                 profile_phases: bool = False,
+                 progress_callback: Optional[Callable[[float, Dict], None]] = None,
+                 cancel_check: Optional[Callable[[], bool]] = None):
         
         self.population_size = population_size
         self.generations = generations
@@ -69,6 +114,59 @@ class GeneticAlgorithmScheduler:
         self.crossover_rate = crossover_rate
         self.elite_ratio = elite_ratio
         self.tournament_size = tournament_size
+        # Number of processes used for fitness evaluation (1 = in-process)
+        self.workers = workers
+        # Island model: independent populations exchanging their best
+        # chromosomes every migration_interval generations
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.migration_topology = migration_topology
+        # Fitness memoisation by chromosome fingerprint (0 disables the cache)
+        self.fitness_cache_size = fitness_cache_size
+        self.fitness_cache = FitnessCache(fitness_cache_size) if fitness_cache_size > 0 else None
+        # Memetic step: repair conflicts of the elites each generation and of the final best
+        self.local_search = local_search
+        self.local_search_passes = local_search_passes
+        self._conflict_repair = None
+        # Fraction of the initial population built by DSatur graph colouring
+        self.seeding_ratio = seeding_ratio
+        # Anytime budgets: wall-clock seconds and fitness evaluations (None = unlimited)
+        self.max_seconds = max_seconds
+        self.max_evaluations = max_evaluations
+        # Generations without improvement before the run stops or restarts
+        if stagnation_action not in ('stop', 'restart'):
+            raise ValueError(f"Unknown stagnation action: {stagnation_action}")
+        self.stagnation_generations = stagnation_generations
+        self.stagnation_action = stagnation_action
+        # Periodic on-disk checkpoints of the population (single-population runs)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        # Generation statistics entries (and bytes) already in the checkpoint's sidecar
+        self.checkpointed_stats = (0, 0)
+        # Restrict the problem to one department's classes, or solve every
+        # department as its own subproblem in parallel and merge the results
+        self.department = department
+        self.decompose_by_department = decompose_by_department
+        self.department_workers = department_workers
+        # Warm start: seed from the published timetable of academic_year and
+        # penalise every lesson that differs from it (minimal-change objective)
+        self.warm_start = warm_start
+        self.academic_year = academic_year
+        self.warm_start_ratio = warm_start_ratio
+        self.minimal_change_weight = minimal_change_weight
+        # Every random draw comes from this scheduler's generator. Unseeded runs
+        # pick a seed too, so any run can be reproduced from its recorded seed.
+        # A numpy SeedSequence is accepted for child streams (islands, departments).
+        self.seed = seed if seed is not None else secrets.randbits(63)
+        self.reset_rng()
+        # Per-phase wall times in generation_stats; a shared no-op timer when off
+        self.profile_phases = profile_phases
+        self.phase_timer = PhaseTimer() if profile_phases else NULL_PHASE_TIMER
+        # Called with (completed fraction, generation statistics) as the run advances
+        self.progress_callback = progress_callback
+        # Polled between generations; a True answer stops the run without a result
+        self.cancel_check = cancel_check
         
         # Data containers
         self.staff_data = {}
@@ -76,6 +174,10 @@ class GeneticAlgorithmScheduler:
         self.class_data = {}
         self.room_data = {}
         self.elective_data = {}
+        self.reference_rows = None
+        self.encoding = None
+        self.fitness_evaluator = None
+        self._parallel_evaluator = None
         
         # Constraints
         self.days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
@@ -94,6 +196,21 @@ class GeneticAlgorithmScheduler:
         # Generation statistics
         self.generation_stats = []
         self.best_fitness_history = []
+        self._evaluation_counts = {
+            'evaluations': 0,
+            'fitness_reused': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'repair_moves': 0,
+        }
+        
+        # Anytime progress, readable through best_so_far() while a run is going
+        self.evaluations_used = 0
+        self.restarts = 0
+        self.stop_reason = None
+        self._started_at = None
+        self._best_chromosome = None
+        self.last_improvement = 0
     
     def load_data(self):
         """Load all necessary data from database"""
@@ -126,8 +243,11 @@ class GeneticAlgorithmScheduler:
                     'lab_duration': subject.lab_duration_hours,
                 }
             
-            # Load class data
-            for class_section in ClassSection.objects.all():
+            # Load class data (staff, rooms and electives stay shared across departments)
+            class_sections = ClassSection.objects.all()
+            if self.department:
+                class_sections = class_sections.filter(department=self.department)
+            for class_section in class_sections:
                 self.class_data[class_section.class_id] = {
                     'year': class_section.year,
                     'section': class_section.section,
@@ -163,318 +283,537 @@ class GeneticAlgorithmScheduler:
             logger.info(f"Data loaded: {len(self.staff_data)} staff, {len(self.subject_data)} subjects, "
                        f"{len(self.class_data)} classes, {len(self.room_data)} rooms")
             
+            if self.warm_start:
+                self.reference_rows = load_reference_rows(self.academic_year, self.class_data.keys())
+            
+            self._build_problem_indexes()
+            
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             raise
     
-    def create_initial_population(self) -> List[TimetableChromosome]:
+    def problem_data(self) -> Dict:
+        """Loaded problem instance as plain picklable dictionaries"""
+        return {
+            'staff_data': self.staff_data,
+            'subject_data': self.subject_data,
+            'class_data': self.class_data,
+            'room_data': self.room_data,
+            'elective_data': self.elective_data,
+            'reference_rows': self.reference_rows,
+        }
+    
+    def load_problem(self, problem: Dict):
+        """Load a problem instance produced by problem_data() without touching the database"""
+        self.staff_data = problem['staff_data']
+        self.subject_data = problem['subject_data']
+        self.class_data = problem['class_data']
+        self.room_data = problem['room_data']
+        self.elective_data = problem['elective_data']
+        self.reference_rows = problem.get('reference_rows')
+        self._build_problem_indexes()
+    
+    def reset_rng(self):
+        """Restart the random stream from the scheduler's seed"""
+        if isinstance(self.seed, np.random.SeedSequence):
+            entropy, spawn_key = self.seed.entropy, self.seed.spawn_key
+        else:
+            entropy, spawn_key = self.seed, ()
+        self.seed_sequence = np.random.SeedSequence(entropy, spawn_key=spawn_key)
+        self.rng = np.random.default_rng(self.seed_sequence)
+    
+    def spawn_seeds(self, count: int) -> List[np.random.SeedSequence]:
+        """Independent child seeds for schedulers running in other processes"""
+        return self.seed_sequence.spawn(count)
+    
+    def run_parameters(self) -> Dict:
+        """Settings and seed needed to reproduce this run (stored with the generation record)"""
+        return {
+            **self.worker_settings(),
+            'seed': self.seed if not isinstance(self.seed, np.random.SeedSequence) else None,
+            'workers': self.workers,
+            'islands': self.islands,
+            'migration_interval': self.migration_interval,
+            'migration_size': self.migration_size,
+            'migration_topology': self.migration_topology,
+            'max_seconds': self.max_seconds,
+            'max_evaluations': self.max_evaluations,
+            'stagnation_generations': self.stagnation_generations,
+            'stagnation_action': self.stagnation_action,
+            'department': self.department,
+            'decompose_by_department': self.decompose_by_department,
+            'warm_start': self.warm_start,
+        }
+    
+    def worker_settings(self) -> Dict:
+        """Constructor arguments for schedulers solving parts of this run in other processes"""
+        return {
+            'population_size': self.population_size,
+            'generations': self.generations,
+            'mutation_rate': self.mutation_rate,
+            'crossover_rate': self.crossover_rate,
+            'elite_ratio': self.elite_ratio,
+            'tournament_size': self.tournament_size,
+            'fitness_cache_size': self.fitness_cache_size,
+            'local_search': self.local_search,
+            'local_search_passes': self.local_search_passes,
+            'seeding_ratio': self.seeding_ratio,
+            'warm_start_ratio': self.warm_start_ratio,
+            'minimal_change_weight': self.minimal_change_weight,
+            'profile_phases': self.profile_phases,
+        }
+    
+    def _build_problem_indexes(self):
+        """Build the per-run lookup structures derived from the loaded data"""
+        # Cached fitness values were scored against the previously loaded problem
+        if self.fitness_cache is not None:
+            self.fitness_cache.clear()
+        self._build_encoding()
+        self._build_eligibility_indexes()
+        self._build_fitness_evaluator()
+        if self.local_search:
+            self._conflict_repair = ConflictRepair(self, max_passes=self.local_search_passes)
+    
+    def _build_eligibility_indexes(self):
+        """Invert staff and room data so candidate lookups avoid full scans"""
+        # Staff: code -> eligible staff ids, in staff_data order
+        handled = {'subjects': {}, 'labs': {}, 'electives': {}}
+        for staff_id, staff_info in self.staff_data.items():
+            for field, index in handled.items():
+                for code in staff_info[field]:
+                    index.setdefault(code, set()).add(staff_id)
+        
+        staff_order = {staff_id: position for position, staff_id in enumerate(self.staff_data)}
+        self._eligible_staff = {}
+        for is_lab, field in ((False, 'subjects'), (True, 'labs')):
+            eligible = {}
+            for code in set(handled[field]) | set(handled['electives']):
+                staff_ids = handled[field].get(code, set()) | handled['electives'].get(code, set())
+                eligible[code] = tuple(sorted(staff_ids, key=staff_order.__getitem__))
+            self._eligible_staff[is_lab] = eligible
+        
+        # Rooms: room type -> (sorted capacities, room ids) for bisect lookups
+        room_types = {
+            'lab': {'lab'},
+            'lecture': {'classroom', 'seminar_hall'},
+            'any': None,
+        }
+        self._rooms_by_capacity = {}
+        for room_type, accepted in room_types.items():
+            rooms = sorted(
+                (room_info['capacity'], room_id) for room_id, room_info in self.room_data.items()
+                if accepted is None or room_info['type'] in accepted
+            )
+            self._rooms_by_capacity[room_type] = (
+                [capacity for capacity, _ in rooms],
+                tuple(room_id for _, room_id in rooms),
+            )
+        
+        self._lab_rooms = tuple(room_id for room_id, room_info in self.room_data.items()
+                                if room_info['type'] == 'lab')
+    
+    def _build_encoding(self):
+        """Intern every identifier the loaded problem can put into a gene"""
+        subject_codes = list(self.subject_data.keys())
+        for class_info in self.class_data.values():
+            subject_codes.extend(s['subject_code'] for s in class_info['subjects'])
+            subject_codes.extend(lab['lab_code'] for lab in class_info['labs'])
+            subject_codes.extend(class_info['electives'])
+        
+        staff_ids = list(self.staff_data.keys())
+        staff_ids.extend(elective['staff'] for elective in self.elective_data.values())
+        
+        self.encoding = ProblemEncoding(
+            days=self.days,
+            class_ids=self.class_data.keys(),
+            subject_codes=subject_codes,
+            staff_ids=staff_ids,
+            room_ids=self.room_data.keys(),
+        )
+    
+    def _build_fitness_evaluator(self):
+        """Prepare the static per-resource arrays used by batched fitness evaluation"""
+        enc = self.encoding
+        staff_info = [self.staff_data.get(staff_id, {}) for staff_id in enc.staff.values]
+        max_slot = max([max(self.time_slots)] +
+                       [class_info['slots_per_day'] for class_info in self.class_data.values()])
+        
+        self.fitness_evaluator = PopulationFitnessEvaluator(
+            num_staff=len(enc.staff),
+            num_rooms=len(enc.rooms),
+            num_classes=enc.num_classes,
+            num_days=len(enc.days),
+            num_slots=max_slot + 1,
+            staff_max_daily=[info.get('max_sessions_per_day', 8) for info in staff_info],
+            staff_max_weekly=[info.get('max_sessions_per_week', 30) for info in staff_info],
+            room_is_lab=[self.room_data[room_id]['type'] == 'lab' for room_id in enc.rooms.values],
+        )
+        
+        if self.reference_rows:
+            self.fitness_evaluator.set_reference(self._encode_reference_rows(), self.minimal_change_weight)
+    
+    def _encode_reference_rows(self) -> List[Tuple[int, ...]]:
+        """Reference timetable rows whose identifiers are all part of the current problem"""
+        enc = self.encoding
+        rows = []
+        for class_id, day, slot, subject_code, staff_id, room_id, kind in self.reference_rows:
+            if (class_id in enc.classes and day in enc.day_index and subject_code in enc.subjects
+                    and staff_id in enc.staff and room_id in enc.rooms
+                    and 0 <= slot < self.fitness_evaluator.num_slots):
+                rows.append(self._encode_row(class_id, day, slot, subject_code, staff_id, room_id, kind))
+        return rows
+    
+    def encode_chromosome(self, chromosome: TimetableChromosome) -> ArrayChromosome:
+        """Convert gene objects into the array representation used by the GA"""
+        rows = [
+            self._encode_row(gene.class_section_id, gene.day, gene.slot, gene.subject_code,
+                             gene.staff_id, gene.room_id,
+                             KIND_ELECTIVE if gene.is_elective else KIND_LAB if gene.is_lab else KIND_CORE)
+            for gene in chromosome.genes
+        ]
+        encoded = ArrayChromosome.from_rows(rows, self.encoding.num_classes)
+        encoded.fitness_score = chromosome.fitness_score
+        encoded.penalties = dict(chromosome.penalties)
+        return encoded
+    
+    def decode_chromosome(self, chromosome: ArrayChromosome) -> TimetableChromosome:
+        """Convert an array chromosome back into gene objects (e.g. for persistence)"""
+        enc = self.encoding
+        genes = [
+            TimetableGene(
+                class_section_id=enc.classes[class_code],
+                day=enc.days[day],
+                slot=slot,
+                subject_code=enc.subjects[subject],
+                staff_id=enc.staff[staff],
+                room_id=enc.rooms[room],
+                is_lab=kind == KIND_LAB,
+                is_elective=kind == KIND_ELECTIVE,
+            )
+            for class_code, day, slot, subject, staff, room, kind in chromosome.genes.tolist()
+        ]
+        decoded = TimetableChromosome(genes)
+        decoded.fitness_score = chromosome.fitness_score
+        decoded.conflicts = self.describe_conflicts(chromosome) if chromosome.conflict_count else []
+        decoded.penalties = dict(chromosome.penalties)
+        return decoded
+    
+    def _encode_row(self, class_id: str, day: str, slot: int, subject_code: str,
+                    staff_id: str, room_id: str, kind: int) -> Tuple[int, ...]:
+        enc = self.encoding
+        return (enc.classes.codes[class_id], enc.day_index[day], slot,
+                enc.subjects.codes[subject_code], enc.staff.codes[staff_id],
+                enc.rooms.codes[room_id], kind)
+    
+    def create_initial_population(self) -> List[ArrayChromosome]:
         """Create initial population of random timetables"""
         population = []
+        num_classes = self.encoding.num_classes
+        
+        # Warm start: the published timetable (reconciled with current data) and perturbations of it
+        warm = 0
+        if self.reference_rows:
+            warm = min(self.population_size, max(1, int(round(self.population_size * self.warm_start_ratio))))
+            base = ArrayChromosome.from_rows(reconcile_reference(self, self.reference_rows), num_classes)
+            population.append(base)
+            for _ in range(warm - 1):
+                perturbed = base.copy()
+                for _ in range(1 + int(self.rng.integers(max(1, len(base) // 20)))):
+                    self._random_move(perturbed)
+                population.append(perturbed)
         
-        for _ in range(self.population_size):
-            chromosome = TimetableChromosome()
+        seeded = min(self.population_size - warm, int(round(self.population_size * self.seeding_ratio)))
+        if seeded:
+            seeder = DSaturSeeder(self)
+            for _ in range(seeded):
+                population.append(ArrayChromosome.from_rows(seeder.build_rows(), num_classes))
+        
+        for _ in range(self.population_size - warm - seeded):
+            rows = []
             
             # Generate genes for each class
             for class_id, class_info in self.class_data.items():
-                self._generate_genes_for_class(chromosome, class_id, class_info)
+                self._generate_genes_for_class(rows, class_id, class_info)
             
-            population.append(chromosome)
+            population.append(ArrayChromosome.from_rows(rows, num_classes))
         
-        logger.info(f"Created initial population of {len(population)} chromosomes")
+        logger.info(f"Created initial population of {len(population)} chromosomes "
+                    f"({warm} warm-started, {seeded} DSatur-seeded)")
         return population
     
-    def _generate_genes_for_class(self, chromosome: TimetableChromosome, 
-                                 class_id: str, class_info: Dict):
-        """Generate genes for a specific class"""
+    def _generate_genes_for_class(self, rows: List[Tuple[int, ...]], 
+                                 class_id: str, class_info: Dict,
+                                 placed: Optional[Dict[str, int]] = None,
+                                 occupied: Optional[set] = None):
+        """
+        Generate encoded genes for a specific class. ``placed`` counts hours
+        (lab sessions) already scheduled per code and ``occupied`` holds their
+        (day index, slot) pairs; only the remainder is generated.
+        """
         working_days = self.days[:class_info['working_days']]
         slots_per_day = class_info['slots_per_day']
+        placed = placed or {}
         
         # Track allocated slots to avoid conflicts
-        allocated_slots = set()
+        allocator = SlotAllocator(len(working_days), slots_per_day, self.rng)
+        for day_index, slot in occupied or ():
+            allocator.allocate(day_index, slot)
         
         # Schedule core subjects
         for subject_info in class_info['subjects']:
             subject_code = subject_info['subject_code']
-            hours_needed = subject_info['hours_per_week']
+            hours_needed = subject_info['hours_per_week'] - placed.get(subject_code, 0)
             
             for _ in range(hours_needed):
                 # Find available slot
-                available_slots = []
-                for day in working_days:
-                    for slot in range(1, slots_per_day + 1):
-                        slot_key = (day, slot)
-                        if slot_key not in allocated_slots:
-                            available_slots.append(slot_key)
+                free_slot = allocator.random_free_slot()
                 
-                if available_slots:
-                    day, slot = random.choice(available_slots)
-                    allocated_slots.add((day, slot))
+                if free_slot:
+                    day_index, slot = free_slot
+                    allocator.allocate(day_index, slot)
+                    day = working_days[day_index]
                     
                     # Find suitable staff and room
                     staff_id = self._find_suitable_staff(subject_code, day, slot)
                     room_id = self._find_suitable_room(subject_code, day, slot, class_info)
                     
                     if staff_id and room_id:
-                        gene = TimetableGene(
-                            class_section_id=class_id,
-                            day=day,
-                            slot=slot,
-                            subject_code=subject_code,
-                            staff_id=staff_id,
-                            room_id=room_id,
-                            is_lab=self.subject_data[subject_code]['is_lab']
-                        )
-                        chromosome.add_gene(gene)
+                        kind = KIND_LAB if self.subject_data[subject_code]['is_lab'] else KIND_CORE
+                        rows.append(self._encode_row(class_id, day, slot, subject_code,
+                                                     staff_id, room_id, kind))
         
         # Schedule labs
         for lab_info in class_info['labs']:
             lab_code = lab_info['lab_code']
-            sessions_per_week = lab_info['sessions_per_week']
+            sessions_per_week = lab_info['sessions_per_week'] - placed.get(lab_code, 0)
             
             for _ in range(sessions_per_week):
-                # Labs need consecutive slots
-                consecutive_slots = self._find_consecutive_slots(
-                    allocated_slots, working_days, slots_per_day, 2
-                )
+                # Labs need consecutive slots; any free run is equally likely
+                consecutive_slots = allocator.random_free_run(2)
                 
                 if consecutive_slots:
-                    day, start_slot = consecutive_slots
-                    for i in range(2):  # 2-hour lab session
-                        allocated_slots.add((day, start_slot + i))
+                    day_index, start_slot = consecutive_slots
+                    allocator.allocate(day_index, start_slot, 2)  # 2-hour lab session
+                    day = working_days[day_index]
                     
                     staff_id = self._find_suitable_staff(lab_code, day, start_slot, is_lab=True)
                     room_id = self._find_suitable_lab_room(lab_code, day, start_slot)
                     
                     if staff_id and room_id:
                         for i in range(2):
-                            gene = TimetableGene(
-                                class_section_id=class_id,
-                                day=day,
-                                slot=start_slot + i,
-                                subject_code=lab_code,
-                                staff_id=staff_id,
-                                room_id=room_id,
-                                is_lab=True
-                            )
-                            chromosome.add_gene(gene)
+                            rows.append(self._encode_row(class_id, day, start_slot + i, lab_code,
+                                                         staff_id, room_id, KIND_LAB))
         
         # Schedule electives
         for elective_id in class_info['electives']:
             if elective_id in self.elective_data:
                 elective_info = self.elective_data[elective_id]
-                hours_needed = elective_info['hours_per_week']
+                hours_needed = elective_info['hours_per_week'] - placed.get(elective_id, 0)
                 
                 for _ in range(hours_needed):
-                    available_slots = []
-                    for day in working_days:
-                        for slot in range(1, slots_per_day + 1):
-                            slot_key = (day, slot)
-                            if slot_key not in allocated_slots:
-                                available_slots.append(slot_key)
+                    free_slot = allocator.random_free_slot()
                     
-                    if available_slots:
-                        day, slot = random.choice(available_slots)
-                        allocated_slots.add((day, slot))
+                    if free_slot:
+                        day_index, slot = free_slot
+                        allocator.allocate(day_index, slot)
+                        day = working_days[day_index]
                         
                         staff_id = elective_info['staff']
                         room_id = self._find_suitable_room(elective_id, day, slot, class_info)
                         
                         if room_id:
-                            gene = TimetableGene(
-                                class_section_id=class_id,
-                                day=day,
-                                slot=slot,
-                                subject_code=elective_id,
-                                staff_id=staff_id,
-                                room_id=room_id,
-                                is_elective=True
-                            )
-                            chromosome.add_gene(gene)
-    
-    def _find_consecutive_slots(self, allocated_slots: set, working_days: List[str], 
-                               slots_per_day: int, duration: int) -> Optional[Tuple[str, int]]:
-        """Find consecutive available slots for labs"""
-        for day in working_days:
-            for start_slot in range(1, slots_per_day - duration + 2):
-                consecutive_available = True
-                for i in range(duration):
-                    if (day, start_slot + i) in allocated_slots:
-                        consecutive_available = False
-                        break
-                
-                if consecutive_available:
-                    return (day, start_slot)
-        
-        return None
+                            rows.append(self._encode_row(class_id, day, slot, elective_id,
+                                                         staff_id, room_id, KIND_ELECTIVE))
     
     def _find_suitable_staff(self, subject_code: str, day: str, slot: int, 
                            is_lab: bool = False) -> Optional[str]:
         """Find suitable staff for a subject"""
-        suitable_staff = []
-        
-        for staff_id, staff_info in self.staff_data.items():
-            # Check if staff can handle this subject/lab
-            can_handle = False
-            if is_lab and subject_code in staff_info['labs']:
-                can_handle = True
-            elif not is_lab and subject_code in staff_info['subjects']:
-                can_handle = True
-            elif subject_code in staff_info['electives']:
-                can_handle = True
-            
-            if can_handle:
-                suitable_staff.append(staff_id)
-        
-        return random.choice(suitable_staff) if suitable_staff else None
+        suitable_staff = self._eligible_staff[is_lab].get(subject_code)
+        return suitable_staff[self.rng.integers(len(suitable_staff))] if suitable_staff else None
     
     def _find_suitable_room(self, subject_code: str, day: str, slot: int, 
                           class_info: Dict) -> Optional[str]:
         """Find suitable room for a subject"""
-        suitable_rooms = []
-        
-        for room_id, room_info in self.room_data.items():
-            # Check capacity
-            if room_info['capacity'] >= class_info['total_students']:
-                # Check if room type matches subject requirement
-                if subject_code in self.subject_data:
-                    subject_info = self.subject_data[subject_code]
-                    if subject_info['is_lab'] and room_info['type'] != 'lab':
-                        continue
-                    if not subject_info['is_lab'] and room_info['type'] not in ['classroom', 'seminar_hall']:
-                        continue
-                
-                suitable_rooms.append(room_id)
+        room_ids = self._suitable_rooms(subject_code, class_info)
+        return room_ids[self.rng.integers(len(room_ids))] if room_ids else None
+    
+    def _suitable_rooms(self, subject_code: str, class_info: Dict) -> Tuple[str, ...]:
+        """Rooms of the subject's type that can seat the class"""
+        # Room type follows the subject; codes without a Subject row accept any room
+        subject_info = self.subject_data.get(subject_code)
+        if subject_info is None:
+            room_type = 'any'
+        else:
+            room_type = 'lab' if subject_info['is_lab'] else 'lecture'
         
-        return random.choice(suitable_rooms) if suitable_rooms else None
+        capacities, room_ids = self._rooms_by_capacity[room_type]
+        return room_ids[bisect.bisect_left(capacities, class_info['total_students']):]
     
     def _find_suitable_lab_room(self, lab_code: str, day: str, slot: int) -> Optional[str]:
         """Find suitable lab room"""
-        lab_rooms = [room_id for room_id, room_info in self.room_data.items() 
-                    if room_info['type'] == 'lab']
-        return random.choice(lab_rooms) if lab_rooms else None
+        lab_rooms = self._lab_rooms
+        return lab_rooms[self.rng.integers(len(lab_rooms))] if lab_rooms else None
     
-    def calculate_fitness(self, chromosome: TimetableChromosome) -> float:
-        """Calculate fitness score for a chromosome"""
+    def calculate_fitness(self, chromosome: ArrayChromosome) -> float:
+        """Calculate fitness score for a chromosome (violation counts only; see describe_conflicts)"""
         fitness = 100.0  # Start with perfect score
-        conflicts = []
         penalties = {}
         
-        # Check for conflicts
-        conflicts.extend(self._check_staff_conflicts(chromosome))
-        conflicts.extend(self._check_room_conflicts(chromosome))
-        conflicts.extend(self._check_class_conflicts(chromosome))
-        conflicts.extend(self._check_lab_constraints(chromosome))
+        # Count conflicts
+        conflict_count = (self._check_staff_conflicts(chromosome)
+                          + self._check_room_conflicts(chromosome)
+                          + self._check_class_conflicts(chromosome)
+                          + self._check_lab_constraints(chromosome))
         
         # Apply penalties
         penalties['workload'] = self._check_staff_workload(chromosome)
         penalties['preferences'] = self._check_preferences(chromosome)
         penalties['distribution'] = self._check_subject_distribution(chromosome)
+        penalties['changes'] = self._check_minimal_change(chromosome)
         
         # Calculate final fitness
-        conflict_penalty = len(conflicts) * 10
-        workload_penalty = penalties['workload'] * 5
-        preference_penalty = penalties['preferences'] * 2
-        distribution_penalty = penalties['distribution'] * 3
+        conflict_penalty = conflict_count * CONFLICT_WEIGHT
+        workload_penalty = penalties['workload'] * WORKLOAD_WEIGHT
+        preference_penalty = penalties['preferences'] * PREFERENCE_WEIGHT
+        distribution_penalty = penalties['distribution'] * DISTRIBUTION_WEIGHT
+        change_penalty = penalties['changes'] * self.fitness_evaluator.change_weight
         
-        total_penalty = conflict_penalty + workload_penalty + preference_penalty + distribution_penalty
+        total_penalty = (conflict_penalty + workload_penalty + preference_penalty
+                         + distribution_penalty + change_penalty)
         fitness = max(0, fitness - total_penalty)
         
         chromosome.fitness_score = fitness
-        chromosome.conflicts = conflicts
+        chromosome.conflict_count = conflict_count
         chromosome.penalties = penalties
+        chromosome.fitness_valid = True
         
         return fitness
     
-    def _check_staff_conflicts(self, chromosome: TimetableChromosome) -> List[str]:
-        """Check for staff scheduling conflicts"""
-        conflicts = []
-        staff_schedule = {}
+    def evaluate_population(self, population: List[ArrayChromosome]):
+        """Score every chromosome whose fitness is stale in one vectorised pass"""
+        stale = [chromosome for chromosome in population if not chromosome.fitness_valid]
+        counts = self._evaluation_counts
+        # Elites and unmutated copies keep their score
+        counts['fitness_reused'] += len(population) - len(stale)
+        if not stale:
+            return
         
-        for gene in chromosome.genes:
-            staff_id = gene.staff_id
-            time_slot = (gene.day, gene.slot)
-            
-            if staff_id not in staff_schedule:
-                staff_schedule[staff_id] = set()
-            
-            if time_slot in staff_schedule[staff_id]:
-                conflicts.append(f"Staff {staff_id} double-booked on {gene.day} slot {gene.slot}")
-            else:
-                staff_schedule[staff_id].add(time_slot)
+        evaluator = self._parallel_evaluator or self.fitness_evaluator
+        if self.fitness_cache is None:
+            evaluator.evaluate(stale)
+            counts['evaluations'] += len(stale)
+            return
         
-        return conflicts
-    
-    def _check_room_conflicts(self, chromosome: TimetableChromosome) -> List[str]:
-        """Check for room scheduling conflicts"""
-        conflicts = []
-        room_schedule = {}
-        
-        for gene in chromosome.genes:
-            room_id = gene.room_id
-            time_slot = (gene.day, gene.slot)
-            
-            if room_id not in room_schedule:
-                room_schedule[room_id] = set()
-            
-            if time_slot in room_schedule[room_id]:
-                conflicts.append(f"Room {room_id} double-booked on {gene.day} slot {gene.slot}")
+        # Serve repeated chromosomes from the cache and score each new
+        # fingerprint once, even if it occurs several times in this batch
+        pending = {}
+        for chromosome in stale:
+            fingerprint = chromosome.fingerprint()
+            if fingerprint in pending:
+                pending[fingerprint].append(chromosome)
+                continue
+            cached = self.fitness_cache.get(fingerprint)
+            if cached is not None:
+                store_fitness(chromosome, *cached)
+                counts['cache_hits'] += 1
             else:
-                room_schedule[room_id].add(time_slot)
+                pending[fingerprint] = [chromosome]
+                counts['cache_misses'] += 1
         
-        return conflicts
+        if pending:
+            representatives = [group[0] for group in pending.values()]
+            evaluator.evaluate(representatives)
+            counts['evaluations'] += len(representatives)
+            for fingerprint, group in pending.items():
+                scored = group[0]
+                result = (scored.fitness_score, scored.conflict_count, scored.penalties['workload'],
+                          scored.penalties['distribution'], scored.penalties['changes'])
+                self.fitness_cache.put(fingerprint, result)
+                for duplicate in group[1:]:
+                    store_fitness(duplicate, *result)
     
-    def _check_class_conflicts(self, chromosome: TimetableChromosome) -> List[str]:
-        """Check for class scheduling conflicts"""
-        conflicts = []
-        class_schedule = {}
-        
-        for gene in chromosome.genes:
-            class_id = gene.class_section_id
-            time_slot = (gene.day, gene.slot)
-            
-            if class_id not in class_schedule:
-                class_schedule[class_id] = set()
-            
-            if time_slot in class_schedule[class_id]:
-                conflicts.append(f"Class {class_id} has multiple subjects on {gene.day} slot {gene.slot}")
-            else:
-                class_schedule[class_id].add(time_slot)
-        
-        return conflicts
+    def take_evaluation_counts(self) -> Dict[str, int]:
+        """Evaluation counters accumulated since the previous call"""
+        counts = dict(self._evaluation_counts)
+        for key in self._evaluation_counts:
+            self._evaluation_counts[key] = 0
+        self.evaluations_used += counts['evaluations']
+        return counts
+    
+    def _check_staff_conflicts(self, chromosome: ArrayChromosome) -> int:
+        """Count staff double-bookings"""
+        return self._count_double_bookings(chromosome, COL_STAFF)
+    
+    def _check_room_conflicts(self, chromosome: ArrayChromosome) -> int:
+        """Count room double-bookings"""
+        return self._count_double_bookings(chromosome, COL_ROOM)
+    
+    def _check_class_conflicts(self, chromosome: ArrayChromosome) -> int:
+        """Count classes with more than one lesson in a slot"""
+        return self._count_double_bookings(chromosome, COL_CLASS)
+    
+    def _check_lab_constraints(self, chromosome: ArrayChromosome) -> int:
+        """Count lab lessons held outside lab rooms"""
+        genes = chromosome.genes
+        return int(np.count_nonzero(
+            (genes[:, COL_KIND] == KIND_LAB) & ~self.fitness_evaluator.room_is_lab[genes[:, COL_ROOM]]
+        ))
+    
+    def _count_double_bookings(self, chromosome: ArrayChromosome, column: int) -> int:
+        """Genes whose (resource, day, slot) is already taken by an earlier gene"""
+        genes = chromosome.genes.astype(np.int64)
+        evaluator = self.fitness_evaluator
+        keys = (genes[:, column] * evaluator.num_days + genes[:, COL_DAY]) * evaluator.num_slots + genes[:, COL_SLOT]
+        return len(keys) - len(np.unique(keys))
     
-    def _check_lab_constraints(self, chromosome: TimetableChromosome) -> List[str]:
-        """Check lab-specific constraints"""
+    def describe_conflicts(self, chromosome: ArrayChromosome) -> List[str]:
+        """Human-readable hard-conflict messages (built on demand, e.g. for the final timetable)"""
         conflicts = []
+        enc = self.encoding
+        genes = chromosome.genes.tolist()
         
-        for gene in chromosome.genes:
-            if gene.is_lab:
-                # Check if lab is in appropriate room
-                room_info = self.room_data.get(gene.room_id, {})
-                if room_info.get('type') != 'lab':
-                    conflicts.append(f"Lab {gene.subject_code} scheduled in non-lab room {gene.room_id}")
+        checks = (
+            (COL_STAFF, lambda gene: f"Staff {enc.staff[gene[COL_STAFF]]} double-booked on "
+                                     f"{enc.days[gene[COL_DAY]]} slot {gene[COL_SLOT]}"),
+            (COL_ROOM, lambda gene: f"Room {enc.rooms[gene[COL_ROOM]]} double-booked on "
+                                    f"{enc.days[gene[COL_DAY]]} slot {gene[COL_SLOT]}"),
+            (COL_CLASS, lambda gene: f"Class {enc.classes[gene[COL_CLASS]]} has multiple subjects on "
+                                     f"{enc.days[gene[COL_DAY]]} slot {gene[COL_SLOT]}"),
+        )
+        for column, message in checks:
+            booked = set()
+            for gene in genes:
+                booking = (gene[column], gene[COL_DAY], gene[COL_SLOT])
+                if booking in booked:
+                    conflicts.append(message(gene))
+                else:
+                    booked.add(booking)
+        
+        room_is_lab = self.fitness_evaluator.room_is_lab
+        for gene in genes:
+            if gene[COL_KIND] == KIND_LAB and not room_is_lab[gene[COL_ROOM]]:
+                conflicts.append(f"Lab {enc.subjects[gene[COL_SUBJECT]]} scheduled in non-lab room "
+                                 f"{enc.rooms[gene[COL_ROOM]]}")
         
         return conflicts
     
-    def _check_staff_workload(self, chromosome: TimetableChromosome) -> int:
+    def _check_staff_workload(self, chromosome: ArrayChromosome) -> int:
         """Check staff workload violations"""
         violations = 0
         staff_workload = {}
         
-        for gene in chromosome.genes:
-            staff_id = gene.staff_id
-            day = gene.day
-            
-            if staff_id not in staff_workload:
-                staff_workload[staff_id] = {'total': 0, 'daily': {}}
+        for _, day, _, _, staff, _, _ in chromosome.genes.tolist():
+            if staff not in staff_workload:
+                staff_workload[staff] = {'total': 0, 'daily': {}}
             
-            if day not in staff_workload[staff_id]['daily']:
-                staff_workload[staff_id]['daily'][day] = 0
+            if day not in staff_workload[staff]['daily']:
+                staff_workload[staff]['daily'][day] = 0
             
-            staff_workload[staff_id]['total'] += 1
-            staff_workload[staff_id]['daily'][day] += 1
+            staff_workload[staff]['total'] += 1
+            staff_workload[staff]['daily'][day] += 1
         
-        for staff_id, workload in staff_workload.items():
-            staff_info = self.staff_data.get(staff_id, {})
+        for staff, workload in staff_workload.items():
+            staff_info = self.staff_data.get(self.encoding.staff[staff], {})
             max_daily = staff_info.get('max_sessions_per_day', 8)
             max_weekly = staff_info.get('max_sessions_per_week', 30)
             
@@ -487,102 +826,128 @@ class GeneticAlgorithmScheduler:
         
         return violations
     
-    def _check_preferences(self, chromosome: TimetableChromosome) -> int:
+    def _check_preferences(self, chromosome: ArrayChromosome) -> int:
         """Check preference violations (can be extended)"""
         # Placeholder for preference checking
         return 0
     
-    def _check_subject_distribution(self, chromosome: TimetableChromosome) -> int:
+    def _check_subject_distribution(self, chromosome: ArrayChromosome) -> int:
         """Check subject distribution quality"""
         violations = 0
         
         # Check for consecutive subject sessions (should be avoided)
-        for class_id in self.class_data.keys():
-            class_genes = chromosome.get_genes_for_class(class_id)
+        for class_code in range(chromosome.num_classes):
+            day_genes = {}
+            for _, day, slot, subject, _, _, _ in chromosome.class_block(class_code).tolist():
+                day_genes.setdefault(day, []).append((slot, subject))
             
-            for day in self.days:
-                day_genes = [g for g in class_genes if g.day == day]
-                day_genes.sort(key=lambda x: x.slot)
+            for genes in day_genes.values():
+                genes.sort(key=lambda x: x[0])
                 
-                for i in range(len(day_genes) - 1):
-                    if (day_genes[i].subject_code == day_genes[i + 1].subject_code and
-                        day_genes[i + 1].slot == day_genes[i].slot + 1):
+                for i in range(len(genes) - 1):
+                    if (genes[i][1] == genes[i + 1][1] and
+                        genes[i + 1][0] == genes[i][0] + 1):
                         violations += 1
         
         return violations
     
-    def tournament_selection(self, population: List[TimetableChromosome]) -> TimetableChromosome:
+    def _check_minimal_change(self, chromosome: ArrayChromosome) -> int:
+        """Count lessons that differ from the published (warm-start) timetable"""
+        return int(self.fitness_evaluator.changed_lessons(chromosome.genes).sum())
+    
+    def tournament_selection(self, population: List[ArrayChromosome]) -> ArrayChromosome:
         """Tournament selection for parent selection"""
-        tournament = random.sample(population, min(self.tournament_size, len(population)))
-        return max(tournament, key=lambda x: x.fitness_score)
+        picks = self.rng.choice(len(population), min(self.tournament_size, len(population)), replace=False)
+        return max((population[i] for i in picks.tolist()), key=lambda x: x.fitness_score)
     
-    def crossover(self, parent1: TimetableChromosome, 
-                 parent2: TimetableChromosome) -> Tuple[TimetableChromosome, TimetableChromosome]:
+    def crossover(self, parent1: ArrayChromosome, 
+                 parent2: ArrayChromosome) -> Tuple[ArrayChromosome, ArrayChromosome]:
         """Order crossover for chromosomes"""
-        if random.random() > self.crossover_rate:
-            return copy.deepcopy(parent1), copy.deepcopy(parent2)
+        if self.rng.random() > self.crossover_rate:
+            return self._copy(parent1), self._copy(parent2)
         
-        # Simple crossover: exchange genes for random classes
-        child1 = copy.deepcopy(parent1)
-        child2 = copy.deepcopy(parent2)
+        # Simple crossover: exchange gene blocks for random classes
+        num_classes = self.encoding.num_classes
+        exchange_classes = self.rng.choice(num_classes, num_classes // 2, replace=False).tolist()
         
-        # Select random classes to exchange
-        all_classes = list(self.class_data.keys())
-        exchange_classes = random.sample(all_classes, len(all_classes) // 2)
+        child1_blocks = list(parent1.blocks)
+        child2_blocks = list(parent2.blocks)
+        # Block hashes travel with their blocks so fingerprints stay incremental
+        child1_hashes = list(parent1.block_hashes)
+        child2_hashes = list(parent2.block_hashes)
+        for class_code in exchange_classes:
+            child1_blocks[class_code], child2_blocks[class_code] = child2_blocks[class_code], child1_blocks[class_code]
+            child1_hashes[class_code], child2_hashes[class_code] = child2_hashes[class_code], child1_hashes[class_code]
+        # The children now share the parents' blocks, so the parents may not write to them in place
+        parent1._owned_blocks.clear()
+        parent2._owned_blocks.clear()
+
+        return (ArrayChromosome.from_blocks(child1_blocks, child1_hashes),
+                ArrayChromosome.from_blocks(child2_blocks, child2_hashes))
+    
+    def mutate(self, chromosome: ArrayChromosome) -> ArrayChromosome:
+        """Mutation operator"""
+        if self.rng.random() > self.mutation_rate:
+            return chromosome
         
-        # Exchange genes for selected classes
-        child1_genes = [g for g in parent1.genes if g.class_section_id not in exchange_classes]
-        child1_genes.extend([g for g in parent2.genes if g.class_section_id in exchange_classes])
+        mutated = self._copy(chromosome)
+        self._random_move(mutated)
+        return mutated
+    
+    def _copy(self, item):
+        """Copy of a chromosome, charged to the 'copy' phase when profiling"""
+        if not self.phase_timer.enabled:
+            return item.copy()
+        with self.phase_timer.measure('copy'):
+            return item.copy()
+    
+    def _random_move(self, chromosome: ArrayChromosome):
+        """Change the staff, room or time of one random gene in place"""
+        if not len(chromosome):
+            return
         
-        child2_genes = [g for g in parent2.genes if g.class_section_id not in exchange_classes]
-        child2_genes.extend([g for g in parent1.genes if g.class_section_id in exchange_classes])
+        # Random mutation strategies
+        mutation_type = ('change_staff', 'change_room', 'change_time')[self.rng.integers(3)]
+        gene_index = int(self.rng.integers(len(chromosome)))
+        gene = chromosome.gene(gene_index)
         
-        child1.genes = child1_genes
-        child2.genes = child2_genes
+        enc = self.encoding
+        subject_code = enc.subjects[gene[COL_SUBJECT]]
+        day = enc.days[gene[COL_DAY]]
+        slot = int(gene[COL_SLOT])
+        class_info = self.class_data[enc.classes[gene[COL_CLASS]]]
+        new_day, new_slot = int(gene[COL_DAY]), slot
+        new_staff, new_room = int(gene[COL_STAFF]), int(gene[COL_ROOM])
         
-        return child1, child2
-    
-    def mutate(self, chromosome: TimetableChromosome) -> TimetableChromosome:
-        """Mutation operator"""
-        if random.random() > self.mutation_rate:
-            return chromosome
+        if mutation_type == 'change_staff':
+            staff_id = self._find_suitable_staff(subject_code, day, slot, gene[COL_KIND] == KIND_LAB)
+            if staff_id:
+                new_staff = enc.staff.codes[staff_id]
         
-        mutated = copy.deepcopy(chromosome)
+        elif mutation_type == 'change_room':
+            room_id = self._find_suitable_room(subject_code, day, slot, class_info)
+            if room_id:
+                new_room = enc.rooms.codes[room_id]
         
-        if mutated.genes:
-            # Random mutation strategies
-            mutation_type = random.choice(['change_staff', 'change_room', 'change_time'])
-            gene_index = random.randint(0, len(mutated.genes) - 1)
-            gene = mutated.genes[gene_index]
-            
-            if mutation_type == 'change_staff':
-                new_staff = self._find_suitable_staff(gene.subject_code, gene.day, gene.slot, gene.is_lab)
-                if new_staff:
-                    gene.staff_id = new_staff
-            
-            elif mutation_type == 'change_room':
-                class_info = self.class_data[gene.class_section_id]
-                new_room = self._find_suitable_room(gene.subject_code, gene.day, gene.slot, class_info)
-                if new_room:
-                    gene.room_id = new_room
-            
-            elif mutation_type == 'change_time':
-                # Try to find a new time slot
-                class_info = self.class_data[gene.class_section_id]
-                working_days = self.days[:class_info['working_days']]
-                new_day = random.choice(working_days)
-                new_slot = random.randint(1, class_info['slots_per_day'])
-                
-                gene.day = new_day
-                gene.slot = new_slot
+        elif mutation_type == 'change_time':
+            # Try to find a new time slot
+            working_days = self.days[:class_info['working_days']]
+            new_day = int(self.rng.integers(len(working_days)))
+            new_slot = int(self.rng.integers(1, class_info['slots_per_day'] + 1))
         
-        return mutated
+        chromosome.update_gene(gene_index, new_day, new_slot, new_staff, new_room)
+        # Rescored with the rest of the batch: a parent's occupancy counters
+        # cost about as much to build as the vectorised score of the child
+        chromosome.fitness_valid = False
+        chromosome.fitness_state = None
     
-    def evolve_population(self, population: List[TimetableChromosome]) -> List[TimetableChromosome]:
+    def evolve_population(self, population: List[ArrayChromosome]) -> List[ArrayChromosome]:
         """Evolve population for one generation"""
+        timer = self.phase_timer
+        
         # Calculate fitness for all chromosomes
-        for chromosome in population:
-            self.calculate_fitness(chromosome)
+        with timer.measure('evaluation'):
+            self.evaluate_population(population)
         
         # Sort by fitness (descending)
         population.sort(key=lambda x: x.fitness_score, reverse=True)
@@ -591,79 +956,297 @@ class GeneticAlgorithmScheduler:
         elite_count = int(self.population_size * self.elite_ratio)
         next_population = population[:elite_count]
         
-        # Generate offspring
-        while len(next_population) < self.population_size:
-            parent1 = self.tournament_selection(population)
-            parent2 = self.tournament_selection(population)
-            
-            child1, child2 = self.crossover(parent1, parent2)
-            child1 = self.mutate(child1)
-            child2 = self.mutate(child2)
-            
-            next_population.extend([child1, child2])
+        # Memetic step: elites with hard conflicts get a local repair
+        if self._conflict_repair is not None:
+            with timer.measure('repair'):
+                for elite in next_population:
+                    if elite.conflict_count:
+                        self._evaluation_counts['repair_moves'] += self._conflict_repair.repair(elite)
+        
+        # Generate offspring, one operator at a time so each phase is timed once
+        pairs = (self.population_size - len(next_population) + 1) // 2
+        with timer.measure('selection'):
+            parents = [(self.tournament_selection(population), self.tournament_selection(population))
+                       for _ in range(pairs)]
+        with timer.measure('crossover'):
+            offspring = [child for parent1, parent2 in parents for child in self.crossover(parent1, parent2)]
+        with timer.measure('mutation'):
+            next_population.extend(self.mutate(child) for child in offspring)
         
         # Trim to exact population size
         return next_population[:self.population_size]
     
-    def generate_timetable(self) -> Tuple[TimetableChromosome, Dict]:
-        """Main method to generate timetable using GA"""
+    def best_of(self, population: List[ArrayChromosome]) -> Optional[ArrayChromosome]:
+        """Fittest chromosome whose fitness score is up to date"""
+        scored = [chromosome for chromosome in population if chromosome.fitness_valid]
+        return max(scored, key=lambda x: x.fitness_score) if scored else None
+    
+    def is_solved(self, chromosome: Optional[ArrayChromosome]) -> bool:
+        """Early termination criterion: near-perfect fitness without conflicts"""
+        return (chromosome is not None and chromosome.fitness_score >= 95.0
+                and chromosome.conflict_count == 0)
+    
+    def elapsed_seconds(self) -> float:
+        """Wall-clock time since the current run started"""
+        return monotonic() - self._started_at if self._started_at is not None else 0.0
+    
+    def best_so_far(self) -> Tuple[Optional[ArrayChromosome], Dict]:
+        """Best chromosome found so far and a progress summary; callable at any moment"""
+        best = self._best_chromosome
+        return (best.copy() if best is not None else None), {
+            'best_fitness': best.fitness_score if best is not None else None,
+            'conflicts_count': best.conflict_count if best is not None else None,
+            'generations': len(self.generation_stats),
+            'evaluations': self.evaluations_used,
+            'elapsed_seconds': self.elapsed_seconds(),
+        }
+    
+    def track_best(self, generation: int, candidate: Optional[ArrayChromosome]) -> bool:
+        """Keep a copy of candidate if it beats the best so far; returns True on improvement"""
+        best = self._best_chromosome
+        if candidate is None or (best is not None and candidate.fitness_score <= best.fitness_score):
+            return False
+        self._best_chromosome = candidate.copy()
+        self.last_improvement = generation
+        return True
+    
+    def report_progress(self, entry: Dict, fraction: Optional[float] = None):
+        """Pass a generation's statistics and the completed fraction of the run to progress_callback"""
+        if self.progress_callback is None:
+            return
+        if fraction is None:
+            fraction = (entry['generation'] + 1) / self.generations
+            # A time budget may end the run well before the last generation
+            if self.max_seconds:
+                fraction = max(fraction, entry.get('elapsed_seconds', 0.0) / self.max_seconds)
+        self.progress_callback(min(fraction, 1.0), entry)
+    
+    def cancel_requested(self) -> bool:
+        """True once cancel_check asks the run to stop"""
+        return self.cancel_check is not None and self.cancel_check()
+    
+    def budget_exhausted(self) -> Optional[str]:
+        """Name of the budget that ran out, or None"""
+        if self.max_seconds is not None and self.elapsed_seconds() >= self.max_seconds:
+            return 'time_budget'
+        if self.max_evaluations is not None and self.evaluations_used >= self.max_evaluations:
+            return 'evaluation_budget'
+        return None
+    
+    def is_stagnating(self, generation: int) -> bool:
+        """True once the best fitness has not improved for stagnation_generations"""
+        return (self.stagnation_generations is not None
+                and generation - self.last_improvement >= self.stagnation_generations)
+    
+    def restart_population(self, population: List[ArrayChromosome]) -> List[ArrayChromosome]:
+        """Fresh initial population that keeps the current elites"""
+        self.evaluate_population(population)
+        population.sort(key=lambda x: x.fitness_score, reverse=True)
+        keep = max(1, int(self.population_size * self.elite_ratio))
+        with self.phase_timer.measure_run('initial_population'):
+            fresh = self.create_initial_population()
+        return population[:keep] + fresh[:self.population_size - keep]
+    
+    def note_restart(self, generation: int):
+        """Count a restart and give the new population a full stagnation window"""
+        self.restarts += 1
+        self.last_improvement = generation
+    
+    def record_generation(self, generation: int, best_chromosome: ArrayChromosome,
+                          avg_fitness: float):
+        """Append one generation to the run statistics"""
+        best_fitness = best_chromosome.fitness_score if best_chromosome else -1
+        self.generation_stats.append({
+            'generation': generation,
+            'best_fitness': best_fitness,
+            'average_fitness': avg_fitness,
+            'conflicts': best_chromosome.conflict_count if best_chromosome else 0,
+            'elapsed_seconds': self.elapsed_seconds(),
+            **self.take_evaluation_counts(),
+        })
+        if self.phase_timer.enabled:
+            self.generation_stats[-1]['phase_seconds'] = {
+                phase: round(seconds, 6) for phase, seconds in self.phase_timer.take_generation().items()
+            }
+        
+        self.best_fitness_history.append(best_fitness)
+        self.report_progress(self.generation_stats[-1])
+        
+        if generation % 50 == 0:
+            logger.info(f"Generation {generation}: Best={best_fitness:.2f}, "
+                      f"Avg={avg_fitness:.2f}, Conflicts={self.generation_stats[-1]['conflicts']}")
+    
+    def generate_timetable(self, resume_from: Optional[str] = None,
+                           problem: Optional[Dict] = None) -> Tuple[ArrayChromosome, Dict]:
+        """
+        Main method to generate timetable using GA, optionally resuming from a
+        checkpoint. A problem_data() dictionary may be passed instead of
+        loading from the database.
+        """
         logger.info("Starting timetable generation using Genetic Algorithm")
         
         try:
+            # The same seed always replays the same run
+            self.reset_rng()
+            self.phase_timer = PhaseTimer() if self.profile_phases else NULL_PHASE_TIMER
+            self._started_at = monotonic()
+            self.evaluations_used = 0
+            self.restarts = 0
+            self.stop_reason = None
+            self._best_chromosome = None
+            self.last_improvement = 0
+            self.checkpointed_stats = (0, 0)
+            
             # Load data
-            self.load_data()
+            with self.phase_timer.measure_run('load_data'):
+                if problem is not None:
+                    self.load_problem(problem)
+                else:
+                    self.load_data()
             
-            # Create initial population
-            population = self.create_initial_population()
+            department_results = None
+            if self.decompose_by_department:
+                if resume_from or self.checkpoint_path or self.islands > 1:
+                    raise ValueError("Department decomposition cannot be combined with "
+                                     "checkpoints or islands")
+                from .department_solver import DepartmentDecomposedSolver
+                solver = DepartmentDecomposedSolver(self)
+                best_chromosome = solver.run()
+                department_results = solver.department_results
+            elif self.islands > 1:
+                if resume_from or self.checkpoint_path:
+                    raise ValueError("Checkpoints are only supported for single-population runs")
+                from .island_model import IslandCoordinator
+                best_chromosome = IslandCoordinator(self).run()
+            else:
+                best_chromosome = self._evolve_single_population(resume_from)
             
-            # Evolution loop
-            best_chromosome = None
-            best_fitness = -1
+            if self.stop_reason == 'cancelled':
+                logger.info("Timetable generation cancelled")
+                return None, {
+                    'stop_reason': self.stop_reason,
+                    'total_generations': len(self.generation_stats),
+                    'generation_stats': self.generation_stats,
+                    'elapsed_seconds': self.elapsed_seconds(),
+                    'evaluations': self.evaluations_used,
+                }
+            
+            # Final polish of the winner with a longer local search
+            if self._conflict_repair is not None and best_chromosome.conflict_count:
+                self._conflict_repair.repair(best_chromosome, max_passes=self.local_search_passes * 4)
+            
+            best_fitness = best_chromosome.fitness_score
+            
+            # Evaluation only counts conflicts; the winner's are described once, here
+            self.calculate_fitness(best_chromosome)
+            conflicts = self.describe_conflicts(best_chromosome)
             
-            for generation in range(self.generations):
+            # Prepare result
+            result_stats = {
+                'best_fitness': best_fitness,
+                'total_generations': len(self.generation_stats),
+                'conflicts_count': best_chromosome.conflict_count,
+                'conflicts': conflicts,
+                'penalties': best_chromosome.penalties,
+                'generation_stats': self.generation_stats,
+                'fitness_history': self.best_fitness_history,
+                'stop_reason': self.stop_reason,
+                'elapsed_seconds': self.elapsed_seconds(),
+                'evaluations': self.evaluations_used,
+                'restarts': self.restarts,
+            }
+            if department_results is not None:
+                result_stats['departments'] = department_results
+            if self.profile_phases:
+                result_stats['phase_timing'] = summarize_phases(self.generation_stats,
+                                                                self.phase_timer.run_phases)
+            
+            logger.info(f"Timetable generation completed. Best fitness: {best_fitness:.2f} "
+                        f"(stopped: {self.stop_reason})")
+            return best_chromosome, result_stats
+            
+        except Exception as e:
+            logger.error(f"Error in timetable generation: {e}")
+            raise
+    
+    def _evolve_single_population(self, resume_from: Optional[str] = None) -> ArrayChromosome:
+        """Evolution loop for one population; returns the best chromosome found"""
+        if self.workers > 1:
+            self._parallel_evaluator = ParallelFitnessEvaluator(self.fitness_evaluator, self.workers)
+        
+        try:
+            if resume_from:
+                population, first_generation = self._resume(resume_from)
+            else:
+                # Create initial population
+                with self.phase_timer.measure_run('initial_population'):
+                    population = self.create_initial_population()
+                first_generation = 0
+            self.stop_reason = 'generations'
+            
+            # Evolution loop
+            for generation in range(first_generation, self.generations):
                 # Evolve population
                 population = self.evolve_population(population)
                 
                 # Track best chromosome
-                current_best = max(population, key=lambda x: x.fitness_score)
-                if current_best.fitness_score > best_fitness:
-                    best_fitness = current_best.fitness_score
-                    best_chromosome = copy.deepcopy(current_best)
+                self.track_best(generation, self.best_of(population))
+                best_chromosome = self._best_chromosome
                 
                 # Log progress
-                avg_fitness = sum(c.fitness_score for c in population) / len(population)
-                self.generation_stats.append({
-                    'generation': generation,
-                    'best_fitness': best_fitness,
-                    'average_fitness': avg_fitness,
-                    'conflicts': len(best_chromosome.conflicts) if best_chromosome else 0
-                })
+                scores = [c.fitness_score for c in population if c.fitness_valid]
+                avg_fitness = sum(scores) / len(scores) if scores else 0.0
+                self.record_generation(generation, best_chromosome, avg_fitness)
                 
-                self.best_fitness_history.append(best_fitness)
+                if self.checkpoint_path and (generation + 1) % self.checkpoint_interval == 0:
+                    save_checkpoint(self.checkpoint_path, self, population, generation)
                 
-                if generation % 50 == 0:
-                    logger.info(f"Generation {generation}: Best={best_fitness:.2f}, "
-                              f"Avg={avg_fitness:.2f}, Conflicts={len(best_chromosome.conflicts)}")
+                if self.cancel_requested():
+                    logger.info(f"Cancelled at generation {generation}")
+                    self.stop_reason = 'cancelled'
+                    break
                 
                 # Early termination if perfect solution found
-                if best_fitness >= 95.0 and len(best_chromosome.conflicts) == 0:
+                if self.is_solved(best_chromosome):
                     logger.info(f"Perfect solution found at generation {generation}")
+                    self.stop_reason = 'solved'
                     break
+                
+                exhausted = self.budget_exhausted()
+                if exhausted:
+                    logger.info(f"Stopping at generation {generation}: {exhausted} exhausted")
+                    self.stop_reason = exhausted
+                    break
+                
+                if self.is_stagnating(generation):
+                    if self.stagnation_action == 'stop':
+                        logger.info(f"Stopping at generation {generation}: no improvement for "
+                                    f"{self.stagnation_generations} generations")
+                        self.stop_reason = 'stagnation'
+                        break
+                    logger.info(f"Restarting population at generation {generation}")
+                    population = self.restart_population(population)
+                    self.note_restart(generation)
             
-            # Prepare result
-            result_stats = {
-                'best_fitness': best_fitness,
-                'total_generations': len(self.generation_stats),
-                'conflicts_count': len(best_chromosome.conflicts),
-                'conflicts': best_chromosome.conflicts,
-                'penalties': best_chromosome.penalties,
-                'generation_stats': self.generation_stats,
-                'fitness_history': self.best_fitness_history
-            }
-            
-            logger.info(f"Timetable generation completed. Best fitness: {best_fitness:.2f}")
-            return best_chromosome, result_stats
+            if self.checkpoint_path and self.generation_stats:
+                save_checkpoint(self.checkpoint_path, self, population,
+                                self.generation_stats[-1]['generation'])
             
-        except Exception as e:
-            logger.error(f"Error in timetable generation: {e}")
-            raise
\ No newline at end of file
+            return self._best_chromosome
+        
+        finally:
+            if self._parallel_evaluator is not None:
+                self._parallel_evaluator.close()
+                self._parallel_evaluator = None
+    
+    def _resume(self, path: str) -> Tuple[List[ArrayChromosome], int]:
+        """Restore a checkpointed run; returns the population and the next generation"""
+        checkpoint = load_checkpoint(path, self)
+        best = checkpoint['best']
+        if best is not None:
+            self.fitness_evaluator.evaluate([best])
+            self._best_chromosome = best
+        self.last_improvement = checkpoint['last_improvement']
+        
+        logger.info(f"Resuming from {path} after generation {checkpoint['generation']}")
+        return checkpoint['population'], checkpoint['generation'] + 1
@@ -0,0 +1,242 @@
+"""
+Island-Model Genetic Algorithm with Periodic Migration
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import multiprocessing
+import queue
+import numpy as np
+from typing import Dict, List, Optional
+import logging
+
+from .chromosome import ArrayChromosome
+from .phase_timing import merge_phases
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_TOPOLOGIES = ('ring', 'random')
+
+
+def _island_main(island_id: int, problem: Dict, settings: Dict, seed: np.random.SeedSequence,
+                 inbox: multiprocessing.Queue, outbox: multiprocessing.Queue):
+    """Entry point of an island process: evolve on request, report the elite"""
+    from .genetic_algorithm import GeneticAlgorithmScheduler
+
+    try:
+        # Every island draws from its own child stream of the parent's seed
+        scheduler = GeneticAlgorithmScheduler(**settings, seed=seed)
+        scheduler.load_problem(problem)
+        population = scheduler.create_initial_population()
+
+        while True:
+            command, generations, migrants = inbox.get()
+            if command == 'stop':
+                break
+            if command == 'restart':
+                population = scheduler.restart_population(population)
+
+            # Immigrants replace the weakest residents
+            if migrants:
+                scheduler.evaluate_population(population)
+                population.sort(key=lambda x: x.fitness_score, reverse=True)
+                population[-len(migrants):] = migrants
+
+            history = []
+            for _ in range(generations):
+                population = scheduler.evolve_population(population)
+                best = scheduler.best_of(population)
+                scores = [c.fitness_score for c in population if c.fitness_valid]
+                history.append({
+                    'best_fitness': best.fitness_score if best else -1,
+                    'average_fitness': sum(scores) / len(scores) if scores else 0.0,
+                    'conflicts': best.conflict_count if best else 0,
+                    **scheduler.take_evaluation_counts(),
+                })
+                if scheduler.phase_timer.enabled:
+                    history[-1]['phase_seconds'] = scheduler.phase_timer.take_generation()
+
+            scheduler.evaluate_population(population)
+            population.sort(key=lambda x: x.fitness_score, reverse=True)
+            outbox.put((island_id, history, population[:scheduler.migration_size], None))
+
+    except Exception as e:
+        logger.error(f"Island {island_id} failed: {e}")
+        outbox.put((island_id, None, None, str(e)))
+
+
+class IslandCoordinator:
+    """
+    Runs the scheduler's population as N islands, one process each.
+
+    Islands evolve independently for ``migration_interval`` generations, then
+    send their top ``migration_size`` chromosomes to the coordinator, which
+    tracks the global best, checks the stopping criteria and forwards the
+    migrants along a ring (or to random islands) for the next epoch.
+    """
+
+    def __init__(self, scheduler):
+        if scheduler.migration_topology not in MIGRATION_TOPOLOGIES:
+            raise ValueError(f"Unknown migration topology: {scheduler.migration_topology}")
+
+        self.scheduler = scheduler
+        self.islands = scheduler.islands
+        self.migration_interval = max(1, scheduler.migration_interval)
+        self.migration_size = max(1, scheduler.migration_size)
+        self.topology = scheduler.migration_topology
+
+    def _island_settings(self) -> Dict:
+        # Budgets and stagnation are enforced by the coordinator, not the islands
+        settings = self.scheduler.worker_settings()
+        settings['migration_size'] = self.migration_size
+        return settings
+
+    def run(self) -> ArrayChromosome:
+        """Evolve all islands and return the best chromosome found by any of them"""
+        scheduler = self.scheduler
+        problem = scheduler.problem_data()
+        settings = self._island_settings()
+        seeds = scheduler.spawn_seeds(self.islands)
+
+        outbox = multiprocessing.Queue()
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        processes = [
+            multiprocessing.Process(
+                target=_island_main,
+                args=(island_id, problem, settings, seeds[island_id], inboxes[island_id], outbox),
+                daemon=True,
+            )
+            for island_id in range(self.islands)
+        ]
+        for process in processes:
+            process.start()
+        logger.info(f"Started {self.islands} islands ({self.topology} migration "
+                    f"every {self.migration_interval} generations)")
+
+        migrants = [[] for _ in range(self.islands)]
+        command = 'evolve'
+        generation = 0
+        scheduler.stop_reason = 'generations'
+
+        try:
+            while generation < scheduler.generations:
+                epoch = min(self.migration_interval, scheduler.generations - generation)
+                for island_id, inbox in enumerate(inboxes):
+                    inbox.put((command, epoch, migrants[island_id]))
+                command = 'evolve'
+
+                reports = self._collect(outbox, processes)
+
+                # Coordinator bookkeeping: global best and merged statistics
+                solved_at = self._record_epoch(generation, epoch, reports)
+                generation += epoch
+                for island_id, _, elite in reports:
+                    if elite:
+                        scheduler.track_best(generation - 1, elite[0])
+
+                if scheduler.cancel_requested():
+                    logger.info(f"Islands cancelled at generation {generation - 1}")
+                    scheduler.stop_reason = 'cancelled'
+                    break
+
+                if solved_at is not None or scheduler.is_solved(scheduler.best_so_far()[0]):
+                    logger.info(f"Perfect solution found by the islands at generation "
+                                f"{solved_at if solved_at is not None else generation - 1}")
+                    scheduler.stop_reason = 'solved'
+                    break
+
+                # Budgets are checked between epochs
+                exhausted = scheduler.budget_exhausted()
+                if exhausted:
+                    logger.info(f"Stopping islands at generation {generation - 1}: {exhausted} exhausted")
+                    scheduler.stop_reason = exhausted
+                    break
+
+                if scheduler.is_stagnating(generation - 1):
+                    if scheduler.stagnation_action == 'stop':
+                        logger.info(f"Stopping islands at generation {generation - 1}: no improvement")
+                        scheduler.stop_reason = 'stagnation'
+                        break
+                    logger.info(f"Restarting island populations at generation {generation - 1}")
+                    command = 'restart'
+                    scheduler.note_restart(generation - 1)
+
+                migrants = self._migrate([elite for _, _, elite in reports])
+
+        finally:
+            for inbox in inboxes:
+                inbox.put(('stop', 0, None))
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        return scheduler.best_so_far()[0]
+
+    def _collect(self, outbox: multiprocessing.Queue, processes: List[multiprocessing.Process]):
+        """Wait for one report per island, failing fast if an island dies"""
+        reports = []
+        while len(reports) < len(processes):
+            try:
+                island_id, history, elite, error = outbox.get(timeout=1)
+            except queue.Empty:
+                if not all(process.is_alive() for process in processes):
+                    raise RuntimeError("An island process exited unexpectedly")
+                continue
+            if error is not None:
+                raise RuntimeError(f"Island {island_id} failed: {error}")
+            reports.append((island_id, history, elite))
+        reports.sort(key=lambda report: report[0])
+        return reports
+
+    def _record_epoch(self, first_generation: int, epoch: int, reports) -> Optional[int]:
+        """Merge per-island histories into the scheduler's generation statistics"""
+        scheduler = self.scheduler
+        best_so_far = scheduler.best_fitness_history[-1] if scheduler.best_fitness_history else -1
+        conflicts = scheduler.generation_stats[-1]['conflicts'] if scheduler.generation_stats else 0
+
+        for offset in range(epoch):
+            entries = [history[offset] for _, history, _ in reports]
+            leader = max(entries, key=lambda entry: entry['best_fitness'])
+            if leader['best_fitness'] > best_so_far:
+                best_so_far = leader['best_fitness']
+                conflicts = leader['conflicts']
+
+            generation = first_generation + offset
+            stats = {
+                'generation': generation,
+                'best_fitness': best_so_far,
+                'average_fitness': sum(entry['average_fitness'] for entry in entries) / len(entries),
+                'conflicts': conflicts,
+                # Islands report per epoch, so every generation of it gets the epoch's time
+                'elapsed_seconds': scheduler.elapsed_seconds(),
+            }
+            # Evaluation counters are summed over the islands
+            for key in scheduler.take_evaluation_counts():
+                stats[key] = sum(entry.get(key, 0) for entry in entries)
+            scheduler.evaluations_used += stats['evaluations']
+            if scheduler.profile_phases:
+                stats['phase_seconds'] = merge_phases(entries)
+            scheduler.generation_stats.append(stats)
+            scheduler.best_fitness_history.append(best_so_far)
+            scheduler.report_progress(stats)
+
+            if generation % 50 == 0:
+                logger.info(f"Generation {generation}: Best={best_so_far:.2f}, "
+                            f"Avg={scheduler.generation_stats[-1]['average_fitness']:.2f}, "
+                            f"Conflicts={conflicts}")
+
+            if best_so_far >= 95.0 and conflicts == 0:
+                return generation
+        return None
+
+    def _migrate(self, elites: List[List[ArrayChromosome]]) -> List[List[ArrayChromosome]]:
+        """Route each island's elite to its destination island"""
+        count = len(elites)
+        if self.topology == 'ring':
+            sources = [(island_id - 1) % count for island_id in range(count)]
+        else:
+            # Offset 1..count-1 never routes an island's elite back to itself
+            rng = self.scheduler.rng
+            sources = [(island_id + 1 + int(rng.integers(count - 1))) % count
+                       for island_id in range(count)]
+        return [list(elites[source][:self.migration_size]) for source in sources]
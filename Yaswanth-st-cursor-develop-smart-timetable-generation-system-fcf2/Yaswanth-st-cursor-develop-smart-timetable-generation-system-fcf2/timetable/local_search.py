@@ -0,0 +1,163 @@
+"""
+Memetic Local Search: Steepest-Descent Repair of Hard Conflicts
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import numpy as np
+from typing import List, Optional, Tuple
+
+from .chromosome import (
+    ArrayChromosome,
+    COL_CLASS, COL_DAY, COL_SLOT, COL_STAFF, COL_ROOM, COL_KIND,
+    KIND_LAB, KIND_ELECTIVE,
+)
+
+
+class ConflictRepair:
+    """
+    Moves genes involved in staff/room/class double-bookings (or labs outside
+    lab rooms) to destinations that the occupancy counters of a FitnessState
+    show to be free. For each conflicting gene every candidate destination is
+    tried with a delta move and the best strictly improving one is kept
+    (fewest hard conflicts first, then highest fitness).
+    """
+
+    def __init__(self, scheduler, max_passes: int = 3, max_destinations: int = 24):
+        self.scheduler = scheduler
+        self.max_passes = max_passes
+        # Free time slots tried per gene (sampled when more are available)
+        self.max_destinations = max_destinations
+        self._options = {}
+
+    def repair(self, chromosome: ArrayChromosome, max_passes: Optional[int] = None) -> int:
+        """Repair conflicts of ``chromosome`` in place; returns the number of moves applied"""
+        evaluator = self.scheduler.fitness_evaluator
+        # The state may be shared with identical chromosomes, so work on a copy
+        state = chromosome.fitness_state
+        state = state.copy() if state is not None else evaluator.build_state(chromosome)
+
+        moves = 0
+        for _ in range(max_passes or self.max_passes):
+            if state.conflict_count == 0:
+                break
+            improved = False
+            for index in self._conflicting_genes(chromosome, state):
+                if self._repair_gene(chromosome, state, index):
+                    improved = True
+                    moves += 1
+            if not improved:
+                break
+
+        state.apply_to(chromosome)
+        return moves
+
+    def _conflicting_genes(self, chromosome: ArrayChromosome, state) -> List[int]:
+        """Indices of genes that take part in a hard conflict, in random order"""
+        genes = chromosome.genes.astype(np.int64, copy=False)
+        day, slot = genes[:, COL_DAY], genes[:, COL_SLOT]
+        conflicted = (
+            (state.staff_occupancy[genes[:, COL_STAFF], day, slot] > 1)
+            | (state.room_occupancy[genes[:, COL_ROOM], day, slot] > 1)
+            | (state.class_occupancy[genes[:, COL_CLASS], day, slot] > 1)
+            | ((genes[:, COL_KIND] == KIND_LAB) & ~state.evaluator.room_is_lab[genes[:, COL_ROOM]])
+        )
+        indices = np.flatnonzero(conflicted)
+        self.scheduler.rng.shuffle(indices)
+        return indices.tolist()
+
+    def _is_conflicted(self, state, class_code: int, day: int, slot: int,
+                       staff: int, room: int, kind: int) -> bool:
+        return (state.staff_occupancy[staff, day, slot] > 1
+                or state.room_occupancy[room, day, slot] > 1
+                or state.class_occupancy[class_code, day, slot] > 1
+                or (kind == KIND_LAB and not state.evaluator.room_is_lab[room]))
+
+    def _repair_gene(self, chromosome: ArrayChromosome, state, index: int) -> bool:
+        """Apply the best conflict-free move for one gene, if it improves the timetable"""
+        current = tuple(chromosome.gene(index).tolist())
+        class_code, day, slot, subject, staff, room, kind = current
+        # Earlier moves in this pass may already have resolved it
+        if not self._is_conflicted(state, class_code, day, slot, staff, room, kind):
+            return False
+
+        best_move = None
+        best_key = (state.conflict_count, -state.fitness)
+        for move in self._destinations(state, current):
+            state.move_gene(chromosome, index, *move)
+            key = (state.conflict_count, -state.fitness)
+            if key < best_key:
+                best_key, best_move = key, move
+            state.move_gene(chromosome, index, day, slot, staff, room)
+
+        if best_move is None:
+            return False
+        state.move_gene(chromosome, index, *best_move)
+        return True
+
+    def _destinations(self, state, gene: Tuple[int, ...]) -> List[Tuple[int, int, int, int]]:
+        """Candidate (day, slot, staff, room) moves where the gene collides with nothing"""
+        class_code, day, slot, subject, staff, room, kind = gene
+        num_days, slots_per_day, staff_options, room_options = self._gene_options(gene)
+
+        def is_free(occupancy, resource, own_resource, d, s):
+            # The gene's own booking does not block it from staying put
+            own = 1 if (resource, d, s) == (own_resource, day, slot) else 0
+            return occupancy[resource, d, s] - own == 0
+
+        class_grid = state.class_occupancy[class_code, :num_days, 1:slots_per_day + 1].copy()
+        if day < num_days and 1 <= slot <= slots_per_day:
+            class_grid[day, slot - 1] -= 1
+        free_days, free_slots = np.nonzero(class_grid == 0)
+        times = list(zip(free_days.tolist(), (free_slots + 1).tolist()))
+        if len(times) > self.max_destinations:
+            picks = self.scheduler.rng.choice(len(times), self.max_destinations, replace=False)
+            times = [times[i] for i in picks.tolist()]
+
+        moves = []
+        for d, s in times:
+            new_staff = next((candidate for candidate in staff_options
+                              if is_free(state.staff_occupancy, candidate, staff, d, s)), None)
+            new_room = next((candidate for candidate in room_options
+                             if is_free(state.room_occupancy, candidate, room, d, s)), None)
+            if new_staff is not None and new_room is not None:
+                moves.append((d, s, new_staff, new_room))
+        return moves
+
+    def _gene_options(self, gene: Tuple[int, ...]) -> Tuple[int, int, Tuple[int, ...], Tuple[int, ...]]:
+        """Working days, slots per day and eligible staff/rooms (current ones first)"""
+        class_code, _, _, subject, staff, room, kind = gene
+        key = (class_code, subject, kind)
+        options = self._options.get(key)
+        if options is None:
+            scheduler = self.scheduler
+            enc = scheduler.encoding
+            class_info = scheduler.class_data[enc.classes[class_code]]
+            subject_code = enc.subjects[subject]
+
+            if kind == KIND_ELECTIVE:
+                staff_ids = ()
+            else:
+                eligible = scheduler._eligible_staff
+                staff_ids = (eligible[kind == KIND_LAB].get(subject_code)
+                             or eligible[False].get(subject_code, ()))
+            if kind == KIND_LAB:
+                room_ids = scheduler._lab_rooms
+            else:
+                room_ids = scheduler._suitable_rooms(subject_code, class_info)
+
+            options = (
+                class_info['working_days'],
+                class_info['slots_per_day'],
+                tuple(enc.staff.codes[staff_id] for staff_id in staff_ids),
+                tuple(enc.rooms.codes[room_id] for room_id in room_ids),
+            )
+            self._options[key] = options
+
+        num_days, slots_per_day, staff_codes, room_codes = options
+        # Keeping the current staff/room is preferred; a misplaced lab must change room
+        staff_options = (staff,) + tuple(code for code in staff_codes if code != staff)
+        if kind == KIND_LAB and not self.scheduler.fitness_evaluator.room_is_lab[room]:
+            room_options = room_codes
+        else:
+            room_options = (room,) + tuple(code for code in room_codes if code != room)
+        return num_days, slots_per_day, staff_options, room_options
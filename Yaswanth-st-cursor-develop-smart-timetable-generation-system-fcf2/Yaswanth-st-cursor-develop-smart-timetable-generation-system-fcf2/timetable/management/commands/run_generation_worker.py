@@ -0,0 +1,81 @@
+"""
+Worker Running Queued Timetable Generations
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from time import sleep
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from timetable.generation_jobs import (
+    LEASE_SECONDS, claim_next_generation, fail_abandoned_generations, initialize_worker, renew_leases,
+    run_generation, solver_slots,
+)
+from timetable.models import TimetableGeneration
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run pending timetable generations in a pool of background processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int,
+                            help='Generations this worker solves at the same time '
+                                 '(default: TIMETABLE_GENERATION_SLOTS)')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds between checks for new generations (and lease renewals; '
+                                 f'keep well below the {LEASE_SECONDS} s generation lease)')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once no generation is pending or running')
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'] or solver_slots())
+        poll_interval = options['poll_interval']
+        self.stdout.write(f"Generation worker started with {concurrency} slot(s)")
+        # Generations left running by a worker that was killed
+        abandoned = fail_abandoned_generations()
+        if abandoned:
+            self.stdout.write(f"Failed {abandoned} generation(s) abandoned by an earlier worker")
+
+        running = {}
+        with ProcessPoolExecutor(max_workers=concurrency, initializer=initialize_worker) as executor:
+            while True:
+                while len(running) < concurrency:
+                    generation_id = claim_next_generation()
+                    if generation_id is None:
+                        break
+                    # Forked solver processes must not share this process's connections
+                    connections.close_all()
+                    running[executor.submit(run_generation, generation_id)] = generation_id
+                    self.stdout.write(f"Generation {generation_id} started")
+
+                if not running:
+                    if options['once']:
+                        break
+                    sleep(poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                renew_leases(generation_id for future, generation_id in running.items() if future not in done)
+                for future in done:
+                    generation_id = running.pop(future)
+                    try:
+                        status = future.result()
+                    except BrokenProcessPool:
+                        # A solver process died; nothing in this pool can finish any more
+                        for lost_id in [generation_id, *running.values()]:
+                            self._mark_crashed(lost_id)
+                        raise CommandError(f"Solver process crashed while running generation {generation_id}")
+                    self.stdout.write(f"Generation {generation_id} {status}")
+
+    def _mark_crashed(self, generation_id: int):
+        """Fail a generation whose solver process was lost"""
+        logger.error(f"Generation {generation_id} lost with its solver process")
+        TimetableGeneration.objects.filter(generation_id=generation_id, status='in_progress').update(
+            status='failed', error_message='Solver process crashed', completed_at=timezone.now())
@@ -4,6 +4,8 @@ Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
 """
 
 from django.db import models
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator, MaxValueValidator
 from datetime import datetime, time
 import json
@@ -226,6 +228,7 @@ class TimetableGeneration(models.Model):
         ('in_progress', 'In Progress'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
     ]
     
     generation_id = models.AutoField(primary_key=True)
@@ -233,12 +236,17 @@ class TimetableGeneration(models.Model):
     semester = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(8)])
     department = models.CharField(max_length=20, choices=Staff.DEPARTMENT_CHOICES, blank=True, null=True)
     status = models.CharField(max_length=20, choices=GENERATION_STATUS_CHOICES, default='pending')
+    priority = models.IntegerField(default=0)  # Higher priorities are solved first
+    cancel_requested = models.BooleanField(default=False)
     generation_parameters = models.JSONField(default=dict)
     fitness_score = models.FloatField(null=True, blank=True)
+    progress = models.FloatField(default=0.0, validators=[MinValueValidator(0.0), MaxValueValidator(100.0)])
+    current_generation = models.IntegerField(default=0)
     conflicts_resolved = models.IntegerField(default=0)
     total_slots_filled = models.IntegerField(default=0)
     generated_by = models.CharField(max_length=100)
     started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # Renewed by the worker running it
     completed_at = models.DateTimeField(null=True, blank=True)
     error_message = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -247,6 +255,15 @@ class TimetableGeneration(models.Model):
         db_table = 'timetable_generations'
         verbose_name = 'Timetable Generation'
         verbose_name_plural = 'Timetable Generations'
+        constraints = [
+            # At most one generation waits per academic year and department
+            # (all departments included), however many requests race to queue one
+            models.UniqueConstraint(
+                'academic_year', Coalesce('department', Value('')),
+                condition=Q(status='pending'),
+                name='unique_pending_generation',
+            ),
+        ]
     
     def __str__(self):
         return f"Generation {self.generation_id} - {self.academic_year} Sem {self.semester}"
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Process-Pool Parallel Fitness Evaluation
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence
+import logging
+
+from .chromosome import ArrayChromosome
+from .fitness_evaluator import PopulationFitnessEvaluator, store_results
+
+logger = logging.getLogger(__name__)
+
+# Problem instance installed once per worker process by the pool initializer
+_worker_evaluator = None
+
+
+def _init_worker(evaluator: PopulationFitnessEvaluator):
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _score_chunk(gene_matrices: List[np.ndarray]) -> np.ndarray:
+    return _worker_evaluator.score_genes(gene_matrices)
+
+
+class ParallelFitnessEvaluator:
+    """
+    Spreads batched fitness evaluation over a pool of worker processes.
+
+    The static problem arrays travel to each worker once, through the pool
+    initializer; tasks only carry the gene matrices of their chunk. Scores
+    are pure functions of the genes, so results are identical to serial mode.
+    """
+
+    def __init__(self, evaluator: PopulationFitnessEvaluator, workers: int,
+                 min_chunk_size: int = 4):
+        self.evaluator = evaluator
+        self.workers = workers
+        self.min_chunk_size = min_chunk_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(evaluator,),
+        )
+        logger.info(f"Started fitness worker pool with {workers} processes")
+
+    def evaluate(self, population: Sequence[ArrayChromosome]) -> np.ndarray:
+        """Calculate and store fitness for every chromosome, returning the scores"""
+        chunk_count = min(self.workers, len(population) // self.min_chunk_size)
+        if chunk_count <= 1:
+            return self.evaluator.evaluate(population)
+
+        chunks = np.array_split(np.arange(len(population)), chunk_count)
+        futures = [
+            self._executor.submit(_score_chunk, [population[i].genes for i in chunk])
+            for chunk in chunks
+        ]
+        results = np.concatenate([future.result() for future in futures])
+
+        store_results(population, results)
+        return results[:, 0]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,175 @@
+"""
+Bulk Persistence of Generated Timetables
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import numpy as np
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from django.db import transaction
+
+from .chromosome import ArrayChromosome, COL_CLASS, COL_SUBJECT, COL_STAFF, COL_ROOM, KIND_LAB, KIND_ELECTIVE
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT; keeps statements well inside SQLite's variable limit
+DEFAULT_BATCH_SIZE = 500
+
+# A published lesson is identified by where it sits ...
+ROW_KEY = ('class_section_id', 'day', 'slot_number', 'week_number')
+# ... and counts as changed when any of these differ
+ROW_FIELDS = ('start_time', 'end_time', 'subject_id', 'staff_id', 'room_id',
+              'is_lab', 'is_elective', 'is_substitute', 'original_staff_id')
+# A substitution covers one staff member's lesson of a subject in a slot: it
+# survives a room or bell-time change, not a change of these (or of the slot)
+SUBSTITUTION_FIELDS = ('subject_id', 'staff_id')
+
+
+def _resolve(model, interner, codes: np.ndarray) -> Dict[int, object]:
+    """Primary keys for the interned codes used by a chromosome, checked in one in_bulk query"""
+    codes = np.unique(codes).tolist()
+    ids = [interner[code] for code in codes]
+    instances = model.objects.in_bulk(ids)
+    missing = [value for value in ids if value not in instances]
+    if missing:
+        raise ValueError(f"Unknown {model._meta.verbose_name} ids: {', '.join(map(str, missing[:5]))}")
+    return {code: instances[value].pk for code, value in zip(codes, ids)}
+
+
+def timetable_rows(scheduler, chromosome: ArrayChromosome, academic_year: str,
+                   week_number: int = 1) -> List:
+    """Unsaved Timetable rows for a chromosome; foreign keys take one in_bulk query per model"""
+    from .models import ClassSection, Subject, Staff, Room, Timetable
+
+    enc = scheduler.encoding
+    genes = chromosome.genes
+    classes = _resolve(ClassSection, enc.classes, genes[:, COL_CLASS])
+    subjects = _resolve(Subject, enc.subjects, genes[:, COL_SUBJECT])
+    staff = _resolve(Staff, enc.staff, genes[:, COL_STAFF])
+    rooms = _resolve(Room, enc.rooms, genes[:, COL_ROOM])
+
+    rows = []
+    for class_code, day, slot, subject, staff_code, room, kind in genes.tolist():
+        start_time, end_time = scheduler.slot_times[slot]
+        rows.append(Timetable(
+            class_section_id=classes[class_code],
+            day=enc.days[day],
+            slot_number=slot,
+            start_time=start_time,
+            end_time=end_time,
+            subject_id=subjects[subject],
+            staff_id=staff[staff_code],
+            room_id=rooms[room],
+            is_lab=kind == KIND_LAB,
+            is_elective=kind == KIND_ELECTIVE,
+            academic_year=academic_year,
+            week_number=week_number,
+        ))
+    return rows
+
+
+def _scoped_rows(academic_year: str, department: Optional[str]):
+    """Stored rows a generation of the year (or of one department) replaces"""
+    from .models import Timetable
+
+    rows = Timetable.objects.filter(academic_year=academic_year)
+    if department:
+        rows = rows.filter(class_section__department=department)
+    return rows
+
+
+def _delete_rows(pks: List[int]) -> Tuple[int, int]:
+    """Delete Timetable rows by primary key, cascading to their substitutions; returns both counts"""
+    from .models import Timetable, Substitution
+
+    _, deleted = Timetable.objects.filter(timetable_id__in=pks).delete()
+    return deleted.get(Timetable._meta.label, 0), deleted.get(Substitution._meta.label, 0)
+
+
+def _batches(items: List, batch_size: int):
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+def publish_timetable(scheduler, chromosome: ArrayChromosome, academic_year: str,
+                      department: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+    """
+    Bring the stored timetable of an academic year (or of one department's
+    classes) in line with ``chromosome`` by touching only what differs.
+    Rows are matched on ROW_KEY: rows no longer produced are deleted,
+    rows whose ROW_FIELDS differ are updated in place and new positions are
+    inserted. Substitutions are dropped with removed lessons and with
+    lessons whose SUBSTITUTION_FIELDS change, and kept otherwise. Returns
+    the change set counts, the classes it touched and the throughput.
+    """
+    from .models import Timetable, Substitution
+
+    started = perf_counter()
+    rows = {}
+    for row in timetable_rows(scheduler, chromosome, academic_year):
+        key = tuple(getattr(row, name) for name in ROW_KEY)
+        if key in rows:
+            raise ValueError(f"Class {key[0]} is double-booked on {key[1]} slot {key[2]}; "
+                             f"refusing to publish a conflicting timetable")
+        rows[key] = row
+
+    with transaction.atomic():
+        scoped = _scoped_rows(academic_year, department)
+        removed, changed, reassigned, unchanged = [], [], [], 0
+        touched = set()
+        for values in scoped.values_list('timetable_id', *ROW_KEY, *ROW_FIELDS).iterator():
+            pk, key = values[0], values[1:len(ROW_KEY) + 1]
+            fields = dict(zip(ROW_FIELDS, values[len(ROW_KEY) + 1:]))
+            row = rows.pop(key, None)
+            if row is None:
+                removed.append(pk)
+                touched.add(key[0])
+            elif any(getattr(row, name) != fields[name] for name in ROW_FIELDS):
+                row.timetable_id = pk
+                changed.append(row)
+                touched.add(key[0])
+                if any(getattr(row, name) != fields[name] for name in SUBSTITUTION_FIELDS):
+                    reassigned.append(pk)
+            else:
+                unchanged += 1
+        created = list(rows.values())
+        touched.update(row.class_section_id for row in created)
+
+        deleted = substitutions_dropped = 0
+        for batch in _batches(removed, batch_size):
+            rows_deleted, substitutions = _delete_rows(batch)
+            deleted += rows_deleted
+            substitutions_dropped += substitutions
+        for batch in _batches(reassigned, batch_size):
+            substitutions, _ = Substitution.objects.filter(original_timetable_id__in=batch).delete()
+            substitutions_dropped += substitutions
+        if changed:
+            changed_ids = [row.timetable_id for row in changed]
+            # Park the changed rows on a week no lesson uses so that swapping
+            # staff, rooms or slots between them never trips a unique constraint
+            Timetable.objects.bulk_update(
+                [Timetable(timetable_id=pk, week_number=-pk) for pk in changed_ids],
+                ['week_number'], batch_size=batch_size,
+            )
+            Timetable.objects.bulk_update(changed, ['week_number', *ROW_FIELDS], batch_size=batch_size)
+        Timetable.objects.bulk_create(created, batch_size=batch_size)
+
+    elapsed = perf_counter() - started
+    published = len(created) + len(changed) + unchanged
+    stats = {
+        'rows': published,
+        'created': len(created),
+        'updated': len(changed),
+        'deleted': deleted,
+        'unchanged': unchanged,
+        'substitutions_dropped': substitutions_dropped,
+        'classes_changed': sorted(touched),
+        'seconds': round(elapsed, 4),
+        'rows_per_second': round(published / elapsed, 1) if elapsed else None,
+    }
+    logger.info(f"Published {published} timetable rows in {elapsed:.3f}s ({stats['rows_per_second']} rows/s): "
+                f"{stats['created']} created, {stats['updated']} updated, {stats['deleted']} deleted, "
+                f"{unchanged} unchanged")
+    return stats
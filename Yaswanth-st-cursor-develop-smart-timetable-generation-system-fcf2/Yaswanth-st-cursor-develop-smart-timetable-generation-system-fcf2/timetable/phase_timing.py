@@ -0,0 +1,134 @@
+"""
+Per-Phase Wall-Time Instrumentation of Genetic Algorithm Runs
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+from time import perf_counter
+from typing import Dict, List
+
+
+class _Phase:
+    """Context manager timing one entry into a phase"""
+    __slots__ = ('timer', 'name')
+
+    def __init__(self, timer: 'PhaseTimer', name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer._stack.append([self.name, perf_counter(), 0.0])
+
+    def __exit__(self, *exc_info):
+        name, started, nested = self.timer._stack.pop()
+        elapsed = perf_counter() - started
+        # Time spent in nested phases is only counted for them
+        self.timer.generation[name] = self.timer.generation.get(name, 0.0) + elapsed - nested
+        if self.timer._stack:
+            self.timer._stack[-1][2] += elapsed
+        return False
+
+
+class _RunPhase:
+    """Times a phase that happens once per run rather than per generation"""
+    __slots__ = ('timer', 'name', 'started')
+
+    def __init__(self, timer: 'PhaseTimer', name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.started
+        self.timer.run_phases[self.name] = self.timer.run_phases.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class PhaseTimer:
+    """
+    Accumulates wall time per named phase of the current generation.
+    Phases may nest; each one is charged only its own (exclusive) time.
+    take_generation() hands over the generation's totals and starts the
+    next one; run-level phases (data loading, initial population) are kept
+    separately in ``run_phases``.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.generation: Dict[str, float] = {}
+        self.run_phases: Dict[str, float] = {}
+        self._stack: List[list] = []
+
+    def measure(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def measure_run(self, name: str) -> _RunPhase:
+        return _RunPhase(self, name)
+
+    def take_generation(self) -> Dict[str, float]:
+        generation, self.generation = self.generation, {}
+        return generation
+
+
+class NullPhaseTimer:
+    """Stand-in when instrumentation is off: every phase is a shared no-op"""
+
+    enabled = False
+    run_phases: Dict[str, float] = {}
+
+    def measure(self, name: str) -> _NullPhase:
+        return _NULL_PHASE
+
+    measure_run = measure
+
+    def take_generation(self) -> Dict[str, float]:
+        return {}
+
+
+NULL_PHASE_TIMER = NullPhaseTimer()
+
+
+def merge_phases(entries: List[Dict]) -> Dict[str, float]:
+    """Phase times of generations run side by side (islands, departments), summed"""
+    merged: Dict[str, float] = {}
+    for entry in entries:
+        for name, seconds in entry.get('phase_seconds', {}).items():
+            merged[name] = round(merged.get(name, 0.0) + seconds, 6)
+    return merged
+
+
+def summarize_phases(generation_stats: List[Dict], run_phases: Dict[str, float]) -> Dict:
+    """Totals and per-generation means of the phase times recorded in generation_stats"""
+    totals: Dict[str, float] = {}
+    generations = 0
+    for entry in generation_stats:
+        phases = entry.get('phase_seconds')
+        if phases is None:
+            continue
+        generations += 1
+        for name, seconds in phases.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+
+    return {
+        'generations': generations,
+        'run': {name: round(seconds, 6) for name, seconds in run_phases.items()},
+        'total': {name: round(seconds, 6) for name, seconds in totals.items()},
+        'mean_per_generation': {
+            name: round(seconds / generations, 6) for name, seconds in totals.items()
+        } if generations else {},
+    }
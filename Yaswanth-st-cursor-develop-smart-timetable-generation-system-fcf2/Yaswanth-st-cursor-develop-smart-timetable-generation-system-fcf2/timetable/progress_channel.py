@@ -0,0 +1,71 @@
+"""
+Live Generation Progress Channel
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+from typing import Dict, List, Tuple
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a generation's events stay readable after they were published
+EVENT_TIMEOUT = 3600
+# Events a client that connects late (or reconnects) can catch up on
+MAX_BACKLOG = 200
+
+
+def _key(generation_id: int, name) -> str:
+    return f"timetable:generation:{generation_id}:{name}"
+
+
+class ProgressChannel:
+    """
+    Event log of one generation kept in the Django cache, so that the
+    worker process running it and the web processes streaming it need not
+    share anything else. Events are numbered from 1; the worker is the only
+    writer, readers follow the latest sequence number.
+    """
+
+    def __init__(self, generation_id: int):
+        self.generation_id = generation_id
+        self.sequence = 0
+
+    def open(self):
+        """Start an empty event log, dropping any left by an earlier run under the same id"""
+        self.sequence = 0
+        cache.delete(_key(self.generation_id, 'sequence'))
+
+    def publish(self, event: str, data: Dict) -> int:
+        """Append an event; returns its sequence number"""
+        self.sequence += 1
+        cache.set(_key(self.generation_id, self.sequence), {'event': event, 'data': data}, EVENT_TIMEOUT)
+        # Readers only look for events up to the published sequence number
+        cache.set(_key(self.generation_id, 'sequence'), self.sequence, EVENT_TIMEOUT)
+        return self.sequence
+
+
+def _event_keys(generation_id: int, after: int, latest: int) -> Dict[int, str]:
+    first = max(after + 1, latest - MAX_BACKLOG + 1)
+    return {sequence: _key(generation_id, sequence) for sequence in range(first, latest + 1)}
+
+
+def read_events(generation_id: int, after: int = 0) -> List[Tuple[int, Dict]]:
+    """Events of a generation published after sequence number ``after``, oldest first"""
+    latest = cache.get(_key(generation_id, 'sequence'), 0)
+    if latest <= after:
+        return []
+    keys = _event_keys(generation_id, after, latest)
+    found = cache.get_many(keys.values())
+    return [(sequence, found[key]) for sequence, key in keys.items() if key in found]
+
+
+async def aread_events(generation_id: int, after: int = 0) -> List[Tuple[int, Dict]]:
+    """Asynchronous read_events, for streams served under ASGI"""
+    latest = await cache.aget(_key(generation_id, 'sequence'), 0)
+    if latest <= after:
+        return []
+    keys = _event_keys(generation_id, after, latest)
+    found = await cache.aget_many(keys.values())
+    return [(sequence, found[key]) for sequence, key in keys.items() if key in found]
@@ -0,0 +1,77 @@
+"""
+Bitmask Free-Slot Allocator for Building Class Timetables
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+from typing import List, Optional, Tuple
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+def _nth_set_bit(mask: int, n: int) -> int:
+    """Position of the n-th (0-based) set bit of mask"""
+    for _ in range(n):
+        mask &= mask - 1
+    return (mask & -mask).bit_length() - 1
+
+
+class SlotAllocator:
+    """
+    Free slots of one class week, one integer bitmask per day.
+
+    Bit ``slot - 1`` of ``masks[day]`` is set while that slot is free. Free
+    counts are kept per day so a uniformly random free slot, or a uniformly
+    random start of a free run of ``k`` slots, is found without listing the
+    whole week. Random picks draw from ``rng`` (a numpy Generator).
+    """
+
+    def __init__(self, num_days: int, slots_per_day: int, rng):
+        self.rng = rng
+        self.slots_per_day = slots_per_day
+        full_day = (1 << slots_per_day) - 1
+        self.masks: List[int] = [full_day] * num_days
+        self.day_free: List[int] = [slots_per_day] * num_days
+        self.free_count = num_days * slots_per_day
+
+    def allocate(self, day: int, slot: int, length: int = 1):
+        """Mark ``length`` slots starting at ``slot`` (1-based) as taken"""
+        bits = ((1 << length) - 1) << (slot - 1)
+        taken = _popcount(self.masks[day] & bits)
+        self.masks[day] &= ~bits
+        self.day_free[day] -= taken
+        self.free_count -= taken
+
+    def random_free_slot(self) -> Optional[Tuple[int, int]]:
+        """Uniformly random free (day index, slot), or None when the week is full"""
+        if self.free_count == 0:
+            return None
+        rank = int(self.rng.integers(self.free_count))
+        for day, free in enumerate(self.day_free):
+            if rank < free:
+                return day, _nth_set_bit(self.masks[day], rank) + 1
+            rank -= free
+        return None
+
+    def random_free_run(self, length: int) -> Optional[Tuple[int, int]]:
+        """Uniformly random (day index, start slot) of ``length`` consecutive free slots"""
+        starts = []
+        total = 0
+        for mask in self.masks:
+            # Bit i survives only if slots i .. i + length - 1 are all free
+            run_starts = mask
+            for shift in range(1, length):
+                run_starts &= mask >> shift
+            starts.append(run_starts)
+            total += _popcount(run_starts)
+
+        if total == 0:
+            return None
+        rank = int(self.rng.integers(total))
+        for day, run_starts in enumerate(starts):
+            count = _popcount(run_starts)
+            if rank < count:
+                return day, _nth_set_bit(run_starts, rank) + 1
+            rank -= count
+        return None
@@ -5,6 +5,7 @@ Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
 
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
+from .models import Staff, Subject, ClassSection, Room, Timetable, Substitution
 from .mongodb import mongo_collections
 import logging
 
@@ -0,0 +1,341 @@
+"""
+Synthetic Institution Generator for Benchmarking
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+import math
+import string
+import numpy as np
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Department choices of the models; larger institutions get numbered departments
+DEPARTMENT_CODES = ('cse', 'ece', 'eee', 'mech', 'civil', 'it', 'ai_ml', 'cyber_security')
+DESIGNATIONS = ('professor', 'associate_professor', 'assistant_professor', 'lecturer')
+
+STAFF_SESSIONS_PER_WEEK = 18
+STAFF_SESSIONS_PER_DAY = 5
+# Staff members able to teach each subject or lab
+STAFF_PER_SUBJECT = 2
+# Sections enrolled in each elective (all taught by the elective's one staff member)
+ELECTIVE_SECTIONS = 3
+ROOM_CAPACITIES = (70, 80, 100)
+
+
+class SyntheticInstitution:
+    """
+    A consistent, randomly generated institution of a given size.
+
+    Sections are spread round-robin over departments and years. Every
+    section takes core subjects and labs from its department's pool for
+    that year; senior sections may also take one of the department's
+    electives. Staff and rooms are sized from the weekly teaching demand so
+    that ``tightness`` (demand / capacity, in (0, 1]) controls how hard the
+    instance is; explicit staff and room counts override the sizing. The
+    same parameters and seed always give the same institution.
+    """
+
+    def __init__(self, class_sections: int = 10, departments: Optional[int] = None, years: int = 4,
+                 subjects_per_class: int = 5, labs_per_class: int = 1,
+                 staff_per_department: Optional[int] = None, classrooms: Optional[int] = None,
+                 lab_rooms: Optional[int] = None, electives_per_department: int = 1,
+                 tightness: float = 0.7, working_days: int = 5, slots_per_day: int = 8,
+                 seed: int = 0):
+        if not 0 < tightness <= 1:
+            raise ValueError("tightness must be in (0, 1]")
+        if not 1 <= years <= 4:
+            raise ValueError("years must be between 1 and 4")
+        if class_sections < 1:
+            raise ValueError("class_sections must be positive")
+
+        # Around ten sections per year in each department by default
+        self.departments = departments or max(1, math.ceil(class_sections / (years * 10)))
+        if math.ceil(class_sections / (self.departments * years)) > len(string.ascii_uppercase):
+            raise ValueError("Too many sections per year; add departments")
+
+        self.class_sections = class_sections
+        self.years = years
+        self.subjects_per_class = subjects_per_class
+        self.labs_per_class = labs_per_class
+        self.staff_per_department = staff_per_department
+        self.classrooms = classrooms
+        self.lab_rooms = lab_rooms
+        self.electives_per_department = electives_per_department
+        self.tightness = tightness
+        self.working_days = working_days
+        self.slots_per_day = slots_per_day
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+        # Model field values, keyed like the model constructors
+        self.staff: List[Dict] = []
+        self.subjects: List[Dict] = []
+        self.class_sections_data: List[Dict] = []
+        self.rooms: List[Dict] = []
+        self.electives: List[Dict] = []
+        self._build()
+
+    def _department_codes(self) -> List[str]:
+        if self.departments <= len(DEPARTMENT_CODES):
+            return list(DEPARTMENT_CODES[:self.departments])
+        width = len(str(self.departments))
+        return [f"d{i + 1:0{width}d}" for i in range(self.departments)]
+
+    def _build(self):
+        rng = self.rng
+        departments = self._department_codes()
+
+        # Sections round-robin over (department, year)
+        pairs = [(department, year) for department in departments for year in range(1, self.years + 1)]
+        sections = {}
+        for i in range(self.class_sections):
+            department, year = pairs[i % len(pairs)]
+            sections.setdefault((department, year), []).append(string.ascii_uppercase[i // len(pairs)])
+
+        # Subject and lab pools per (department, year) that has sections
+        pools = {}
+        for (department, year) in sections:
+            prefix = department.upper()
+            cores, labs = [], []
+            for n in range(self.subjects_per_class + 2):
+                code = f"{prefix}{year}{n + 1:02d}"
+                cores.append(code)
+                self.subjects.append({
+                    'subject_code': code, 'subject_name': f"{prefix} Subject {year}.{n + 1}",
+                    'subject_type': 'core', 'department': department, 'semester': 2 * year - 1,
+                    'credits': 3, 'hours_per_week': int(rng.integers(3, 5)),
+                })
+            for n in range(self.labs_per_class + 1 if self.labs_per_class else 0):
+                code = f"{prefix}{year}{n + 1:02d}L"
+                labs.append(code)
+                self.subjects.append({
+                    'subject_code': code, 'subject_name': f"{prefix} Lab {year}.{n + 1}",
+                    'subject_type': 'lab', 'department': department, 'semester': 2 * year - 1,
+                    'credits': 2, 'hours_per_week': 2, 'is_lab': True, 'lab_duration_hours': 2,
+                })
+            pools[(department, year)] = (cores, labs)
+
+        hours = {subject['subject_code']: subject['hours_per_week'] for subject in self.subjects}
+        for (department, year), letters in sections.items():
+            cores, labs = pools[(department, year)]
+            for letter in letters:
+                chosen_cores = [cores[i] for i in sorted(rng.choice(len(cores), self.subjects_per_class, replace=False))]
+                chosen_labs = [labs[i] for i in sorted(rng.choice(len(labs), self.labs_per_class, replace=False))]
+                self.class_sections_data.append({
+                    'class_id': f"{department.upper()}_{year}{letter}", 'year': year, 'section': letter,
+                    'department': department, 'total_students': int(rng.integers(40, 71)),
+                    'subjects': [{'subject_code': code, 'hours_per_week': hours[code]} for code in chosen_cores],
+                    'labs': [{'lab_code': code, 'sessions_per_week': 1} for code in chosen_labs],
+                    'electives': [],
+                    'working_days_per_week': self.working_days, 'slots_per_day': self.slots_per_day,
+                })
+
+        self._build_electives(departments)
+        self._build_staff(departments)
+        self._build_rooms(departments)
+
+    def _build_electives(self, departments: List[str]):
+        """Electives of each department, enrolled by a few of its senior sections"""
+        rng = self.rng
+        senior_year = max(1, self.years - 1)
+        for department in departments:
+            seniors = [section for section in self.class_sections_data
+                       if section['department'] == department and section['year'] >= senior_year]
+            order = rng.permutation(len(seniors)).tolist()
+            for n in range(self.electives_per_department):
+                enrolled = [seniors[i] for i in order[n * ELECTIVE_SECTIONS:(n + 1) * ELECTIVE_SECTIONS]]
+                if not enrolled:
+                    break
+                elective_id = f"{department.upper()}E{n + 1:02d}"
+                for section in enrolled:
+                    section['electives'].append(elective_id)
+                self.electives.append({
+                    'elective_id': elective_id, 'elective_name': f"{department.upper()} Elective {n + 1}",
+                    'offering_department': department, 'semester': 2 * senior_year - 1, 'credits': 3,
+                    'max_students': 100, 'hours_per_week': int(rng.integers(2, 4)),
+                    'enrolled_sections': [section['class_id'] for section in enrolled],
+                    'staff_assigned_id': None,
+                })
+                # Timetable rows reference their subject, electives included
+                self.subjects.append({
+                    'subject_code': elective_id, 'subject_name': self.electives[-1]['elective_name'],
+                    'subject_type': 'elective', 'department': department, 'semester': 2 * senior_year - 1,
+                    'credits': 3, 'hours_per_week': self.electives[-1]['hours_per_week'],
+                })
+
+    def _build_staff(self, departments: List[str]):
+        """Staff sized from teaching demand; subjects go to the least-loaded staff"""
+        rng = self.rng
+        for department in departments:
+            # Weekly teaching hours per code across the department's sections
+            demand = {}
+            for section in self.class_sections_data:
+                if section['department'] != department:
+                    continue
+                for subject in section['subjects']:
+                    demand[subject['subject_code']] = demand.get(subject['subject_code'], 0) + subject['hours_per_week']
+                for lab in section['labs']:
+                    demand[lab['lab_code']] = demand.get(lab['lab_code'], 0) + 2 * lab['sessions_per_week']
+            electives = [elective for elective in self.electives if elective['offering_department'] == department]
+            total = sum(demand.values()) + sum(
+                elective['hours_per_week'] * len(elective['enrolled_sections']) for elective in electives)
+
+            count = self.staff_per_department or max(
+                STAFF_PER_SUBJECT, math.ceil(total / (self.tightness * STAFF_SESSIONS_PER_WEEK)))
+            members = []
+            for n in range(count):
+                staff_id = f"{department.upper()}{n + 1:03d}"
+                members.append({
+                    'staff_id': staff_id, 'name': f"Staff {staff_id}",
+                    'designation': DESIGNATIONS[int(rng.integers(len(DESIGNATIONS)))],
+                    'department': department, 'email': f"{staff_id.lower()}@synthetic.edu",
+                    'max_sessions_per_week': STAFF_SESSIONS_PER_WEEK,
+                    'max_sessions_per_day': STAFF_SESSIONS_PER_DAY,
+                    'subjects_handled': [], 'labs_handled': [], 'electives_handled': [],
+                })
+
+            # Shared subjects split their hours between the staff who can teach them
+            lab_codes = {subject['subject_code'] for subject in self.subjects if subject.get('is_lab')}
+            load = np.zeros(count)
+            handlers = min(STAFF_PER_SUBJECT, count)
+            for code in sorted(demand, key=lambda code: -demand[code]):
+                order = np.lexsort((rng.random(count), load))[:handlers]
+                field = 'labs_handled' if code in lab_codes else 'subjects_handled'
+                for i in order.tolist():
+                    members[i][field].append(code)
+                    load[i] += demand[code] / handlers
+            for elective in electives:
+                i = int(np.lexsort((rng.random(count), load))[0])
+                members[i]['electives_handled'].append(elective['elective_id'])
+                elective['staff_assigned_id'] = members[i]['staff_id']
+                load[i] += elective['hours_per_week'] * len(elective['enrolled_sections'])
+            self.staff.extend(members)
+
+    def _build_rooms(self, departments: List[str]):
+        """Classrooms (shared) and department labs sized from weekly room demand"""
+        rng = self.rng
+        week_slots = self.working_days * self.slots_per_day
+        lecture_hours = sum(subject['hours_per_week'] for section in self.class_sections_data
+                            for subject in section['subjects'])
+        lecture_hours += sum(elective['hours_per_week'] * len(elective['enrolled_sections'])
+                             for elective in self.electives)
+        lab_hours = sum(2 * lab['sessions_per_week'] for section in self.class_sections_data
+                        for lab in section['labs'])
+
+        classrooms = self.classrooms or max(1, math.ceil(lecture_hours / (self.tightness * week_slots)))
+        lab_rooms = self.lab_rooms if self.lab_rooms is not None else (
+            math.ceil(lab_hours / (self.tightness * week_slots)) if lab_hours else 0)
+
+        width = len(str(max(classrooms, lab_rooms, 1)))
+        for n in range(classrooms):
+            self.rooms.append({
+                'room_id': f"CR{n + 1:0{width}d}", 'room_name': f"Classroom {n + 1}",
+                'room_type': 'classroom',
+                'capacity': ROOM_CAPACITIES[int(rng.integers(len(ROOM_CAPACITIES)))],
+                'floor': n % 5, 'building': f"Academic Block {string.ascii_uppercase[(n // 50) % 26]}",
+                'facilities': ['projector', 'whiteboard'],
+            })
+        for n in range(lab_rooms):
+            self.rooms.append({
+                'room_id': f"LAB{n + 1:0{width}d}", 'room_name': f"Laboratory {n + 1}",
+                'room_type': 'lab', 'department': departments[n % len(departments)],
+                'capacity': ROOM_CAPACITIES[int(rng.integers(len(ROOM_CAPACITIES)))],
+                'floor': n % 5, 'building': 'Lab Block', 'facilities': ['computers', 'projector'],
+            })
+
+    def summary(self) -> Dict[str, int]:
+        """Number of generated records per model"""
+        return {
+            'staff': len(self.staff),
+            'subjects': len(self.subjects),
+            'class_sections': len(self.class_sections_data),
+            'rooms': len(self.rooms),
+            'electives': len(self.electives),
+        }
+
+    def problem(self) -> Dict:
+        """The institution as a scheduler problem, for GeneticAlgorithmScheduler.generate_timetable(problem=...)"""
+        return {
+            'staff_data': {
+                staff['staff_id']: {
+                    'name': staff['name'],
+                    'department': staff['department'],
+                    'designation': staff['designation'],
+                    'subjects': staff['subjects_handled'],
+                    'labs': staff['labs_handled'],
+                    'electives': staff['electives_handled'],
+                    'max_sessions_per_day': staff['max_sessions_per_day'],
+                    'max_sessions_per_week': staff['max_sessions_per_week'],
+                    'leave_dates': [],
+                } for staff in self.staff
+            },
+            'subject_data': {
+                subject['subject_code']: {
+                    'name': subject['subject_name'],
+                    'type': subject['subject_type'],
+                    'department': subject['department'],
+                    'credits': subject['credits'],
+                    'hours_per_week': subject['hours_per_week'],
+                    'is_lab': subject.get('is_lab', False),
+                    'lab_duration': subject.get('lab_duration_hours', 2),
+                } for subject in self.subjects
+            },
+            'class_data': {
+                section['class_id']: {
+                    'year': section['year'],
+                    'section': section['section'],
+                    'department': section['department'],
+                    'total_students': section['total_students'],
+                    'subjects': section['subjects'],
+                    'labs': section['labs'],
+                    'electives': section['electives'],
+                    'working_days': section['working_days_per_week'],
+                    'slots_per_day': section['slots_per_day'],
+                } for section in self.class_sections_data
+            },
+            'room_data': {
+                room['room_id']: {
+                    'name': room['room_name'],
+                    'type': room['room_type'],
+                    'capacity': room['capacity'],
+                    'department': room.get('department'),
+                    'availability': {},
+                } for room in self.rooms
+            },
+            'elective_data': {
+                elective['elective_id']: {
+                    'name': elective['elective_name'],
+                    'department': elective['offering_department'],
+                    'staff': elective['staff_assigned_id'],
+                    'hours_per_week': elective['hours_per_week'],
+                    'enrolled_sections': elective['enrolled_sections'],
+                } for elective in self.electives
+            },
+            'reference_rows': [],
+        }
+
+    def save(self, clear: bool = False, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Insert the institution with bulk_create in one transaction. With
+        ``clear``, existing staff, subjects, classes, rooms and electives (and
+        the timetables referencing them) are deleted first.
+        """
+        from django.db import transaction
+        from .models import Staff, Subject, ClassSection, Room, Elective
+
+        with transaction.atomic():
+            if clear:
+                for model in (Elective, ClassSection, Subject, Room, Staff):
+                    model.objects.all().delete()
+            Staff.objects.bulk_create([Staff(**data) for data in self.staff], batch_size=batch_size)
+            Subject.objects.bulk_create([Subject(**data) for data in self.subjects], batch_size=batch_size)
+            ClassSection.objects.bulk_create(
+                [ClassSection(**data) for data in self.class_sections_data], batch_size=batch_size)
+            Room.objects.bulk_create([Room(**data) for data in self.rooms], batch_size=batch_size)
+            Elective.objects.bulk_create([Elective(**data) for data in self.electives], batch_size=batch_size)
+
+        counts = self.summary()
+        logger.info(f"Inserted synthetic institution (seed {self.seed}): {counts}")
+        return counts
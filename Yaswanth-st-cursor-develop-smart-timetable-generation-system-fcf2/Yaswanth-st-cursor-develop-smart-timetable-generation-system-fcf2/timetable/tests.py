@@ -0,0 +1,836 @@
+"""
+Tests for the Timetable Generation System
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+
+Run from the project root:
+    django-admin test timetable --settings=timetable_project.settings --pythonpath=.
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+from time import monotonic
+from unittest import mock
+
+import numpy as np
+from django.db import IntegrityError, transaction
+from django.conf import settings
+from django.db.models import QuerySet
+from django.test import AsyncClient, Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from timetable.generation_jobs import (
+    LEASE_SECONDS, CancellationCheck, cancel_generation, claim_next_generation, enqueue_generation,
+    fail_abandoned_generations, renew_leases, scheduler_settings,
+)
+from timetable.chromosome import (
+    ArrayChromosome, COL_CLASS, COL_DAY, COL_KIND, COL_ROOM, COL_SLOT, COL_STAFF, COL_SUBJECT, KIND_LAB,
+)
+from timetable.dsatur_seeding import DSaturSeeder
+from timetable.genetic_algorithm import GeneticAlgorithmScheduler
+from timetable.local_search import ConflictRepair
+from timetable.models import Substitution, Timetable, TimetableGeneration
+from timetable.persistence import publish_timetable
+from timetable.progress_channel import ProgressChannel
+from timetable.views import _sse
+from timetable.synthetic_data import SyntheticInstitution
+from timetable.warm_start import reconcile_reference
+
+
+def make_scheduler(class_sections: int = 6, institution_seed: int = 1, **settings) -> GeneticAlgorithmScheduler:
+    """Scheduler with a small synthetic institution loaded"""
+    settings.setdefault('population_size', 12)
+    settings.setdefault('generations', 5)
+    settings.setdefault('seed', 7)
+    scheduler = GeneticAlgorithmScheduler(**settings)
+    scheduler.load_problem(SyntheticInstitution(class_sections=class_sections, seed=institution_seed).problem())
+    return scheduler
+
+
+def reference_rows(scheduler, chromosome):
+    """A chromosome as published (warm-start reference) rows"""
+    enc = scheduler.encoding
+    return [
+        (enc.classes[class_code], enc.days[day], slot, enc.subjects[subject], enc.staff[staff], enc.rooms[room], kind)
+        for class_code, day, slot, subject, staff, room, kind in chromosome.genes.tolist()
+    ]
+
+
+class MemeticRepairTests(SimpleTestCase):
+    def test_repairing_a_crossover_parent_leaves_its_children_alone(self):
+        scheduler = make_scheduler(crossover_rate=1.0)
+        population = scheduler.create_initial_population()
+        scheduler.evaluate_population(population)
+        elite = max(population, key=lambda chromosome: chromosome.conflict_count)
+        other = next(chromosome for chromosome in population if chromosome is not elite)
+        self.assertGreater(elite.conflict_count, 0)
+
+        repair = ConflictRepair(scheduler, max_destinations=1)
+        repair.repair(elite, max_passes=1)
+        children = scheduler.crossover(elite, other)
+        scheduler.evaluate_population(list(children))
+        before = [(child.genes.copy(), child.conflict_count) for child in children]
+
+        repair.repair(elite)
+
+        for child, (genes, conflicts) in zip(children, before):
+            np.testing.assert_array_equal(np.concatenate(child.blocks), genes)
+            child.fitness_valid = False
+            scheduler.fitness_evaluator.evaluate([child])
+            self.assertEqual(child.conflict_count, conflicts)
+
+
+class DSaturSeedingTests(SimpleTestCase):
+    def setUp(self):
+        # Lab rooms are the scarce resource here
+        self.scheduler = make_scheduler(class_sections=30, institution_seed=2, population_size=20,
+                                        seeding_ratio=0.5)
+        self.seeder = DSaturSeeder(self.scheduler)
+
+    def test_every_lesson_is_placed_and_labs_stay_together(self):
+        genes = ArrayChromosome.from_rows(self.seeder.build_rows(), self.scheduler.encoding.num_classes).genes
+        self.assertEqual(len(genes), sum(lesson.length for lesson in self.seeder.lessons))
+        labs = genes[genes[:, COL_KIND] == KIND_LAB]
+        # Two-slot lab sessions: each class's lab slots pair up on one day, in one room
+        for class_code, subject in {tuple(row) for row in labs[:, [COL_CLASS, COL_SUBJECT]].tolist()}:
+            sessions = labs[(labs[:, COL_CLASS] == class_code) & (labs[:, COL_SUBJECT] == subject)]
+            sessions = sessions[np.lexsort((sessions[:, COL_SLOT], sessions[:, COL_DAY]))]
+            for first, second in zip(sessions[::2], sessions[1::2]):
+                self.assertEqual((first[COL_DAY], first[COL_SLOT] + 1, first[COL_ROOM]),
+                                 (second[COL_DAY], second[COL_SLOT], second[COL_ROOM]))
+
+    def test_seeded_individuals_have_fewer_conflicts_than_random_ones(self):
+        population = self.scheduler.create_initial_population()
+        self.scheduler.evaluate_population(population)
+        conflicts = [chromosome.conflict_count for chromosome in population]
+        seeded, random = conflicts[:10], conflicts[10:]
+        self.assertLess(max(seeded), min(random))
+
+
+class WarmStartTests(SimpleTestCase):
+    def setUp(self):
+        self.scheduler = make_scheduler()
+        day_index = self.scheduler.encoding.day_index
+        # In class, day and slot order, so the first row of a lab starts a session
+        self.reference = sorted(reference_rows(self.scheduler, self.scheduler.create_initial_population()[0]),
+                                key=lambda row: (row[0], day_index[row[1]], row[2]))
+        self.lab_rows = [i for i, row in enumerate(self.reference) if row[6] == KIND_LAB
+                         and row[3] in {lab['lab_code'] for lab in self.scheduler.class_data[row[0]]['labs']}]
+
+    def reconcile(self, reference):
+        """Reconciled rows and the number of integers drawn for them"""
+        scheduler = self.scheduler
+        rng = scheduler.rng = np.random.default_rng(3)
+        draws = []
+
+        class CountingRng:
+            def integers(self, *args, **kwargs):
+                draws.append(args)
+                return rng.integers(*args, **kwargs)
+
+            def __getattr__(self, name):
+                return getattr(rng, name)
+
+        scheduler.rng = CountingRng()
+        try:
+            return reconcile_reference(scheduler, reference), len(draws)
+        finally:
+            scheduler.rng = rng
+
+    def test_replacement_staff_is_drawn_once_per_lab_session(self):
+        _, baseline = self.reconcile(self.reference)
+        reference = list(self.reference)
+        first = self.lab_rows[0]
+        class_id, day, slot, code = reference[first][:4]
+        for i, row in enumerate(reference):
+            if row[:4] in {(class_id, day, slot, code), (class_id, day, slot + 1, code)}:
+                reference[i] = row[:4] + ('retired-staff',) + row[5:]
+
+        rows, draws = self.reconcile(reference)
+
+        self.assertEqual(draws, baseline + 1)
+        enc = self.scheduler.encoding
+        session = (enc.classes.codes[class_id], enc.day_index[day], enc.subjects.codes[code])
+        staff = {row[COL_STAFF] for row in rows
+                 if (row[COL_CLASS], row[COL_DAY], row[COL_SUBJECT]) == session and row[COL_SLOT] in (slot, slot + 1)}
+        self.assertEqual(len(staff), 1)
+
+    def test_partial_lab_sessions_are_not_kept(self):
+        reference = list(self.reference)
+        class_id, _, _, code = reference[self.lab_rows[0]][:4]
+        del reference[self.lab_rows[0]]
+
+        rows, _ = self.reconcile(reference)
+
+        enc = self.scheduler.encoding
+        sessions = next(lab['sessions_per_week'] for lab in self.scheduler.class_data[class_id]['labs']
+                        if lab['lab_code'] == code)
+        lab = sorted((row[COL_DAY], row[COL_SLOT]) for row in rows
+                     if row[COL_CLASS] == enc.classes.codes[class_id] and row[COL_SUBJECT] == enc.subjects.codes[code])
+        self.assertEqual(len(lab), 2 * sessions)
+        for first, second in zip(lab[::2], lab[1::2]):
+            self.assertEqual((first[0], first[1] + 1), second)
+
+
+class GenerationQueueTests(TestCase):
+    settings ={'population_size': 10, 'generations': 2}
+
+    def enqueue(self, department=None, priority=0, academic_year='2024-25'):
+        return enqueue_generation(academic_year, 1, department, 'tester', dict(self.settings), priority=priority)
+
+    def test_requests_for_a_waiting_scope_join_it(self):
+        first, created = self.enqueue('CSE')
+        again, created_again = self.enqueue('CSE', priority=5)
+        other, created_other = self.enqueue('ECE')
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(again.generation_id, first.generation_id)
+        first.refresh_from_db()
+        self.assertEqual(first.priority, 5)
+        self.assertTrue(created_other)
+
+    def test_database_allows_one_pending_generation_per_scope(self):
+        self.enqueue()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TimetableGeneration.objects.create(academic_year='2024-25', semester=1, status='pending',
+                                               generated_by='tester')
+
+    def test_request_losing_the_queueing_race_joins_the_winner(self):
+        winner, _ = self.enqueue('CSE')
+        first = QuerySet.first
+        lookups = []
+
+        def first_after_race(queryset):
+            # The loser's first lookup ran before the winner's insert
+            lookups.append(queryset)
+            return None if len(lookups) == 1 else first(queryset)
+
+        with mock.patch.object(QuerySet, 'first', first_after_race):
+            loser, created = self.enqueue('CSE')
+        self.assertFalse(created)
+        self.assertEqual(loser.generation_id, winner.generation_id)
+        self.assertEqual(TimetableGeneration.objects.filter(status='pending').count(), 1)
+
+    def test_scope_decides_what_is_solved(self):
+        whole, _ = enqueue_generation('2024-25', 1, '', 'tester', {**self.settings, 'department': 'ECE'})
+        single, _ = enqueue_generation('2024-25', 1, 'CSE', 'tester', {'decompose_by_department': True})
+        self.assertIsNone(whole.department)
+        self.assertEqual(scheduler_settings(whole)['department'], None)
+        self.assertEqual(scheduler_settings(single)['department'], 'CSE')
+        self.assertFalse(scheduler_settings(single)['decompose_by_department'])
+
+    def test_department_decomposition_is_opt_in(self):
+        plain, _ = enqueue_generation('2024-25', 1, None, 'tester', {'islands': 2, 'checkpoint_interval': 5})
+        decomposed, _ = enqueue_generation('2025-26', 1, None, 'tester', {'decompose_by_department': True})
+        self.assertFalse(scheduler_settings(plain)['decompose_by_department'])
+        self.assertEqual(scheduler_settings(plain)['islands'], 2)
+        self.assertTrue(scheduler_settings(decomposed)['decompose_by_department'])
+
+    @override_settings(TIMETABLE_GENERATION_SLOTS=2)
+    def test_claims_respect_priority_slots_and_overlap(self):
+        low, _ = self.enqueue('CSE')
+        high, _ = self.enqueue('ECE', priority=3)
+        whole, _ = self.enqueue(academic_year='2025-26')
+        blocked, _ = self.enqueue('CSE', academic_year='2025-26')
+
+        self.assertEqual(claim_next_generation(), high.generation_id)
+        self.assertEqual(claim_next_generation(), low.generation_id)
+        # Both slots are busy
+        self.assertIsNone(claim_next_generation())
+
+        TimetableGeneration.objects.filter(generation_id=high.generation_id).update(status='completed')
+        self.assertEqual(claim_next_generation(), whole.generation_id)
+        TimetableGeneration.objects.filter(generation_id=low.generation_id).update(status='completed')
+        # The whole-institution run of 2025-26 also publishes CSE's rows
+        self.assertIsNone(claim_next_generation())
+        TimetableGeneration.objects.filter(generation_id=whole.generation_id).update(status='completed')
+        self.assertEqual(claim_next_generation(), blocked.generation_id)
+
+    def test_cancellation(self):
+        waiting, _ = self.enqueue('CSE')
+        running, _ = self.enqueue('ECE')
+        TimetableGeneration.objects.filter(generation_id=running.generation_id).update(status='in_progress')
+
+        self.assertTrue(cancel_generation(waiting.generation_id))
+        self.assertTrue(cancel_generation(running.generation_id))
+        waiting.refresh_from_db()
+        running.refresh_from_db()
+        self.assertEqual(waiting.status, 'cancelled')
+        self.assertEqual(running.status, 'in_progress')
+        self.assertTrue(CancellationCheck(running.generation_id)())
+        self.assertIsNone(claim_next_generation())
+        self.assertFalse(cancel_generation(waiting.generation_id))
+
+    def test_cancelled_run_stops_without_a_result(self):
+        scheduler = make_scheduler(generations=50, cancel_check=lambda: True)
+        best, stats = scheduler.generate_timetable(problem=scheduler.problem_data())
+        self.assertIsNone(best)
+        self.assertEqual(stats['stop_reason'], 'cancelled')
+        self.assertEqual(stats['total_generations'], 1)
+
+    @override_settings(TIMETABLE_GENERATION_SLOTS=2)
+    def test_generations_abandoned_by_their_worker_are_failed(self):
+        abandoned, _ = self.enqueue('CSE')
+        alive, _ = self.enqueue('ECE')
+        self.assertEqual(claim_next_generation(), abandoned.generation_id)
+        self.assertEqual(claim_next_generation(), alive.generation_id)
+        stale = timezone.now() - timedelta(seconds=LEASE_SECONDS + 1)
+        TimetableGeneration.objects.filter(status='in_progress').update(heartbeat_at=stale)
+        renew_leases([alive.generation_id])
+
+        self.assertEqual(fail_abandoned_generations(), 1)
+        abandoned.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual(abandoned.status, 'failed')
+        self.assertTrue(abandoned.cancel_requested)
+        self.assertEqual(alive.status, 'in_progress')
+        # Its academic year and department can be queued and claimed again
+        _, created = self.enqueue('CSE')
+        self.assertTrue(created)
+        self.assertIsNotNone(claim_next_generation())
+
+
+class PublishTimetableTests(TestCase):
+    academic_year = '2024-25'
+
+    def setUp(self):
+        institution = SyntheticInstitution(class_sections=4, seed=1)
+        institution.save()
+        self.scheduler = GeneticAlgorithmScheduler(population_size=20, generations=40, local_search=True,
+                                                   seeding_ratio=0.5, seed=3)
+        self.best, _ = self.scheduler.generate_timetable(problem=institution.problem())
+        self.assertEqual(self.best.conflict_count, 0)
+
+    def publish(self, chromosome):
+        return publish_timetable(self.scheduler, chromosome, self.academic_year)
+
+    def stored_row(self, chromosome, index):
+        class_code, day, slot = chromosome.gene(index)[[COL_CLASS, COL_DAY, COL_SLOT]].tolist()
+        enc = self.scheduler.encoding
+        return Timetable.objects.get(class_section_id=enc.classes[class_code], day=enc.days[day],
+                                     slot_number=slot, academic_year=self.academic_year)
+
+    def substitute(self, row):
+        return Substitution.objects.create(original_timetable=row, substitute_staff_id=row.staff_id,
+                                           reason='Leave', date_of_substitution=date(2024, 7, 1))
+
+    def free_value(self, genes, column, values, day, slot):
+        busy = set(genes[(genes[:, COL_DAY] == day) & (genes[:, COL_SLOT] == slot), column].tolist())
+        return next(value for value in values if value not in busy)
+
+    def test_republishing_the_same_timetable_changes_nothing(self):
+        first = self.publish(self.best)
+        again = self.publish(self.best)
+        self.assertEqual(first['created'], len(self.best))
+        self.assertEqual(first['rows'], len(self.best))
+        self.assertIsNotNone(first['rows_per_second'])
+        self.assertEqual((again['created'], again['updated'], again['deleted']), (0, 0, 0))
+        self.assertEqual(again['unchanged'], len(self.best))
+        self.assertEqual(Timetable.objects.count(), len(self.best))
+
+    def test_substitutions_survive_room_moves_only(self):
+        self.publish(self.best)
+        genes = self.best.genes
+        kept_index, room_index, staff_index, moved_index = 0, 1, 2, 3
+        substitutions = {index: self.substitute(self.stored_row(self.best, index))
+                         for index in (kept_index, room_index, staff_index, moved_index)}
+
+        changed = self.best.copy()
+        enc = self.scheduler.encoding
+        _, day, slot, _, staff, room, _ = genes[room_index].tolist()
+        changed.update_gene(room_index, day, slot, staff,
+                            self.free_value(genes, COL_ROOM, range(len(enc.rooms)), day, slot))
+        _, day, slot, _, staff, room, _ = genes[staff_index].tolist()
+        changed.update_gene(staff_index, day, slot,
+                            self.free_value(genes, COL_STAFF, range(len(enc.staff)), day, slot), room)
+        class_code, day, slot, _, staff, room, _ = genes[moved_index].tolist()
+        free_slot = next(
+            (new_day, new_slot) for new_day in range(5) for new_slot in self.scheduler.time_slots
+            if not ((genes[:, COL_DAY] == new_day) & (genes[:, COL_SLOT] == new_slot) & (
+                (genes[:, COL_CLASS] == class_code) | (genes[:, COL_STAFF] == staff)
+                | (genes[:, COL_ROOM] == room))).any()
+        )
+        changed.update_gene(moved_index, *free_slot, staff, room)
+
+        stats = self.publish(changed)
+        self.assertEqual((stats['created'], stats['updated'], stats['deleted']), (1, 2, 1))
+        self.assertEqual(stats['substitutions_dropped'], 2)
+        surviving = set(Substitution.objects.values_list('substitution_id', flat=True))
+        self.assertEqual(surviving, {substitutions[kept_index].substitution_id,
+                                     substitutions[room_index].substitution_id})
+        self.assertEqual(Timetable.objects.count(), len(self.best))
+
+
+class FitnessCacheTests(SimpleTestCase):
+    def fresh_fitness(self, scheduler, chromosome):
+        clone = chromosome.copy()
+        clone.fitness_valid = False
+        scheduler.fitness_evaluator.evaluate([clone])
+        return clone.fitness_score, clone.conflict_count
+
+    def test_cached_scores_match_fresh_evaluation_after_mutation(self):
+        scheduler = make_scheduler(mutation_rate=1.0)
+        population = scheduler.create_initial_population()
+        scheduler.evaluate_population(population)
+        # Unscored copies of scored chromosomes, and mutants of them
+        copies = [chromosome.copy() for chromosome in population]
+        for chromosome in copies:
+            chromosome.fitness_valid = False
+        mutants = [scheduler.mutate(chromosome) for chromosome in copies]
+        for chromosome in mutants:
+            chromosome.fitness_valid = False
+        scheduler.take_evaluation_counts()
+
+        scheduler.evaluate_population(copies + mutants)
+        self.assertGreaterEqual(scheduler.take_evaluation_counts()['cache_hits'], len(copies))
+        for chromosome in copies + mutants:
+            self.assertEqual((chromosome.fitness_score, chromosome.conflict_count),
+                             self.fresh_fitness(scheduler, chromosome))
+
+    def test_loading_a_problem_forgets_cached_scores(self):
+        institution = SyntheticInstitution(class_sections=6, seed=1)
+        scheduler = make_scheduler()
+        population = scheduler.create_initial_population()
+        scheduler.evaluate_population(population)
+        chromosome = population[0].copy()
+
+        # Same genes, scored against a published timetable they mostly differ from
+        problem = institution.problem()
+        problem['reference_rows'] = reference_rows(scheduler, population[1])
+        scheduler.load_problem(problem)
+        self.assertEqual(len(scheduler.fitness_cache), 0)
+        chromosome.fitness_valid = False
+        scheduler.evaluate_population([chromosome])
+        self.assertGreater(chromosome.penalties['changes'], 0)
+        self.assertEqual((chromosome.fitness_score, chromosome.conflict_count),
+                         self.fresh_fitness(scheduler, chromosome))
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_equal_blocks_do_not_cancel_out(self):
+        lesson = np.array([[0, 1, 2, 3, 4, 5, 0]])
+        empty = lesson[:0]
+        other = lesson + 1
+        with_empty_classes = ArrayChromosome([lesson, empty, empty])
+        with_repeated_blocks = ArrayChromosome([lesson, other, other])
+        self.assertNotEqual(with_empty_classes.fingerprint(), with_repeated_blocks.fingerprint())
+        self.assertNotEqual(ArrayChromosome([lesson, empty]).fingerprint(),
+                            ArrayChromosome([empty, lesson]).fingerprint())
+
+
+class GenerationApiTests(TestCase):
+    def setUp(self):
+        self.generation, _ = enqueue_generation('2024-25', 1, 'CSE', 'tester', {'generations': 2})
+
+    def test_cancel_requires_a_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        url = reverse('api_generation_cancel', args=[self.generation.generation_id])
+        self.assertEqual(client.post(url).status_code, 403)
+
+        token = 'a' * 32
+        client.cookies['csrftoken'] = token
+        response = client.post(url, headers={'X-CSRFToken': token})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['success'])
+        self.generation.refresh_from_db()
+        self.assertEqual(self.generation.status, 'cancelled')
+
+
+class GenerateFormTests(TestCase):
+    form = {'academic_year': '2024-25', 'semester': '1', 'department': 'all'}
+
+    def submit(self, **fields):
+        response = self.client.post(reverse('timetable_generate'), {**self.form, **fields},
+                                    headers={'X-Requested-With': 'XMLHttpRequest'})
+        self.assertTrue(response.json()['success'])
+        return TimetableGeneration.objects.get(generation_id=response.json()['generation_id'])
+
+    def test_all_departments_are_solved_as_one_problem_by_default(self):
+        generation = self.submit()
+        self.assertIsNone(generation.department)
+        self.assertFalse(scheduler_settings(generation)['decompose_by_department'])
+
+    def test_department_decomposition_is_requested_by_the_form(self):
+        generation = self.submit(decompose_by_department='on')
+        self.assertTrue(scheduler_settings(generation)['decompose_by_department'])
+
+
+class DepartmentDecompositionTests(SimpleTestCase):
+    def setUp(self):
+        self.institution = SyntheticInstitution(class_sections=8, departments=2, seed=2)
+
+    def test_departments_are_merged_into_one_timetable(self):
+        scheduler = GeneticAlgorithmScheduler(population_size=12, generations=10, decompose_by_department=True,
+                                              department_workers=2, seed=11)
+        best, stats = scheduler.generate_timetable(problem=self.institution.problem())
+
+        self.assertEqual(set(stats['departments']), {class_info['department'] for class_info
+                                                     in scheduler.class_data.values()})
+        # Every class of every department is in the merged chromosome
+        self.assertEqual(set(np.unique(best.genes[:, COL_CLASS]).tolist()), set(range(len(scheduler.class_data))))
+        # Reported fitness is the merged chromosome's own, not a mean of the departments'
+        fresh = best.copy()
+        fresh.fitness_valid = False
+        scheduler.fitness_evaluator.evaluate([fresh])
+        self.assertEqual(stats['best_fitness'], fresh.fitness_score)
+        self.assertEqual(stats['generation_stats'][-1]['best_fitness'], fresh.fitness_score)
+        self.assertEqual(stats['generation_stats'][-1]['conflicts'], fresh.conflict_count)
+
+    def test_statistics_match_those_of_a_whole_run(self):
+        problem = self.institution.problem()
+        _, whole = GeneticAlgorithmScheduler(population_size=12, generations=3, seed=11).generate_timetable(
+            problem=problem)
+        scheduler = GeneticAlgorithmScheduler(population_size=12, generations=3, decompose_by_department=True,
+                                              department_workers=2, seed=11)
+        _, stats = scheduler.generate_timetable(problem=problem)
+
+        for entry in stats['generation_stats']:
+            self.assertEqual(set(entry), set(whole['generation_stats'][0]))
+        reasons = {result['stop_reason'] for result in stats['departments'].values()}
+        self.assertIn(stats['stop_reason'], reasons)
+        self.assertEqual(stats['evaluations'], sum(entry['evaluations'] for entry in stats['generation_stats']))
+
+    def test_time_budget_is_shared_by_department_waves(self):
+        institution = SyntheticInstitution(class_sections=6, departments=3, seed=2)
+        scheduler = GeneticAlgorithmScheduler(population_size=12, generations=100000, decompose_by_department=True,
+                                              department_workers=1, max_seconds=3.0, seed=11)
+        started = monotonic()
+        _, stats = scheduler.generate_timetable(problem=institution.problem())
+
+        self.assertEqual(stats['stop_reason'], 'time_budget')
+        # Three departments one after another, each with a third of the budget
+        self.assertLess(monotonic() - started, 3.0 + 2.0)
+
+    def test_cancel_stops_running_departments(self):
+        cancel_at = monotonic() + 1.0
+        scheduler = GeneticAlgorithmScheduler(population_size=12, generations=100000, decompose_by_department=True,
+                                              department_workers=2, seed=11,
+                                              cancel_check=lambda: monotonic() >= cancel_at)
+        best, stats = scheduler.generate_timetable(problem=self.institution.problem())
+        self.assertIsNone(best)
+        self.assertEqual(stats['stop_reason'], 'cancelled')
+        self.assertLess(monotonic() - cancel_at, 5.0)
+
+
+class FitnessEvaluationTests(SimpleTestCase):
+    def setUp(self):
+        self.scheduler = make_scheduler(population_size=16)
+        self.population = self.scheduler.create_initial_population()
+        # Scored against a published timetable, so the minimal-change penalty counts too
+        problem = self.scheduler.problem_data()
+        problem['reference_rows'] = reference_rows(self.scheduler, self.population.pop())
+        self.scheduler.load_problem(problem)
+
+    def assert_scores_match(self, chromosome, expected):
+        self.assertAlmostEqual(chromosome.fitness_score, expected.fitness_score, places=9)
+        self.assertEqual(chromosome.conflict_count, expected.conflict_count)
+        for penalty in ('workload', 'distribution', 'changes'):
+            self.assertEqual(chromosome.penalties[penalty], expected.penalties[penalty])
+
+    def test_vectorised_evaluation_matches_calculate_fitness(self):
+        vectorised = [chromosome.copy() for chromosome in self.population]
+        self.scheduler.fitness_evaluator.evaluate(vectorised)
+        for chromosome, scored in zip(self.population, vectorised):
+            self.scheduler.calculate_fitness(chromosome)
+            self.assert_scores_match(scored, chromosome)
+        self.assertTrue(any(chromosome.penalties['changes'] for chromosome in vectorised))
+
+    def test_state_moves_match_full_reevaluation(self):
+        scheduler = self.scheduler
+        evaluator, rng = scheduler.fitness_evaluator, scheduler.rng
+        parent = self.population[0]
+        parent_genes = parent.genes.copy()
+        state = evaluator.build_state(parent)
+        state.apply_to(parent)
+
+        chromosome = parent
+        for _ in range(200):
+            # Copies share their parent's blocks until they move; states are copied first
+            chromosome = chromosome.copy()
+            state = state.copy()
+            index = int(rng.integers(len(chromosome)))
+            _, day, slot, _, staff, room, _ = chromosome.gene(index).tolist()
+            day, slot, staff, room = [
+                (day, slot, int(rng.integers(evaluator.num_staff)), room),
+                (day, slot, staff, int(rng.integers(evaluator.num_rooms))),
+                (int(rng.integers(evaluator.num_days)), int(rng.integers(1, evaluator.num_slots)), staff, room),
+            ][rng.integers(3)]
+            state.move_gene(chromosome, index, day, slot, staff, room)
+            state.apply_to(chromosome)
+            expected = chromosome.copy()
+            expected.fitness_valid = False
+            scheduler.calculate_fitness(expected)
+            self.assert_scores_match(chromosome, expected)
+
+        np.testing.assert_array_equal(np.concatenate(parent.blocks), parent_genes)
+
+    def test_mutated_children_are_rescored_with_the_batch(self):
+        scheduler = self.scheduler
+        parent = self.population[0]
+        scheduler.evaluate_population([parent])
+        scheduler.fitness_evaluator.build_state(parent).apply_to(parent)
+        parent_genes = parent.genes.copy()
+
+        scheduler.mutation_rate = 1.0
+        child = scheduler.mutate(parent)
+        self.assertFalse(child.fitness_valid)
+        self.assertIsNone(child.fitness_state)
+        # The parent keeps its genes, score and counters
+        np.testing.assert_array_equal(np.concatenate(parent.blocks), parent_genes)
+        self.assertTrue(parent.fitness_valid)
+        self.assertIsNotNone(parent.fitness_state)
+
+        scheduler.evaluate_population([child])
+        expected = child.copy()
+        expected.fitness_valid = False
+        scheduler.calculate_fitness(expected)
+        self.assert_scores_match(child, expected)
+
+
+class SampleDataEvaluationTests(TestCase):
+    """Vectorised evaluation of the hand-written sample institution, loaded from the database"""
+
+    @classmethod
+    def setUpTestData(cls):
+        path = os.path.join(settings.BASE_DIR, 'timetable_system', 'sample_data.py')
+        spec = importlib.util.spec_from_file_location('sample_data', path)
+        sample_data = importlib.util.module_from_spec(spec)
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec.loader.exec_module(sample_data)
+            for create in (sample_data.create_sample_staff, sample_data.create_sample_subjects,
+                           sample_data.create_sample_classes, sample_data.create_sample_rooms,
+                           sample_data.create_sample_electives):
+                create()
+
+    def setUp(self):
+        self.scheduler = GeneticAlgorithmScheduler(population_size=16, seed=5)
+        self.scheduler.load_data()
+        self.population = self.scheduler.create_initial_population()
+
+    def assert_matches_calculate_fitness(self):
+        vectorised = [chromosome.copy() for chromosome in self.population]
+        self.scheduler.fitness_evaluator.evaluate(vectorised)
+        for chromosome, scored in zip(self.population, vectorised):
+            self.scheduler.calculate_fitness(chromosome)
+            self.assertAlmostEqual(scored.fitness_score, chromosome.fitness_score, places=9)
+            self.assertEqual(scored.conflict_count, chromosome.conflict_count)
+            for penalty in ('workload', 'distribution', 'changes'):
+                self.assertEqual(scored.penalties[penalty], chromosome.penalties[penalty])
+        self.assertTrue(any(chromosome.conflict_count for chromosome in vectorised))
+
+    def test_sample_institution_is_loaded(self):
+        self.assertTrue(self.scheduler.class_data)
+        self.assertTrue(self.scheduler.elective_data)
+        self.assertTrue(any(class_info['labs'] for class_info in self.scheduler.class_data.values()))
+
+    def test_vectorised_evaluation_matches_calculate_fitness(self):
+        self.assert_matches_calculate_fitness()
+
+    def test_sparse_histograms_match_calculate_fitness(self):
+        # Large institutions histogram occupied keys only
+        with mock.patch('timetable.fitness_evaluator.DENSE_KEY_LIMIT', 0):
+            self.assert_matches_calculate_fitness()
+
+
+class ReproducibilityTests(SimpleTestCase):
+    settings = {'population_size': 16, 'generations': 12, 'seed': 21, 'local_search': True, 'seeding_ratio': 0.25}
+
+    def setUp(self):
+        self.problem = SyntheticInstitution(class_sections=6, seed=1).problem()
+
+    def run_scheduler(self, **settings):
+        scheduler = GeneticAlgorithmScheduler(**{**self.settings, **settings})
+        best, stats = scheduler.generate_timetable(problem=self.problem)
+        return best.genes.copy(), stats['fitness_history'], stats['best_fitness']
+
+    def assert_same_run(self, run, other):
+        np.testing.assert_array_equal(run[0], other[0])
+        self.assertEqual(run[1], other[1])
+        self.assertEqual(run[2], other[2])
+
+    def test_parallel_evaluation_matches_serial(self):
+        self.assert_same_run(self.run_scheduler(), self.run_scheduler(workers=2))
+
+    def test_phase_profiling_does_not_change_the_run(self):
+        self.assert_same_run(self.run_scheduler(), self.run_scheduler(profile_phases=True))
+
+    def test_island_runs_replay_from_their_seed(self):
+        islands = {'islands': 2, 'migration_interval': 4}
+        first = self.run_scheduler(**islands)
+        self.assert_same_run(first, self.run_scheduler(**islands))
+        self.assert_same_run(first, self.run_scheduler(**islands, workers=2))
+
+
+class CheckpointTests(SimpleTestCase):
+    settings = {'population_size': 12, 'seed': 5, 'checkpoint_interval': 4}
+
+    def setUp(self):
+        self.problem = SyntheticInstitution(class_sections=6, seed=1).problem()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def run_scheduler(self, generations, path, resume=False):
+        scheduler = GeneticAlgorithmScheduler(**self.settings, generations=generations, checkpoint_path=path)
+        best, stats = scheduler.generate_timetable(resume_from=path if resume else None, problem=self.problem)
+        return best, stats
+
+    def test_resumed_run_matches_an_uninterrupted_one(self):
+        best, stats = self.run_scheduler(12, os.path.join(self.directory, 'full.npz'))
+
+        interrupted = os.path.join(self.directory, 'interrupted.npz')
+        self.run_scheduler(5, interrupted)
+        resumed_best, resumed_stats = self.run_scheduler(12, interrupted, resume=True)
+
+        np.testing.assert_array_equal(resumed_best.genes, best.genes)
+        self.assertEqual(resumed_stats['fitness_history'], stats['fitness_history'])
+        self.assertEqual(resumed_stats['total_generations'], 12)
+
+    def test_checkpoints_append_only_new_statistics(self):
+        path = os.path.join(self.directory, 'run.npz')
+        sizes = []
+        original = GeneticAlgorithmScheduler.record_generation
+
+        def record_generation(scheduler, *args):
+            original(scheduler, *args)
+            if os.path.exists(path):
+                with np.load(path) as archive:
+                    sizes.append(len(str(archive['metadata'])))
+
+        with mock.patch.object(GeneticAlgorithmScheduler, 'record_generation', record_generation):
+            _, stats = self.run_scheduler(16, path)
+        # The archive's metadata does not grow with the run (beyond a few more digits)
+        self.assertGreater(len(sizes), 1)
+        self.assertLess(max(sizes) - min(sizes), 16)
+        with open(path + '.stats.jsonl') as stats_file:
+            self.assertEqual([json.loads(line) for line in stats_file], stats['generation_stats'])
+
+    def test_statistics_past_the_last_checkpoint_are_ignored(self):
+        best, stats = self.run_scheduler(12, os.path.join(self.directory, 'full.npz'))
+
+        interrupted = os.path.join(self.directory, 'interrupted.npz')
+        self.run_scheduler(8, interrupted)
+        # Crashed after appending statistics, before replacing the archive
+        with open(interrupted + '.stats.jsonl', 'a') as stats_file:
+            stats_file.write(json.dumps({'generation': 8}) + '\n{"generation": 9')
+        resumed_best, resumed_stats = self.run_scheduler(12, interrupted, resume=True)
+        np.testing.assert_array_equal(resumed_best.genes, best.genes)
+        self.assertEqual(resumed_stats['fitness_history'], stats['fitness_history'])
+        with open(interrupted + '.stats.jsonl') as stats_file:
+            self.assertEqual([json.loads(line)['generation'] for line in stats_file], list(range(12)))
+
+    def test_checkpoint_of_other_data_is_refused(self):
+        path = os.path.join(self.directory, 'run.npz')
+        self.run_scheduler(4, path)
+        self.problem = SyntheticInstitution(class_sections=7, seed=1).problem()
+        with self.assertRaises(ValueError):
+            self.run_scheduler(8, path, resume=True)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class GenerationEventsTests(TestCase):
+    def setUp(self):
+        self.generation = TimetableGeneration.objects.create(academic_year='2024-25', semester=1,
+                                                             status='in_progress', generated_by='tester')
+        self.url = reverse('api_generation_events', args=[self.generation.generation_id])
+
+    async def read_stream(self, **headers):
+        response = await AsyncClient().get(self.url, headers=headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        return [message for message in body.split('\n\n') if message]
+
+    def test_message_format(self):
+        self.assertEqual(_sse('progress', {'progress': 12.5}, 3),
+                         'id: 3\nevent: progress\ndata: {"progress": 12.5}\n\n')
+        self.assertEqual(_sse('status', {'status': 'failed'}), 'event: status\ndata: {"status": "failed"}\n\n')
+
+    async def test_stream_ends_with_the_status_event_and_resumes(self):
+        channel = ProgressChannel(self.generation.generation_id)
+        channel.open()
+        channel.publish('progress', {'progress': 50.0})
+        channel.publish('progress', {'progress': 100.0})
+        channel.publish('status', {'status': 'completed'})
+
+        messages = await self.read_stream()
+        self.assertEqual(messages, [
+            'id: 1\nevent: progress\ndata: {"progress": 50.0}',
+            'id: 2\nevent: progress\ndata: {"progress": 100.0}',
+            'id: 3\nevent: status\ndata: {"status": "completed"}',
+        ])
+        self.assertEqual(await self.read_stream(**{'Last-Event-ID': '2'}), messages[2:])
+
+    async def test_finished_generation_without_events_reports_its_status(self):
+        await TimetableGeneration.objects.filter(generation_id=self.generation.generation_id).aupdate(
+            status='failed', error_message='Solver process crashed')
+        messages = await self.read_stream()
+        self.assertEqual(len(messages), 1)
+        event, data = messages[0].split('\n')
+        self.assertEqual(event, 'event: status')
+        status = json.loads(data.removeprefix('data: '))
+        self.assertEqual((status['status'], status['error_message']), ('failed', 'Solver process crashed'))
+
+    def test_wsgi_stream_sends_each_event_as_it_is_published(self):
+        channel = ProgressChannel(self.generation.generation_id)
+        channel.open()
+        channel.publish('progress', {'progress': 50.0})
+
+        response = Client().get(self.url)
+        self.assertFalse(response.is_async)
+        chunks = iter(response.streaming_content)
+        # Delivered while the generation is still running, not buffered until it ends
+        self.assertEqual(next(chunks).decode(), 'id: 1\nevent: progress\ndata: {"progress": 50.0}\n\n')
+        self.assertEqual(next(chunks).decode(), ': keep-alive\n\n')
+
+        channel.publish('status', {'status': 'completed'})
+        self.assertEqual(b''.join(chunks).decode(), 'id: 2\nevent: status\ndata: {"status": "completed"}\n\n')
+
+    async def test_unknown_generation(self):
+        response = await AsyncClient().get(reverse('api_generation_events', args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+
+class SampleDataScriptTests(SimpleTestCase):
+    """Runs timetable_system/sample_data.py as a script, against a scratch database"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.database = os.path.join(directory.name, 'db.sqlite3')
+        with open(os.path.join(directory.name, 'scratch_settings.py'), 'w') as settings_file:
+            settings_file.write('from timetable_project.settings import *\n'
+                                f'DATABASES = {{"default": {{"ENGINE": "django.db.backends.sqlite3", '
+                                f'"NAME": {self.database!r}}}}}\n')
+        self.environment = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'scratch_settings',
+                            'PYTHONPATH': os.pathsep.join([str(settings.BASE_DIR), directory.name])}
+        self.run_command('-m', 'django', 'migrate', '--run-syncdb', '--verbosity', '0', cwd=settings.BASE_DIR)
+
+    def run_command(self, *args, cwd=None):
+        # By default from the script's own directory, next to the stub project it must not pick up
+        result = subprocess.run([sys.executable, *args], cwd=cwd or os.path.join(settings.BASE_DIR, 'timetable_system'),
+                                env=self.environment, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def count(self, table):
+        with sqlite3.connect(self.database) as connection:
+            return connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+    def test_synthetic_institution(self):
+        output = self.run_command('sample_data.py', '--sections', '10', '--seed', '3')
+        self.assertIn('Synthetic institution (seed 3) inserted', output)
+        self.assertEqual(self.count('class_sections'), 10)
+        self.assertGreater(self.count('staff'), 0)
+
+    def test_sample_data(self):
+        self.run_command('sample_data.py')
+        self.assertGreater(self.count('class_sections'), 0)
+        self.assertGreater(self.count('electives'), 0)
@@ -41,4 +41,7 @@ urlpatterns = [
     path('api/conflict-resolution/', views.api_conflict_resolution, name='api_conflict_resolution'),
     path('api/timetable-export/', views.api_timetable_export, name='api_timetable_export'),
     path('api/statistics/', views.api_statistics, name='api_statistics'),
+    path('api/generations/<int:generation_id>/status/', views.api_generation_status, name='api_generation_status'),
+    path('api/generations/<int:generation_id>/events/', views.api_generation_events, name='api_generation_events'),
+    path('api/generations/<int:generation_id>/cancel/', views.api_generation_cancel, name='api_generation_cancel'),
 ]
\ No newline at end of file
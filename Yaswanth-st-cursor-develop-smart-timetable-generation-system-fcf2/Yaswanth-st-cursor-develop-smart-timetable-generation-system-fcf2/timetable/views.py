@@ -4,7 +4,10 @@ Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, HttpResponse
+from django.urls import reverse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.handlers.asgi import ASGIRequest
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
@@ -13,18 +16,26 @@ from django.core.paginator import Paginator
 from datetime import datetime, date, time, timedelta
 import json
 import logging
-from typing import Dict, List
+import asyncio
+from time import monotonic, sleep
+from typing import Dict, List, Optional
 
 from .models import (
     Staff, Subject, ClassSection, Room, Timetable, 
     Elective, Substitution, TimetableGeneration
 )
-from .genetic_algorithm import GeneticAlgorithmScheduler
+from .generation_jobs import cancel_generation, enqueue_generation
+from .progress_channel import aread_events, read_events
 from .substitution_engine import SubstitutionEngine
 from .mongodb import mongo_collections
 
 logger = logging.getLogger(__name__)
 
+# Seconds between checks for new events of a streamed generation
+EVENT_POLL_INTERVAL = 0.5
+# Seconds between keep-alive comments (and database status checks) of an event stream
+EVENT_HEARTBEAT_INTERVAL = 15.0
+
 # Home and Dashboard Views
 def index(request):
     """Main dashboard view"""
@@ -294,83 +305,68 @@ def timetable_generate(request):
             academic_year = request.POST.get('academic_year')
             semester = int(request.POST.get('semester'))
             department = request.POST.get('department')
+            # Optional wall-clock budget for the run
+            max_seconds = request.POST.get('max_seconds')
+            max_seconds = float(max_seconds) if max_seconds else None
+            # Warm start keeps the published timetable wherever the data still allows it
+            warm_start = request.POST.get('warm_start') == 'on'
+            # Whole-institution runs may solve departments in parallel and merge them
+            decompose_by_department = request.POST.get('decompose_by_department') == 'on'
+            # A seed recorded with an earlier generation reproduces it exactly
+            seed = request.POST.get('seed')
+            seed = int(seed) if seed else None
+            priority = int(request.POST.get('priority') or 0)
             
-            # Create generation record
-            generation = TimetableGeneration.objects.create(
+            # Solved by the generation worker (manage.py run_generation_worker)
+            generation, created = enqueue_generation(
                 academic_year=academic_year,
                 semester=semester,
                 department=department if department != 'all' else None,
-                status='in_progress',
                 generated_by=request.user.username if request.user.is_authenticated else 'anonymous',
-                started_at=datetime.now()
-            )
-            
-            # Start GA generation
-            scheduler = GeneticAlgorithmScheduler(
-                population_size=100,
-                generations=300,
-                mutation_rate=0.15,
-                crossover_rate=0.8
+                settings={
+                    'population_size': 100,
+                    'generations': 300,
+                    'mutation_rate': 0.15,
+                    'crossover_rate': 0.8,
+                    'max_seconds': max_seconds,
+                    'stagnation_generations': 100,
+                    'warm_start': warm_start,
+                    'decompose_by_department': decompose_by_department,
+                    'seed': seed,
+                    # Cheap enough to leave on; the summary is kept with the generation
+                    'profile_phases': True,
+                },
+                priority=priority,
             )
+            status_url = reverse('api_generation_status', args=[generation.generation_id])
             
-            best_chromosome, stats = scheduler.generate_timetable()
-            
-            # Save timetable to database
-            if best_chromosome:
-                with transaction.atomic():
-                    # Clear existing timetables for this academic year
-                    if department and department != 'all':
-                        Timetable.objects.filter(
-                            academic_year=academic_year,
-                            class_section__department=department
-                        ).delete()
-                    else:
-                        Timetable.objects.filter(academic_year=academic_year).delete()
-                    
-                    # Save new timetable
-                    for gene in best_chromosome.genes:
-                        slot_times = scheduler.slot_times
-                        start_time, end_time = slot_times[gene.slot]
-                        
-                        Timetable.objects.create(
-                            class_section=ClassSection.objects.get(class_id=gene.class_section_id),
-                            day=gene.day,
-                            slot_number=gene.slot,
-                            start_time=start_time,
-                            end_time=end_time,
-                            subject=Subject.objects.get(subject_code=gene.subject_code),
-                            staff=Staff.objects.get(staff_id=gene.staff_id),
-                            room=Room.objects.get(room_id=gene.room_id),
-                            is_lab=gene.is_lab,
-                            is_elective=gene.is_elective,
-                            academic_year=academic_year,
-                            week_number=1
-                        )
-                
-                # Update generation record
-                generation.status = 'completed'
-                generation.fitness_score = stats['best_fitness']
-                generation.conflicts_resolved = len(stats['conflicts'])
-                generation.total_slots_filled = len(best_chromosome.genes)
-                generation.completed_at = datetime.now()
-                generation.save()
-                
-                messages.success(request, f'Timetable generated successfully! Fitness Score: {stats["best_fitness"]:.2f}')
-                return redirect('timetable_view', academic_year=academic_year)
-            
+            if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'success': True,
+                    'generation_id': generation.generation_id,
+                    'queued': created,
+                    'status_url': status_url,
+                    'events_url': reverse('api_generation_events', args=[generation.generation_id]),
+                    'cancel_url': reverse('api_generation_cancel', args=[generation.generation_id]),
+                })
+            if created:
+                messages.info(request, f'Timetable generation {generation.generation_id} queued')
             else:
-                generation.status = 'failed'
-                generation.error_message = 'Failed to generate valid timetable'
-                generation.save()
-                messages.error(request, 'Failed to generate timetable')
+                messages.info(request, f'Timetable generation {generation.generation_id} is already queued '
+                                       f'for this academic year and department')
+            return redirect(f"{reverse('timetable_generate')}?generation={generation.generation_id}")
                 
         except Exception as e:
             logger.error(f"Error generating timetable: {e}")
+            if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+                return JsonResponse({'success': False, 'error': str(e)})
             messages.error(request, f'Error generating timetable: {str(e)}')
     
     context = {
         'departments': Staff.DEPARTMENT_CHOICES,
         'current_year': datetime.now().year,
+        # Set after a queued submission so the page can follow the job
+        'generation_id': request.GET.get('generation'),
     }
     return render(request, 'timetable/generate.html', context)
 
@@ -588,6 +584,113 @@ def api_timetable_export(request):
     
     return JsonResponse({'success': False, 'error': 'Method not allowed'})
 
+def api_generation_status(request, generation_id):
+    """API endpoint reporting the state of a generation job; cheap enough to poll"""
+    generation = TimetableGeneration.objects.filter(generation_id=generation_id).values(
+        'generation_id', 'academic_year', 'department', 'status', 'priority', 'cancel_requested',
+        'progress', 'current_generation',
+        'fitness_score', 'conflicts_resolved', 'total_slots_filled', 'error_message',
+        'started_at', 'completed_at',
+    ).first()
+    if generation is None:
+        return JsonResponse({'success': False, 'error': 'Generation not found'}, status=404)
+    return JsonResponse({'success': True, 'data': generation})
+
+def _sse(event: str, data: Dict, event_id: Optional[int] = None) -> str:
+    """One Server-Sent Events message"""
+    message = f"id: {event_id}\n" if event_id is not None else ''
+    return message + f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+# Fields of the status event sent for a generation that finished without one
+GENERATION_STATUS_FIELDS = (
+    'status', 'progress', 'fitness_score', 'conflicts_resolved', 'total_slots_filled',
+    'error_message', 'academic_year', 'started_at', 'completed_at',
+)
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+def _generation_event_stream(generation_id: int, after: int):
+    """Live progress events of a generation until its final status event (WSGI)"""
+    last_check = None
+    while True:
+        for sequence, event in read_events(generation_id, after):
+            after = sequence
+            yield _sse(event['event'], event['data'], sequence)
+            if event['event'] == 'status':
+                return
+        
+        if last_check is None or monotonic() - last_check >= EVENT_HEARTBEAT_INTERVAL:
+            last_check = monotonic()
+            # Covers generations that finished before their events could be read
+            # (expired, or a worker that died without announcing the end)
+            generation = TimetableGeneration.objects.filter(generation_id=generation_id).values(
+                *GENERATION_STATUS_FIELDS).first()
+            if generation is None or generation['status'] in FINISHED_STATUSES:
+                if not read_events(generation_id, after):
+                    if generation is not None:
+                        yield _sse('status', generation)
+                    return
+                # Drain what is left, then look again
+                last_check = None
+                continue
+            yield ': keep-alive\n\n'
+        
+        sleep(EVENT_POLL_INTERVAL)
+
+async def _ageneration_event_stream(generation_id: int, after: int):
+    """_generation_event_stream for ASGI servers, which hold no thread per open stream"""
+    last_check = None
+    while True:
+        for sequence, event in await aread_events(generation_id, after):
+            after = sequence
+            yield _sse(event['event'], event['data'], sequence)
+            if event['event'] == 'status':
+                return
+        
+        if last_check is None or monotonic() - last_check >= EVENT_HEARTBEAT_INTERVAL:
+            last_check = monotonic()
+            generation = await TimetableGeneration.objects.filter(generation_id=generation_id).values(
+                *GENERATION_STATUS_FIELDS).afirst()
+            if generation is None or generation['status'] in FINISHED_STATUSES:
+                if not await aread_events(generation_id, after):
+                    if generation is not None:
+                        yield _sse('status', generation)
+                    return
+                last_check = None
+                continue
+            yield ': keep-alive\n\n'
+        
+        await asyncio.sleep(EVENT_POLL_INTERVAL)
+
+def api_generation_events(request, generation_id):
+    """Server-Sent Events stream of a generation's progress; one long-lived connection instead of polling"""
+    if not TimetableGeneration.objects.filter(generation_id=generation_id).exists():
+        return JsonResponse({'success': False, 'error': 'Generation not found'}, status=404)
+    # A reconnecting EventSource resumes after the last event it received
+    try:
+        after = int(request.headers.get('Last-Event-ID') or 0)
+    except ValueError:
+        after = 0
+    
+    # WSGI servers (runserver included) send a synchronous stream chunk by chunk
+    # but buffer an asynchronous one until it ends; ASGI servers want the reverse
+    if isinstance(request, ASGIRequest):
+        events = _ageneration_event_stream(generation_id, after)
+    else:
+        events = _generation_event_stream(generation_id, after)
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@require_http_methods(["POST"])
+def api_generation_cancel(request, generation_id):
+    """API endpoint cancelling a queued or running generation job"""
+    if not TimetableGeneration.objects.filter(generation_id=generation_id).exists():
+        return JsonResponse({'success': False, 'error': 'Generation not found'}, status=404)
+    if not cancel_generation(generation_id):
+        return JsonResponse({'success': False, 'error': 'Generation has already finished'})
+    return JsonResponse({'success': True, 'message': 'Cancellation requested'})
+
 def api_statistics(request):
     """API endpoint for dashboard statistics"""
     try:
@@ -0,0 +1,139 @@
+"""
+Warm-Start Seeding from the Published Timetable
+Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from .chromosome import KIND_CORE, KIND_LAB, KIND_ELECTIVE
+
+logger = logging.getLogger(__name__)
+
+# (class_id, day, slot, subject_code, staff_id, room_id, kind)
+ReferenceRow = Tuple[str, str, int, str, str, str, int]
+
+
+def load_reference_rows(academic_year: str, class_ids: Optional[Iterable[str]] = None) -> List[ReferenceRow]:
+    """Current regular (week 1, non-substitute) Timetable rows of an academic year"""
+    from .models import Timetable
+
+    entries = Timetable.objects.filter(academic_year=academic_year, week_number=1, is_substitute=False)
+    if class_ids is not None:
+        entries = entries.filter(class_section__class_id__in=list(class_ids))
+
+    rows = []
+    for class_id, day, slot, subject_code, staff_id, room_id, is_lab, is_elective in entries.values_list(
+            'class_section__class_id', 'day', 'slot_number', 'subject__subject_code',
+            'staff__staff_id', 'room__room_id', 'is_lab', 'is_elective'):
+        kind = KIND_ELECTIVE if is_elective else KIND_LAB if is_lab else KIND_CORE
+        rows.append((class_id, day, slot, subject_code, staff_id, room_id, kind))
+
+    logger.info(f"Loaded {len(rows)} published timetable rows for warm start")
+    return rows
+
+
+def reconcile_reference(scheduler, reference_rows: List[ReferenceRow]) -> List[Tuple[int, ...]]:
+    """
+    Encoded genes that keep as much of the reference timetable as the current
+    data allows. Lessons whose subject is no longer required (or is already
+    fully scheduled), or that fall outside the class week, are dropped.
+    Staff who may no longer teach a lesson and rooms that no longer suit it
+    are replaced. Required hours that are still missing are then placed
+    randomly around the kept lessons.
+    """
+    by_class: Dict[str, List[ReferenceRow]] = {}
+    for row in reference_rows:
+        by_class.setdefault(row[0], []).append(row)
+
+    day_index = scheduler.encoding.day_index
+    rng = scheduler.rng
+    rows = []
+    for class_id, class_info in scheduler.class_data.items():
+        working_days = scheduler.days[:class_info['working_days']]
+        lab_codes = {lab['lab_code'] for lab in class_info['labs']}
+
+        # Slots still required per code (lab sessions are two slots each)
+        needed = Counter()
+        for subject_info in class_info['subjects']:
+            needed[subject_info['subject_code']] += subject_info['hours_per_week']
+        for lab_info in class_info['labs']:
+            needed[lab_info['lab_code']] += 2 * lab_info['sessions_per_week']
+        for elective_id in class_info['electives']:
+            if elective_id in scheduler.elective_data:
+                needed[elective_id] += scheduler.elective_data[elective_id]['hours_per_week']
+
+        kept = Counter()
+        occupied: Set[Tuple[int, int]] = set()
+        kept_rows = []
+        # Both slots of a lab session get the same replacement staff and room
+        replacement_staff, replacement_rooms = {}, {}
+        for _, day, slot, code, staff_id, room_id, _ in sorted(
+                by_class.get(class_id, ()), key=lambda row: (day_index.get(row[1], 0), row[2])):
+            if day not in working_days or not 1 <= slot <= class_info['slots_per_day']:
+                continue
+            if kept[code] >= needed[code] or (day_index[day], slot) in occupied:
+                continue
+
+            is_lab_session = code in lab_codes
+            if code in scheduler.elective_data and code in class_info['electives']:
+                staff_id = scheduler.elective_data[code]['staff']
+                kind = KIND_ELECTIVE
+                rooms = scheduler._suitable_rooms(code, class_info)
+            else:
+                eligible = scheduler._eligible_staff[is_lab_session].get(code, ())
+                if staff_id not in eligible:
+                    if not eligible:
+                        continue
+                    if (code, staff_id) not in replacement_staff:
+                        replacement_staff[code, staff_id] = eligible[rng.integers(len(eligible))]
+                    staff_id = replacement_staff[code, staff_id]
+                if is_lab_session:
+                    kind = KIND_LAB
+                    rooms = scheduler._lab_rooms
+                else:
+                    kind = KIND_LAB if scheduler.subject_data[code]['is_lab'] else KIND_CORE
+                    rooms = scheduler._suitable_rooms(code, class_info)
+            if room_id not in rooms:
+                if not rooms:
+                    continue
+                if not is_lab_session:
+                    room_id = rooms[rng.integers(len(rooms))]
+                else:
+                    if (code, room_id) not in replacement_rooms:
+                        replacement_rooms[code, room_id] = rooms[rng.integers(len(rooms))]
+                    room_id = replacement_rooms[code, room_id]
+
+            kept_rows.append((day, slot, code, staff_id, room_id, kind))
+            kept[code] += 1
+            occupied.add((day_index[day], slot))
+
+        # Lab sessions are kept whole or not at all: a lone slot would stay
+        # next to the full session generated for the rest of the lab's hours
+        kept_rows = _whole_lab_sessions(kept_rows, lab_codes)
+        occupied = {(day_index[day], slot) for day, slot, *_ in kept_rows}
+        rows.extend(scheduler._encode_row(class_id, *row) for row in kept_rows)
+
+        placed = Counter(code for _, _, code, *_ in kept_rows)
+        for code in lab_codes:
+            placed[code] //= 2
+        scheduler._generate_genes_for_class(rows, class_id, class_info, placed=placed, occupied=occupied)
+
+    return rows
+
+
+def _whole_lab_sessions(rows: List[Tuple], lab_codes: Set[str]) -> List[Tuple]:
+    """Kept rows (in day and slot order) less lab slots that are not half of a two-slot session"""
+    whole = []
+    pending = None
+    for row in rows:
+        day, slot, code = row[:3]
+        if code not in lab_codes:
+            whole.append(row)
+        elif pending is not None and pending[:3] == (day, slot - 1, code):
+            whole.extend((pending, row))
+            pending = None
+        else:
+            pending = row
+    return whole
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -71,6 +72,9 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'timetable_project.wsgi.application'
+# Either works for the live generation progress stream (Server-Sent Events);
+# under ASGI an open stream does not hold a server thread
+ASGI_APPLICATION = 'timetable_project.asgi.application'
 
 
 # Database
@@ -89,6 +93,15 @@ MONGODB_SETTINGS = {
     'db': 'TIMETABLE',
 }
 
+# Cache shared by the web server and the generation workers; carries live
+# generation progress between them, so it must not be per-process
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_LOCATION', default=os.path.join(tempfile.gettempdir(), 'timetable_cache')),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -138,6 +151,9 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Background timetable generation: solver slots shared by all generation workers
+TIMETABLE_GENERATION_SLOTS = config('TIMETABLE_GENERATION_SLOTS', default=1, cast=int)
+
 # Team Information
 TEAM_INFO = {
     'developed_by': 'TEAM SPIDERMERN',
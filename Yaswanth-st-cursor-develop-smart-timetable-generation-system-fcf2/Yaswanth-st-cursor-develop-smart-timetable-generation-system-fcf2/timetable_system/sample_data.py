@@ -4,15 +4,24 @@ Sample Data Generator for Smart Timetable System
 Developed by TEAM SPIDERMERN (SANJAY B, YASWANTH ST, ABISHECK AM)
 
 This script populates the database with sample data for testing the timetable generation system.
+With --sections it instead bulk-inserts a synthetic institution of that size
+(see timetable.synthetic_data), e.g. for benchmarking:
+
+    python sample_data.py --sections 1000 --seed 7 --tightness 0.8 --clear
 """
 
+import argparse
 import os
 import sys
 import django
 from datetime import datetime, time
 
-# Setup Django environment
-sys.path.append('/workspace/timetable_system')
+# Setup Django environment: the timetable app and project settings live one
+# directory up. The stub project next to this script must not shadow them; its
+# timetable package would win over the real (namespace) one anywhere on the path.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:] = [path for path in sys.path if os.path.abspath(path or os.curdir) != SCRIPT_DIR]
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'timetable_project.settings')
 django.setup()
 
@@ -350,14 +359,65 @@ def create_sample_electives():
         except Staff.DoesNotExist:
             print(f"✗ Staff {data['staff_assigned_id']} not found for elective {data['elective_name']}")
 
-def main():
+def parse_args(argv=None):
+    """Command line options; synthetic generation is enabled by --sections"""
+    parser = argparse.ArgumentParser(description='Populate the timetable database with sample data.')
+    parser.add_argument('--sections', type=int,
+                        help='Generate a synthetic institution with this many class sections')
+    parser.add_argument('--departments', type=int, help='Departments (default: about 10 sections per year each)')
+    parser.add_argument('--years', type=int, default=4, help='Years of study per department')
+    parser.add_argument('--subjects-per-class', type=int, default=5)
+    parser.add_argument('--labs-per-class', type=int, default=1)
+    parser.add_argument('--staff-per-department', type=int, help='Default: sized from teaching demand')
+    parser.add_argument('--classrooms', type=int, help='Default: sized from lecture demand')
+    parser.add_argument('--lab-rooms', type=int, help='Default: sized from lab demand')
+    parser.add_argument('--electives-per-department', type=int, default=1)
+    parser.add_argument('--tightness', type=float, default=0.7,
+                        help='Teaching demand / staff and room capacity, in (0, 1]')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--clear', action='store_true', help='Delete existing data before inserting')
+    parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk_create batch')
+    return parser.parse_args(argv)
+
+def create_synthetic_institution(args):
+    """Bulk-insert a synthetic institution sized by the command line options"""
+    from timetable.synthetic_data import SyntheticInstitution
+    
+    institution = SyntheticInstitution(
+        class_sections=args.sections,
+        departments=args.departments,
+        years=args.years,
+        subjects_per_class=args.subjects_per_class,
+        labs_per_class=args.labs_per_class,
+        staff_per_department=args.staff_per_department,
+        classrooms=args.classrooms,
+        lab_rooms=args.lab_rooms,
+        electives_per_department=args.electives_per_department,
+        tightness=args.tightness,
+        seed=args.seed,
+    )
+    started = datetime.now()
+    counts = institution.save(clear=args.clear, batch_size=args.batch_size)
+    elapsed = (datetime.now() - started).total_seconds()
+    
+    print(f"\n✅ Synthetic institution (seed {args.seed}) inserted in {elapsed:.2f}s")
+    for name, count in counts.items():
+        print(f"- {name.replace('_', ' ').title()}: {count}")
+
+def main(argv=None):
     """Main function to populate sample data"""
+    args = parse_args(argv)
     print("🎓 Smart Timetable System - Sample Data Generator")
     print("=" * 60)
     print("Developed by TEAM SPIDERMERN")
     print("SANJAY B | YASWANTH ST | ABISHECK AM")
     print("=" * 60)
     
+    if args.sections:
+        print(f"\n📊 Creating a synthetic institution with {args.sections} class sections...")
+        create_synthetic_institution(args)
+        return
+    
     print("\n📊 Creating sample data...")
     
     print("\n👥 Creating Staff Members...")